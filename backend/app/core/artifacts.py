@@ -0,0 +1,369 @@
+"""
+Artifact registry
+-----------------
+One shared, hot-reloadable copy of every serving artifact per process.
+
+- The production model and its metadata (``best_model.joblib`` +
+  ``production_model_metadata.csv``) are loaded once as a
+  ``ModelArtifact`` and shared by every service.
+- Processed-data holders (FeatureStore, VersionedCache tables, market
+  intelligence) register a ``poll`` callable that rebuilds them when
+  their source files changed.
+
+When the watcher is running (``artifacts.watch`` in settings.yaml) a
+daemon thread polls file signatures every ``poll_seconds``. A changed
+artifact is built on that thread and swapped in with a single reference
+assignment, so requests already holding the old version finish on it.
+Listeners (derived tables such as the forecast table) are then rebuilt
+on the same thread, and request paths stop checking files themselves.
+
+Without the watcher (tests, scripts) holders keep checking their sources
+on access, as before.
+"""
+
+import hashlib
+import io
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import joblib
+import pandas as pd
+
+from backend.app.core.config import MODELS_DIR, settings
+from backend.app.core.datasets import file_signature
+from backend.app.core.metrics import MODEL_LOAD_DURATION, MODEL_LOADS
+
+
+ARTIFACT_SETTINGS = settings.get("artifacts") or {}
+
+WATCH = bool(ARTIFACT_SETTINGS.get("watch", True))
+POLL_SECONDS = float(ARTIFACT_SETTINGS.get("poll_seconds", 5))
+
+MODEL_PATH = MODELS_DIR / "best_model.joblib"
+METADATA_PATH = MODELS_DIR / "production_model_metadata.csv"
+
+
+def payload_fingerprint(payload: bytes) -> str:
+    """Short SHA-256 of a model file's bytes (``ModelArtifact.fingerprint``)."""
+    return hashlib.sha256(payload).hexdigest()[:12]
+
+
+def file_fingerprint(path: Path) -> str:
+    with open(path, "rb") as f:
+        return payload_fingerprint(f.read())
+
+
+def parse_feature_list(raw: str) -> List[str]:
+    """``"['a', 'b']"`` (as stored in the metadata CSV) -> ``['a', 'b']``."""
+    return raw.strip("[]").replace("'", "").split(", ")
+
+
+class ModelArtifact:
+    """
+    ModelArtifact
+    -------------
+    - ``model``: the fitted estimator
+    - ``metadata``: the production metadata row as a dict
+    - ``features``: ordered model inputs from the metadata
+    - ``version``: 1, 2, ... per process, increasing on every reload
+    - ``fingerprint``: short SHA-256 of the model file
+    - ``loaded_at``: when this version became available
+
+    Immutable once built; a reload creates a new artifact.
+    """
+
+    def __init__(
+        self,
+        model,
+        metadata: Dict,
+        version: int,
+        signature: Tuple,
+        fingerprint: str,
+        loaded_at: datetime
+    ):
+        self.model = model
+        self.metadata = metadata
+        self.features = parse_feature_list(metadata["features_used"])
+        self.version = version
+        self.signature = signature
+        self.fingerprint = fingerprint
+        self.loaded_at = loaded_at
+
+    def info(self) -> Dict:
+        return {
+            "version": self.version,
+            "fingerprint": self.fingerprint,
+            "loaded_at": self.loaded_at.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+
+class _Watched:
+    """A registered processed-data holder."""
+
+    def __init__(
+        self,
+        name: str,
+        poll: Callable[[], bool],
+        info: Optional[Callable[[], Dict]],
+        signature: Optional[Callable[[], Any]]
+    ):
+        self.name = name
+        self.poll = poll
+        self.info = info
+        self.signature = signature
+
+
+class ArtifactRegistry:
+    """
+    ArtifactRegistry
+    ----------------
+    - ``model()``: the active ModelArtifact (loaded on first use)
+    - ``refresh_model()``: request-path model poll without the watcher
+    - ``register(name, poll, info)``: add a processed-data holder
+    - ``add_listener(fn)``: called after any artifact changed
+    - ``poll()``: one change-detection pass (what the watcher runs)
+    - ``fingerprint()``: token of the loaded content (HTTP ETags)
+    - ``start()`` / ``stop()``: background watcher lifecycle
+    - A model file that fails to reload is logged and skipped until it
+      changes again; the previous artifact stays in service
+    """
+
+    def __init__(
+        self,
+        model_path: Path = MODEL_PATH,
+        metadata_path: Path = METADATA_PATH,
+        poll_seconds: float = POLL_SECONDS
+    ):
+        self.model_path = Path(model_path)
+        self.metadata_path = Path(metadata_path)
+        self.poll_seconds = poll_seconds
+
+        self._model: Optional[ModelArtifact] = None
+        self._model_lock = threading.Lock()
+        self._model_reload_lock = threading.Lock()
+        self._model_versions = 0
+        self._failed_signature: Optional[Tuple] = None
+
+        self._watched: List[_Watched] = []
+        self._listeners: List[Callable[[], None]] = []
+        self._poll_lock = threading.Lock()
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_poll: Optional[datetime] = None
+
+    @property
+    def watching(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # --------------------------------------------------
+    # Model
+    # --------------------------------------------------
+    def model(self) -> ModelArtifact:
+        artifact = self._model
+        if artifact is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+                artifact = self._model
+        return artifact
+
+    def _model_signature(self) -> Tuple:
+        return (file_signature(self.model_path), file_signature(self.metadata_path))
+
+    def _load_model(self) -> ModelArtifact:
+        # Signature first: a file replaced mid-load is caught next poll
+        signature = self._model_signature()
+        with MODEL_LOAD_DURATION.time():
+            # One read: the fingerprint always describes the loaded model
+            with open(self.model_path, "rb") as f:
+                payload = f.read()
+            fingerprint = payload_fingerprint(payload)
+            model = joblib.load(io.BytesIO(payload))
+            metadata = pd.read_csv(self.metadata_path).iloc[0].to_dict()
+        MODEL_LOADS.inc()
+
+        self._model_versions += 1
+        return ModelArtifact(
+            model, metadata, self._model_versions, signature, fingerprint,
+            datetime.now(),
+        )
+
+    def refresh_model(self) -> bool:
+        """
+        Request-path model poll: reload the model if its files changed.
+        Skipped while the watcher runs (it owns reloads then). Costs two
+        ``stat`` calls when nothing changed.
+        """
+        if self.watching:
+            return False
+        return self._poll_model()
+
+    def _model_changed(self) -> bool:
+        current = self._model
+        if current is None:
+            return False
+        signature = self._model_signature()
+        # Missing files keep the last good model in service, and files
+        # that already failed to load are not retried until they change
+        return (
+            signature != current.signature
+            and signature != self._failed_signature
+            and None not in signature
+        )
+
+    def _poll_model(self) -> bool:
+        if not self._model_changed():
+            return False
+        with self._model_reload_lock:
+            # Another thread may have reloaded while we waited
+            if not self._model_changed():
+                return False
+            signature = self._model_signature()
+            try:
+                artifact = self._load_model()
+            except Exception as e:
+                # Truncated or half-copied files keep the last good model
+                self._failed_signature = signature
+                print(f"WARNING: Reloading model failed: {str(e)}")
+                return False
+            self._failed_signature = None
+            with self._model_lock:
+                self._model = artifact
+        return True
+
+    # --------------------------------------------------
+    # Processed data
+    # --------------------------------------------------
+    def register(
+        self,
+        name: str,
+        poll: Callable[[], bool],
+        info: Optional[Callable[[], Dict]] = None,
+        signature: Optional[Callable[[], Any]] = None
+    ) -> None:
+        """
+        ``signature`` returns the source signature the holder has
+        loaded (None until it loads); it feeds ``fingerprint()``.
+        """
+        self._watched.append(_Watched(name, poll, info, signature))
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        self._listeners.append(listener)
+
+    # --------------------------------------------------
+    # Change detection
+    # --------------------------------------------------
+    def poll(self) -> List[str]:
+        """
+        Reload every artifact whose files changed, then notify
+        listeners. Returns the names of the reloaded artifacts.
+        """
+        with self._poll_lock:
+            changed = []
+            if self._poll_model():
+                changed.append("model")
+
+            for watched in list(self._watched):
+                try:
+                    if watched.poll():
+                        changed.append(watched.name)
+                except Exception as e:
+                    print(f"WARNING: Reloading {watched.name} failed: {str(e)}")
+
+            if changed:
+                for listener in list(self._listeners):
+                    try:
+                        listener()
+                    except Exception as e:
+                        print(f"WARNING: Artifact listener failed: {str(e)}")
+
+            self.last_poll = datetime.now()
+            return changed
+
+    def fingerprint(self, refresh: bool = True) -> str:
+        """
+        Short hash of the source signatures every artifact has loaded.
+        Changes whenever served data changes, and is the same in every
+        worker process serving the same files.
+
+        Without the watcher (and unless ``refresh`` is False), sources
+        are polled first so the token never describes data a request
+        would not see.
+        """
+        if refresh and not self.watching:
+            self.poll()
+        model = self._model
+        parts = [model.signature if model is not None else None] + [
+            (watched.name, watched.signature() if watched.signature else None)
+            for watched in self._watched
+        ]
+        return hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+
+    def start(self) -> None:
+        if self.watching:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="artifact-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                changed = self.poll()
+                if changed:
+                    print(f"✓ Reloaded artifacts: {', '.join(changed)}")
+            except Exception as e:
+                print(f"WARNING: Artifact poll failed: {str(e)}")
+
+    # --------------------------------------------------
+    # Status
+    # --------------------------------------------------
+    def status(self) -> Dict:
+        model = self._model
+        return {
+            "watching": self.watching,
+            "poll_seconds": self.poll_seconds,
+            "last_poll": (
+                self.last_poll.strftime("%Y-%m-%d %H:%M:%S")
+                if self.last_poll else None
+            ),
+            "model": model.info() if model is not None else None,
+            "data": {
+                watched.name: watched.info() if watched.info else {}
+                for watched in self._watched
+            },
+        }
+
+
+# --------------------------------------------------
+# Process-wide instance
+# --------------------------------------------------
+_registry: Optional[ArtifactRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_artifact_registry() -> ArtifactRegistry:
+    """Return the process-wide ArtifactRegistry, creating it on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ArtifactRegistry()
+    return _registry
+
+
+def background_reload_active() -> bool:
+    """True while the watcher owns reloads (request paths skip file checks)."""
+    registry = _registry
+    return registry is not None and registry.watching
@@ -0,0 +1,134 @@
+"""
+Versioned caches
+----------------
+Derived data (enriched frames, lookup tables, catalogs) only changes
+when the processed files it is built from change. ``VersionedCache``
+keeps one built value and rebuilds it only when the signature
+(mtime, size) of any of its source datasets moves.
+
+Every cache registers with the artifact registry. While its watcher
+runs, ``poll()`` rebuilds stale values in the background and ``get()``
+serves the current value without touching the filesystem.
+"""
+
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Generic, Optional, Sequence, Tuple, TypeVar
+
+from backend.app.core.artifacts import background_reload_active, get_artifact_registry
+from backend.app.core.datasets import dataset_signature
+from backend.app.core.metrics import CACHE_REQUESTS, timed
+
+
+T = TypeVar("T")
+
+
+class VersionedCache(Generic[T]):
+    """
+    VersionedCache
+    --------------
+    - ``get()`` returns the cached value while every source is unchanged
+    - Any source change (or ``invalidate()``) triggers one rebuild
+    - Hit / miss counters are exposed through ``info()``
+
+    Callers share the returned value and must not mutate it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[], T],
+        sources: Sequence[Path]
+    ):
+        self.name = name
+        self._build = build
+        self._sources = [Path(p) for p in sources]
+        self._entry: Optional[Tuple[Tuple, T]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loaded_at: Optional[datetime] = None
+
+        get_artifact_registry().register(
+            name, self.poll, self.info, self.loaded_signature
+        )
+
+    def signature(self) -> Tuple:
+        """Current version of the sources (one stat per source)."""
+        return tuple(dataset_signature(p) for p in self._sources)
+
+    def loaded_signature(self) -> Optional[Tuple]:
+        """Signature the cached value was built from (None if unbuilt)."""
+        entry = self._entry
+        return entry[0] if entry is not None else None
+
+    def get(self) -> T:
+        entry = self._entry
+        if entry is not None and background_reload_active():
+            # The artifact watcher swaps in rebuilt values
+            self._hit()
+            return entry[1]
+
+        signature = self.signature()
+
+        if entry is not None and entry[0] == signature:
+            self._hit()
+            return entry[1]
+
+        with self._lock:
+            # Another request may have rebuilt while we waited
+            entry = self._entry
+            if entry is not None and entry[0] == signature:
+                self._hit()
+                return entry[1]
+
+            self.misses += 1
+            CACHE_REQUESTS.inc(cache=self.name, result="miss")
+            with timed(f"{self.name}.build"):
+                value = self._build()
+            self._entry = (signature, value)
+            self.loaded_at = datetime.now()
+            return value
+
+    def poll(self) -> bool:
+        """
+        Rebuild a previously built value whose sources changed.
+        Readers keep the old value until the new one is swapped in.
+
+        Returns:
+            True if the value was rebuilt
+        """
+        entry = self._entry
+        if entry is None:
+            return False
+        signature = self.signature()
+        if entry[0] == signature:
+            return False
+
+        with timed(f"{self.name}.build"):
+            value = self._build()
+        with self._lock:
+            self._entry = (signature, value)
+            self.loaded_at = datetime.now()
+        return True
+
+    def _hit(self) -> None:
+        self.hits += 1
+        CACHE_REQUESTS.inc(cache=self.name, result="hit")
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entry = None
+
+    def info(self) -> Dict:
+        return {
+            "name": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "cached": self._entry is not None,
+            "loaded_at": (
+                self.loaded_at.strftime("%Y-%m-%d %H:%M:%S")
+                if self.loaded_at else None
+            ),
+        }
@@ -1,10 +1,21 @@
+import os
 import yaml
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = BASE_DIR.parents[2]
 
 with open(BASE_DIR / "settings.yaml", "r") as f:
     settings = yaml.safe_load(f)
 
 SERVICE_LEVEL = settings.get("service_level", 0.9)
 Z_SCORE = settings.get("z_score", 1.65)
+
+# Artifact locations; overridable so benchmarks and deployments can
+# point the service at other datasets without touching the repo copy
+DATA_DIR = Path(
+    os.environ.get("INVENTORYIQ_DATA_DIR", PROJECT_DIR / "data" / "processed")
+)
+MODELS_DIR = Path(
+    os.environ.get("INVENTORYIQ_MODELS_DIR", PROJECT_DIR / "models")
+)
@@ -0,0 +1,259 @@
+"""
+Processed dataset loading
+-------------------------
+Typed binary columnar snapshots of the CSVs in ``data/processed``.
+
+A snapshot sits next to its CSV as a directory
+(``feature_engineered_data.csv`` -> ``feature_engineered_data.snapshot/``)
+holding one ``.npy`` file per column plus a ``manifest.json``:
+
+- numeric / boolean columns are stored as-is and memory-mapped on load
+- text columns are dictionary-encoded (int32 codes + unique values),
+  so repeated IDs and week strings cost 4 bytes per row
+- the manifest records the source CSV's mtime and size; a snapshot that
+  no longer matches its CSV is ignored
+
+``load_dataset`` is the single entry point for services and routers:
+it prefers a fresh snapshot and falls back to ``pd.read_csv``, with the
+same resulting dtypes either way.
+"""
+
+import json
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend.app.core.metrics import DATASET_LOAD_DURATION, DATASET_LOADS
+
+
+SNAPSHOT_SUFFIX = ".snapshot"
+MANIFEST_NAME = "manifest.json"
+SNAPSHOT_FORMAT = 1
+
+
+def snapshot_path(csv_path: Path) -> Path:
+    """Snapshot directory that belongs to a CSV file."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.stem + SNAPSHOT_SUFFIX)
+
+
+def file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def dataset_exists(csv_path: Path) -> bool:
+    """True if the CSV or its snapshot is available."""
+    csv_path = Path(csv_path)
+    return csv_path.exists() or (snapshot_path(csv_path) / MANIFEST_NAME).exists()
+
+
+def dataset_signature(csv_path: Path) -> Optional[Tuple[int, int]]:
+    """
+    Change detector for a dataset: the CSV's signature, or the
+    snapshot manifest's when only the snapshot is deployed.
+    """
+    return (
+        file_signature(csv_path)
+        or file_signature(snapshot_path(csv_path) / MANIFEST_NAME)
+    )
+
+
+# --------------------------------------------------
+# Writing
+# --------------------------------------------------
+def write_snapshot(
+    df: pd.DataFrame,
+    target: Path,
+    source_signature: Optional[Tuple[int, int]] = None,
+    sorted_by: Optional[Sequence[str]] = None
+) -> Path:
+    """
+    Write ``df`` as a columnar snapshot directory.
+
+    The directory is assembled under a temporary name and renamed into
+    place, so readers never observe a half-written snapshot.
+    ``sorted_by`` records an ordering the rows are already in.
+    """
+    target = Path(target)
+    staging = target.with_name(f"{target.name}.tmp-{os.getpid()}")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    columns: List[Dict] = []
+    for position, name in enumerate(df.columns):
+        series = df[name]
+        entry = {"name": str(name), "file": f"c{position:04d}.npy"}
+
+        if series.dtype == object:
+            values = series.to_numpy()
+            missing = pd.isna(values)
+            present = values[~missing]
+            if not all(isinstance(v, str) for v in present):
+                raise ValueError(
+                    f"Column '{name}' mixes text and non-text values"
+                )
+            uniques, codes = np.unique(present.astype(str), return_inverse=True)
+            all_codes = np.full(len(values), -1, dtype=np.int32)
+            all_codes[~missing] = codes
+            np.save(staging / entry["file"], all_codes)
+            entry["kind"] = "text"
+            entry["values_file"] = f"c{position:04d}.values.npy"
+            np.save(staging / entry["values_file"], uniques)
+        else:
+            np.save(staging / entry["file"], series.to_numpy())
+            entry["kind"] = "array"
+
+        columns.append(entry)
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "rows": len(df),
+        "source": list(source_signature) if source_signature else None,
+        "sorted_by": list(sorted_by) if sorted_by else None,
+        "columns": columns,
+    }
+    with open(staging / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Swap into place; readers holding the old files keep their mappings
+    retired = None
+    if target.exists():
+        retired = target.with_name(f"{target.name}.old-{os.getpid()}")
+        os.replace(target, retired)
+    os.replace(staging, target)
+    if retired is not None:
+        shutil.rmtree(retired, ignore_errors=True)
+
+    return target
+
+
+def convert_csv(csv_path: Path) -> Path:
+    """Parse a processed CSV once and write its snapshot."""
+    csv_path = Path(csv_path)
+    signature = file_signature(csv_path)
+    df = pd.read_csv(csv_path)
+    return write_snapshot(df, snapshot_path(csv_path), signature)
+
+
+# --------------------------------------------------
+# Reading
+# --------------------------------------------------
+def read_snapshot(
+    target: Path,
+    parse_dates: Optional[Sequence[str]] = None,
+    mmap: bool = True,
+    categorical: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Load a snapshot directory into a DataFrame.
+
+    Numeric columns are memory-mapped read-only when ``mmap`` is True;
+    text columns are decoded into object columns like ``read_csv``
+    produces, or kept as categoricals over their codes when listed in
+    ``categorical``. Dates in ``parse_dates`` are parsed once per
+    distinct value instead of once per row.
+    """
+    target = Path(target)
+    with open(target / MANIFEST_NAME) as f:
+        manifest = json.load(f)
+
+    parse_dates = set(parse_dates or ())
+    categorical = set(categorical or ())
+    mmap_mode = "r" if mmap else None
+
+    data = {}
+    for entry in manifest["columns"]:
+        name = entry["name"]
+        values = np.load(target / entry["file"], mmap_mode=mmap_mode)
+
+        if entry["kind"] == "text":
+            uniques = np.load(target / entry["values_file"])
+            codes = np.asarray(values)
+            if name in categorical and name not in parse_dates:
+                data[name] = pd.Categorical.from_codes(
+                    codes, categories=uniques.astype(object)
+                )
+                continue
+            if name in parse_dates:
+                decoded = pd.to_datetime(uniques).to_numpy()
+                missing = np.datetime64("NaT")
+            else:
+                decoded = uniques.astype(object)
+                missing = np.nan
+            column = np.take(decoded, codes)
+            if (codes < 0).any():
+                column[codes < 0] = missing
+            values = column
+        elif name in parse_dates and values.dtype.kind != "M":
+            values = pd.to_datetime(values).to_numpy()
+        else:
+            # Plain ndarray view: still backed by the mapping, but
+            # behaves exactly like an array parsed from CSV
+            values = np.asarray(values)
+
+        data[name] = values
+
+    df = pd.DataFrame(data, copy=False)
+    if manifest.get("sorted_by"):
+        df.attrs["sorted_by"] = list(manifest["sorted_by"])
+    return df
+
+
+def load_dataset(
+    csv_path: Path,
+    parse_dates: Optional[Sequence[str]] = None,
+    dtype: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """
+    Load a processed dataset, preferring its binary snapshot.
+
+    The snapshot is used when its manifest matches the CSV's current
+    mtime and size (or when only the snapshot is deployed); otherwise
+    the CSV is parsed, with ``dtype`` overriding pandas' inference
+    (e.g. hex strings that would parse as numbers). Raises
+    FileNotFoundError when neither exists.
+    """
+    csv_path = Path(csv_path)
+    snapshot = snapshot_path(csv_path)
+    manifest_path = snapshot / MANIFEST_NAME
+    start = time.perf_counter()
+
+    if manifest_path.exists():
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            source = manifest.get("source")
+            current = file_signature(csv_path)
+            fresh = current is None or (
+                source is not None and tuple(source) == current
+            )
+            if fresh and manifest.get("format") == SNAPSHOT_FORMAT:
+                df = read_snapshot(snapshot, parse_dates=parse_dates)
+                _record_load(csv_path, "snapshot", start)
+                return df
+        except (OSError, ValueError, KeyError):
+            # Damaged snapshot: the CSV is still authoritative
+            pass
+
+    df = pd.read_csv(
+        csv_path,
+        parse_dates=list(parse_dates) if parse_dates else None,
+        dtype=dtype
+    )
+    _record_load(csv_path, "csv", start)
+    return df
+
+
+def _record_load(csv_path: Path, source: str, start: float) -> None:
+    DATASET_LOADS.inc(dataset=csv_path.name, source=source)
+    DATASET_LOAD_DURATION.observe(time.perf_counter() - start, dataset=csv_path.name)
@@ -0,0 +1,59 @@
+"""
+Series downsampling
+-------------------
+Shape-preserving reduction of long series to a chart-sized number of
+points with Largest-Triangle-Three-Buckets (LTTB, Steinarsson 2013).
+
+The first and last points are always kept. The points in between are
+split into ``threshold - 2`` equal buckets and each bucket keeps the
+point forming the largest triangle with the point kept in the previous
+bucket and the average of the next bucket, so peaks, troughs and
+turning points survive where plain striding or averaging would flatten
+them.
+
+``lttb_indices`` returns positions rather than values, so every column
+of a series (dates, values, side metrics) can be thinned identically.
+"""
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Positions of the ``threshold`` points LTTB keeps from (x, y).
+
+    ``x`` must be increasing. Series no longer than ``threshold`` (or a
+    threshold below 3) are returned whole.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bucket boundaries over the interior points [1, n - 1)
+    buckets = threshold - 2
+    edges = np.arange(buckets + 1) * (n - 2) // buckets + 1
+    starts, stops = edges[:-1], edges[1:]
+
+    # Average of each bucket, used as the third vertex of the previous
+    # bucket's triangles; the last bucket looks at the final point
+    counts = stops - starts
+    x_means = np.add.reduceat(x[1:n - 1], starts - 1) / counts
+    y_means = np.add.reduceat(y[1:n - 1], starts - 1) / counts
+    next_x = np.append(x_means[1:], x[-1])
+    next_y = np.append(y_means[1:], y[-1])
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket, (start, stop) in enumerate(zip(starts.tolist(), stops.tolist())):
+        # Twice the triangle area; the constant factor does not move argmax
+        areas = np.abs(
+            (x[previous] - next_x[bucket]) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y[bucket] - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
@@ -0,0 +1,280 @@
+"""
+HTTP response cache
+-------------------
+Read-only data endpoints only change when the files behind them change,
+so their responses are validated and reused instead of recomputed:
+
+- Every cacheable ``GET`` gets a weak ``ETag`` derived from the artifact
+  registry fingerprint (what data is loaded) plus path and query
+  parameters; a matching ``If-None-Match`` is answered with ``304``
+- ``Cache-Control`` lets clients reuse a response for ``max_age_seconds``
+  (by default the artifact watcher's poll interval) before revalidating
+- Bodies are kept in a size-bounded LRU keyed by ETag, so a dashboard
+  refresh by another client is served without running the endpoint
+- A data reload changes the fingerprint, which retires every ETag and
+  clears the LRU
+
+ETags are weak: diagnostic fields (counters, poll times) in an otherwise
+unchanged response do not invalidate it.
+
+Only ``200`` responses are stored; errors and other methods pass through.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.core.artifacts import background_reload_active, get_artifact_registry
+from backend.app.core.config import settings
+from backend.app.core.metrics import CACHE_REQUESTS
+
+
+HTTP_CACHE_SETTINGS = settings.get("http_cache") or {}
+
+ENABLED = bool(HTTP_CACHE_SETTINGS.get("enabled", True))
+MAX_AGE_SECONDS = int(HTTP_CACHE_SETTINGS.get("max_age_seconds", 5))
+MAX_ENTRIES = int(HTTP_CACHE_SETTINGS.get("max_entries", 512))
+MAX_BYTES = int(HTTP_CACHE_SETTINGS.get("max_bytes", 32 * 1024 * 1024))
+
+# Exact paths, or prefixes when ending in "/"
+CACHED_PATHS: List[str] = HTTP_CACHE_SETTINGS.get("paths") or [
+    "/api/v1/timeseries",
+    "/api/v1/market/summary",
+    "/api/v1/markets",
+    "/api/v1/stores",
+    "/api/v1/products/",
+    "/api/v1/categories",
+    "/api/v1/inventory/plan",
+    "/api/v1/inventory/metrics",
+    "/api/v1/demand/",
+    "/api/v1/model/status",
+]
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+class ResponseCache:
+    """
+    ResponseCache
+    -------------
+    - LRU of ``etag -> (headers, body)`` for successful responses
+    - Bounded by entry count and total body bytes
+    - ``sync(fingerprint)`` drops everything when the data changed
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, Tuple[Headers, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._fingerprint: Optional[str] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def sync(self, fingerprint: str) -> None:
+        if fingerprint == self._fingerprint:
+            return
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                self._entries.clear()
+                self._bytes = 0
+                self._fingerprint = fingerprint
+
+    def get(self, etag: str) -> Optional[Tuple[Headers, bytes]]:
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is None:
+                self.misses += 1
+                CACHE_REQUESTS.inc(cache="http_response", result="miss")
+                return None
+            self._entries.move_to_end(etag)
+            self.hits += 1
+        CACHE_REQUESTS.inc(cache="http_response", result="hit")
+        return entry
+
+    def put(self, etag: str, headers: Headers, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(etag, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._entries[etag] = (headers, body)
+            self._bytes += len(body)
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def info(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+        }
+
+
+class HTTPCacheMiddleware:
+    """
+    HTTPCacheMiddleware
+    -------------------
+    ASGI middleware applying ETag / 304 / Cache-Control and the shared
+    ResponseCache to ``GET`` requests on ``paths``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Sequence[str] = CACHED_PATHS,
+        max_age: int = MAX_AGE_SECONDS
+    ):
+        self.app = app
+        self.exact = {p for p in paths if not p.endswith("/")}
+        self.prefixes = tuple(p for p in paths if p.endswith("/"))
+        self.cache_control = f"public, max-age={max_age}, must-revalidate".encode()
+        self.cache = get_response_cache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not self._cacheable(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        fingerprint = await self._fingerprint(refresh=True)
+        etag = self._etag(scope, fingerprint)
+
+        if self._matches(scope, etag):
+            self.cache.not_modified += 1
+            CACHE_REQUESTS.inc(cache="http_response", result="not_modified")
+            await self._send(send, 304, [], b"", etag)
+            return
+
+        self.cache.sync(fingerprint)
+        cached = self.cache.get(etag)
+        if cached is not None:
+            await self._send(send, 200, cached[0], cached[1], etag)
+            return
+
+        # Run the endpoint, holding back a 200 until its ETag is known
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def capture(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+            elif passthrough:
+                await send(message)
+            else:
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        if passthrough or start is None:
+            return
+
+        # The endpoint may have loaded data on first use
+        fingerprint = await self._fingerprint(refresh=False)
+        etag = self._etag(scope, fingerprint)
+        headers = [
+            (name, value) for name, value in start["headers"]
+            if name.lower() not in (b"etag", b"cache-control", b"content-length")
+        ]
+        body = b"".join(chunks)
+
+        self.cache.sync(fingerprint)
+        self.cache.put(etag, headers, body)
+        await self._send(send, 200, headers, body, etag)
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+    def _cacheable(self, path: str) -> bool:
+        return path in self.exact or path.startswith(self.prefixes)
+
+    @staticmethod
+    async def _fingerprint(refresh: bool) -> str:
+        registry = get_artifact_registry()
+        if refresh and not background_reload_active():
+            # Polls the source files: keep the stat calls off the event loop
+            return await run_in_threadpool(registry.fingerprint)
+        return registry.fingerprint(refresh=False)
+
+    @staticmethod
+    def _etag(scope: Scope, fingerprint: str) -> str:
+        # Parameter order does not change the resource
+        query = urlencode(sorted(parse_qsl(
+            scope.get("query_string", b"").decode("latin-1"),
+            keep_blank_values=True,
+        )))
+        key = f"{fingerprint}|{scope['path']}?{query}"
+        return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+    @staticmethod
+    def _matches(scope: Scope, etag: str) -> bool:
+        header = next(
+            (value for name, value in scope["headers"] if name == b"if-none-match"),
+            None,
+        )
+        if header is None:
+            return False
+        tags = {tag.strip() for tag in header.decode("latin-1").split(",")}
+        # Weak comparison (RFC 9110): ignore the W/ prefix on both sides
+        return "*" in tags or etag[2:] in {tag.removeprefix("W/") for tag in tags}
+
+    async def _send(
+        self,
+        send: Send,
+        status: int,
+        headers: Headers,
+        body: bytes,
+        etag: str
+    ) -> None:
+        headers = headers + [
+            (b"etag", etag.encode()),
+            (b"cache-control", self.cache_control),
+        ]
+        if status != 304:
+            headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+# --------------------------------------------------
+# Process-wide instance
+# --------------------------------------------------
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide ResponseCache, creating it on first use."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
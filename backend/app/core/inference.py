@@ -0,0 +1,298 @@
+"""
+Inference executor
+------------------
+CPU-bound model work (``predict``, explanation scoring) runs on a
+dedicated worker pool instead of the request threads:
+
+- ``executor: thread`` (default) runs jobs on a thread pool; the model
+  object is shared, nothing is copied
+- ``executor: process`` runs jobs in worker processes, sidestepping the
+  GIL; each worker loads the model from disk once per fingerprint and
+  keeps it. A worker only uses a file whose bytes match the caller's
+  pinned artifact; when the file has moved on (or is half-written) the
+  job is re-run with the caller's model pickled along
+- at most ``workers + max_queue`` jobs are admitted at a time; further
+  submissions fail immediately with ``InferenceQueueFull`` (served as
+  a 503 with Retry-After) instead of piling up behind a heavy batch
+- a job that does not finish within ``timeout_seconds`` fails with
+  ``InferenceTimeout``
+- ``backend: compiled`` (default) scores up to ``compiled_max_rows``
+  rows with the flat-array evaluator in ``tree_evaluator.py``; larger
+  batches (where sklearn's compiled loop is faster), unsupported models
+  and ``backend: sklearn`` use ``model.predict``
+
+Keep ``workers + max_queue`` below the server's request threadpool
+size (40 for Starlette) so lightweight endpoints always find a thread.
+"""
+
+import io
+import os
+import threading
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+)
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import joblib
+
+from backend.app.core.artifacts import payload_fingerprint
+from backend.app.core.config import settings
+from backend.app.core.metrics import (
+    PREDICT_CALLS,
+    PREDICT_DURATION,
+    PREDICT_ROWS,
+    REGISTRY,
+    Counter,
+    Gauge,
+)
+from backend.app.core.tree_evaluator import compiled_predictor
+
+
+INFERENCE_SETTINGS = settings.get("inference") or {}
+
+EXECUTOR_KIND = INFERENCE_SETTINGS.get("executor", "thread")
+WORKERS = int(INFERENCE_SETTINGS.get("workers", min(4, os.cpu_count() or 1)))
+MAX_QUEUE = int(INFERENCE_SETTINGS.get("max_queue", 16))
+TIMEOUT_SECONDS = float(INFERENCE_SETTINGS.get("timeout_seconds", 30))
+RETRY_AFTER_SECONDS = int(INFERENCE_SETTINGS.get("retry_after_seconds", 1))
+BACKEND = INFERENCE_SETTINGS.get("backend", "compiled")
+COMPILED_MAX_ROWS = int(INFERENCE_SETTINGS.get("compiled_max_rows", 64))
+
+
+class InferenceUnavailable(RuntimeError):
+    """Inference could not be served right now; the client should retry."""
+
+    retry_after = RETRY_AFTER_SECONDS
+
+
+class InferenceQueueFull(InferenceUnavailable):
+    """Every worker is busy and the pending queue is full."""
+
+
+class InferenceTimeout(InferenceUnavailable):
+    """An admitted job did not finish within the configured timeout."""
+
+
+class StaleModelFile(RuntimeError):
+    """The model file on disk no longer matches the caller's artifact."""
+
+
+# --------------------------------------------------
+# Worker-process side
+# --------------------------------------------------
+# Models loaded by this process, keyed by path -> (fingerprint, model)
+_worker_models: Dict[str, Tuple[str, Any]] = {}
+
+
+def _load_worker_model(model_path: str, fingerprint: str):
+    cached = _worker_models.get(model_path)
+    if cached is None or cached[0] != fingerprint:
+        with open(model_path, "rb") as f:
+            payload = f.read()
+        # Replaced or half-written since the caller pinned its artifact
+        if payload_fingerprint(payload) != fingerprint:
+            raise StaleModelFile(f"{model_path} does not match model {fingerprint}")
+        cached = (fingerprint, joblib.load(io.BytesIO(payload)))
+        _worker_models[model_path] = cached
+    return cached[1]
+
+
+def _predictor(model, X, backend: str):
+    if backend == "compiled" and len(X) <= COMPILED_MAX_ROWS:
+        return compiled_predictor(model)
+    return model
+
+
+def _predict_from_path(model_path: str, fingerprint: str, X, backend: str = BACKEND):
+    model = _load_worker_model(model_path, fingerprint)
+    return _predictor(model, X, backend).predict(X)
+
+
+def _predict_with_model(model, X, backend: str = BACKEND):
+    return _predictor(model, X, backend).predict(X)
+
+
+# --------------------------------------------------
+# Executor
+# --------------------------------------------------
+class InferenceExecutor:
+    """
+    InferenceExecutor
+    -----------------
+    - ``run(fn, *args)`` executes ``fn`` on the pool and returns its result
+    - ``predict(model, X, model_path, fingerprint)`` scores ``X`` with
+      the configured backend; process workers load ``model_path``
+      (when its bytes match ``fingerprint``) instead of receiving the
+      pickled model
+    - Admission is bounded: saturation raises ``InferenceQueueFull``
+
+    In process mode ``fn`` and its arguments must be picklable, so pass
+    module-level functions and plain data rather than bound methods.
+    """
+
+    def __init__(
+        self,
+        kind: str = EXECUTOR_KIND,
+        workers: int = WORKERS,
+        max_queue: int = MAX_QUEUE,
+        timeout: float = TIMEOUT_SECONDS,
+        backend: str = BACKEND
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown inference executor: {kind}")
+        if backend not in ("compiled", "sklearn"):
+            raise ValueError(f"Unknown inference backend: {backend}")
+
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.backend = backend
+
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._pool: Optional[Executor] = None
+        self._pool_lock = threading.Lock()
+
+        self.submitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        # Admitted jobs not yet finished (running or queued)
+        self.in_flight = 0
+        self._in_flight_lock = threading.Lock()
+
+    def run(self, fn: Callable, *args) -> Any:
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise InferenceQueueFull(
+                f"Inference queue is full ({self.workers} workers, "
+                f"{self.max_queue} queued)"
+            )
+
+        self._track(1)
+        try:
+            future = self._executor().submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+
+        # The slot is held until the job itself ends, even if the caller
+        # gives up waiting, so abandoned work still counts against the queue
+        future.add_done_callback(self._release)
+        self.submitted += 1
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self.timed_out += 1
+            raise InferenceTimeout(
+                f"Inference did not finish within {self.timeout:g}s"
+            )
+
+    def predict(
+        self,
+        model,
+        X,
+        model_path: Optional[Path] = None,
+        fingerprint: Optional[str] = None
+    ):
+        backend = (
+            "compiled" if self.backend == "compiled" and len(X) <= COMPILED_MAX_ROWS
+            else "sklearn"
+        )
+        start = time.perf_counter()
+        try:
+            if self.kind == "process" and model_path is not None and fingerprint:
+                try:
+                    return self.run(
+                        _predict_from_path, str(model_path), fingerprint, X, self.backend
+                    )
+                except StaleModelFile:
+                    pass
+            return self.run(_predict_with_model, model, X, self.backend)
+        finally:
+            PREDICT_CALLS.inc(backend=backend)
+            PREDICT_ROWS.inc(len(X), backend=backend)
+            PREDICT_DURATION.observe(time.perf_counter() - start, backend=backend)
+
+    def _track(self, delta: int) -> None:
+        with self._in_flight_lock:
+            self.in_flight += delta
+
+    def _release(self, _future) -> None:
+        self._track(-1)
+        self._slots.release()
+
+    def info(self) -> Dict:
+        return {
+            "executor": self.kind,
+            "backend": self.backend,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "timeout_seconds": self.timeout,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "in_flight": self.in_flight,
+        }
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _executor(self) -> Executor:
+        # Created lazily so importing the app never forks processes
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    if self.kind == "process":
+                        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._pool = ThreadPoolExecutor(
+                            max_workers=self.workers,
+                            thread_name_prefix="inference",
+                        )
+        return self._pool
+
+
+# --------------------------------------------------
+# Process-wide instance
+# --------------------------------------------------
+_executor: Optional[InferenceExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Return the process-wide InferenceExecutor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = InferenceExecutor()
+    return _executor
+
+
+def _executor_metrics():
+    executor = _executor
+    if executor is None:
+        return []
+
+    jobs = Counter("inference_jobs_total", "Inference jobs by outcome.", ("outcome",))
+    jobs.inc(executor.submitted, outcome="submitted")
+    jobs.inc(executor.rejected, outcome="rejected")
+    jobs.inc(executor.timed_out, outcome="timed_out")
+    in_flight = Gauge("inference_jobs_in_flight", "Admitted inference jobs not yet finished.")
+    in_flight.set(executor.in_flight)
+    capacity = Gauge("inference_capacity", "Inference admission limit (workers + max_queue).")
+    capacity.set(executor.workers + executor.max_queue)
+    return [jobs, in_flight, capacity]
+
+
+REGISTRY.add_collector(_executor_metrics)
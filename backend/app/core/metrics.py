@@ -0,0 +1,400 @@
+"""
+Metrics
+-------
+In-process instrumentation, exposed in the Prometheus text format
+(version 0.0.4) at ``/metrics``.
+
+- ``Counter`` / ``Gauge`` / ``Histogram`` with optional labels, updated
+  directly on hot paths (a dict lookup and a float add under a lock)
+- ``timed(operation)`` records the duration of a named operation
+  (table builds, data loads) in ``inventoryiq_operation_duration_seconds``
+- Collectors registered with ``add_collector`` report values owned
+  elsewhere (executor queue, process memory) at scrape time
+
+Metrics are per worker process; each worker answers ``/metrics`` with
+its own values.
+"""
+
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.core.config import settings
+
+
+METRICS_SETTINGS = settings.get("metrics") or {}
+
+ENABLED = bool(METRICS_SETTINGS.get("enabled", True))
+
+PREFIX = "inventoryiq_"
+
+# Starlette appends "; charset=utf-8"
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Seconds; spans cached lookups (sub-ms) to cold table builds
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic total (events, seconds, rows)."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return super().render() + [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down (in-flight requests, memory)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return super().render() + [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts, sum, count)
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                (key, (list(s[0]), s[1], s[2])) for key, s in self._series.items()
+            )
+
+        lines = super().render()
+        names = self.labels + ("le",)
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, key + (_format_value(bound),))} {cumulative}"
+                )
+            lines.append(f"{self.name}_bucket{_format_labels(names, key + ('+Inf',))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    MetricsRegistry
+    ---------------
+    - ``counter`` / ``gauge`` / ``histogram`` create and register metrics
+    - ``add_collector(fn)``: ``fn()`` returns extra metrics at scrape time
+    - ``render()``: Prometheus text exposition of everything
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Sequence[_Metric]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], Sequence[_Metric]]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                for metric in collector():
+                    lines.extend(metric.render())
+            except Exception as e:
+                print(f"WARNING: Metrics collector failed: {str(e)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# --------------------------------------------------
+# Shared metrics
+# --------------------------------------------------
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by route template and status.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route"),
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.",
+)
+
+DATASET_LOADS = REGISTRY.counter(
+    "dataset_loads_total", "Processed datasets loaded, by file and source format.",
+    ("dataset", "source"),
+)
+DATASET_LOAD_DURATION = REGISTRY.histogram(
+    "dataset_load_duration_seconds", "Time to load a processed dataset.",
+    ("dataset",),
+)
+
+MODEL_LOADS = REGISTRY.counter(
+    "model_loads_total", "Production model artifact loads.",
+)
+MODEL_LOAD_DURATION = REGISTRY.histogram(
+    "model_load_duration_seconds", "Time to load the production model and metadata.",
+)
+
+PREDICT_CALLS = REGISTRY.counter(
+    "predict_calls_total", "Model predict calls through the inference executor.",
+    ("backend",),
+)
+PREDICT_ROWS = REGISTRY.counter(
+    "predict_rows_total", "Rows scored through the inference executor.",
+    ("backend",),
+)
+PREDICT_DURATION = REGISTRY.histogram(
+    "predict_duration_seconds", "Predict call latency, queueing included.",
+    ("backend",),
+)
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit / miss).",
+    ("cache", "result"),
+)
+
+OPERATION_DURATION = REGISTRY.histogram(
+    "operation_duration_seconds", "Duration of instrumented service operations.",
+    ("operation",),
+)
+
+
+@contextmanager
+def timed(operation: str) -> Iterator[None]:
+    """Record the duration of ``operation`` in OPERATION_DURATION."""
+    with OPERATION_DURATION.time(operation=operation):
+        yield
+
+
+# --------------------------------------------------
+# Request instrumentation
+# --------------------------------------------------
+class MetricsMiddleware:
+    """
+    MetricsMiddleware
+    -----------------
+    ASGI middleware recording in-flight requests, request counts and
+    latency per route template (``/api/v1/products/{product_id}``, not
+    the concrete path, so label cardinality stays bounded).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+
+        async def record(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, record)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = _route_template(scope)
+            HTTP_REQUESTS.inc(method=scope["method"], route=route, status=status)
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start, method=scope["method"], route=route
+            )
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        # Answered before routing (e.g. a 304 from the HTTP cache)
+        app = scope.get("app")
+        for candidate in getattr(app, "routes", ()):
+            if candidate.matches(scope)[0] == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
+
+
+# --------------------------------------------------
+# Process collector
+# --------------------------------------------------
+def _resident_memory_bytes() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _process_metrics() -> Sequence[_Metric]:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    max_rss = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+    cpu = Counter("process_cpu_seconds_total", "User and system CPU time of this worker.")
+    cpu.inc(usage.ru_utime + usage.ru_stime)
+    peak = Gauge("process_max_resident_memory_bytes", "Peak resident memory of this worker.")
+    peak.set(max_rss)
+    metrics: List[_Metric] = [cpu, peak]
+
+    rss = _resident_memory_bytes()
+    if rss is not None:
+        current = Gauge("process_resident_memory_bytes", "Resident memory of this worker.")
+        current.set(rss)
+        metrics.append(current)
+    return metrics
+
+
+REGISTRY.add_collector(_process_metrics)
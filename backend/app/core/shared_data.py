@@ -0,0 +1,228 @@
+"""
+Shared datasets
+---------------
+One resident copy of a processed dataset per host instead of one per
+worker process.
+
+The first worker that needs a given version of a CSV parses it once,
+applies the consumer's ordering and publishes it as a columnar snapshot
+(see ``datasets.py``) under ``shared_data.dir``. Every worker, the
+publisher included, then memory-maps that snapshot read-only, so the
+numeric columns live once in the OS page cache however many workers
+run. Text ID columns are attached as categoricals over the mapped codes
+instead of being expanded to per-row Python strings.
+
+Coordination uses ``flock`` on files next to the snapshots:
+
+- ``.publish.lock`` (exclusive) serialises publishing and cleanup, so a
+  changed CSV is parsed by one worker while the others wait and attach
+- ``<version>.lease`` (shared) is held by every worker attached to that
+  version; a version nobody leases any more (all workers moved on to a
+  newer one, or exited) is deleted on the next cleanup pass
+- Leases are released on reload, on app shutdown and at interpreter
+  exit; the kernel drops them if a worker dies, so its versions are
+  collected by the survivors
+
+Mappings outlive deleted files, so requests still reading a retired
+version are unaffected.
+
+Without ``fcntl`` (non-POSIX) or when publishing fails (read-only or
+full directory) datasets load privately as before.
+"""
+
+import atexit
+import ctypes
+import ctypes.util
+import hashlib
+import shutil
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from backend.app.core.config import settings
+from backend.app.core.datasets import (
+    MANIFEST_NAME,
+    load_dataset,
+    read_snapshot,
+    write_snapshot,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+
+SHARED_DATA_SETTINGS = settings.get("shared_data") or {}
+
+ENABLED = bool(SHARED_DATA_SETTINGS.get("enabled", True)) and fcntl is not None
+SHARED_DIR = Path(
+    SHARED_DATA_SETTINGS.get("dir")
+    or Path(tempfile.gettempdir()) / "inventoryiq-shared"
+)
+
+PUBLISH_LOCK_NAME = ".publish.lock"
+LEASE_SUFFIX = ".lease"
+
+
+class SharedDataset:
+    """
+    SharedDataset
+    -------------
+    - ``load(signature)``: attach to the published snapshot of that
+      source version, publishing it first if no worker has
+    - ``release()``: drop this worker's lease (and collect unused versions)
+    - ``sort_by`` is applied once at publish time and recorded in the
+      manifest (``df.attrs["sorted_by"]`` on load)
+    """
+
+    def __init__(
+        self,
+        csv_path: Path,
+        parse_dates: Sequence[str] = (),
+        sort_by: Sequence[str] = (),
+        categorical: Sequence[str] = (),
+        root: Path = SHARED_DIR
+    ):
+        self.csv_path = Path(csv_path).resolve()
+        self.parse_dates = list(parse_dates)
+        self.sort_by = list(sort_by)
+        self.categorical = list(categorical)
+
+        # One directory per source file, so deployments sharing a host
+        # (or a benchmark dataset) never collide
+        key = hashlib.sha1(str(self.csv_path).encode()).hexdigest()[:10]
+        self.directory = Path(root) / f"{self.csv_path.stem}-{key}"
+
+        self._lease: Optional[Tuple[Path, IO]] = None
+        self._lock = threading.Lock()
+
+        _instances.add(self)
+
+    def load(self, signature: Tuple[int, int]) -> pd.DataFrame:
+        try:
+            return self._attach(signature)
+        except OSError as e:
+            # Read-only or full shared directory: keep serving privately
+            print(f"WARNING: Shared dataset unavailable, loading privately: {str(e)}")
+            return self._prepare()
+
+    def release(self) -> None:
+        with self._lock:
+            lease, self._lease = self._lease, None
+        if lease is not None:
+            lease[1].close()
+            self.collect()
+
+    def collect(self) -> None:
+        """Delete versions no worker leases any more."""
+        if not self.directory.exists():
+            return
+        with _publish_lock(self.directory):
+            current = self._lease[0] if self._lease is not None else None
+            for path in self.directory.iterdir():
+                if path.name == PUBLISH_LOCK_NAME or path.suffix == LEASE_SUFFIX:
+                    continue
+                if path == current:
+                    continue
+                if ".tmp-" in path.name or ".old-" in path.name:
+                    # Leftovers of a writer that died mid-publish
+                    shutil.rmtree(path, ignore_errors=True)
+                elif _unleased(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                    _lease_path(path).unlink(missing_ok=True)
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+    def _attach(self, signature: Tuple[int, int]) -> pd.DataFrame:
+        version = self.directory / f"v{signature[0]}-{signature[1]}"
+
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with _publish_lock(self.directory):
+                if not (version / MANIFEST_NAME).exists():
+                    write_snapshot(
+                        self._prepare(), version, signature,
+                        sorted_by=self.sort_by or None,
+                    )
+                    print(f"✓ Published shared snapshot {version}")
+                    _trim_heap()
+                # Leased before the publish lock is released, so a
+                # concurrent cleanup can never remove it under us
+                lease = _open_lease(version)
+            previous, self._lease = self._lease, (version, lease)
+            if previous is not None:
+                previous[1].close()
+
+        data = read_snapshot(
+            version, parse_dates=self.parse_dates, categorical=self.categorical
+        )
+        self.collect()
+        return data
+
+    def _prepare(self) -> pd.DataFrame:
+        df = load_dataset(self.csv_path, parse_dates=self.parse_dates)
+        if self.sort_by:
+            df = df.sort_values(self.sort_by, kind="mergesort").reset_index(drop=True)
+            df.attrs["sorted_by"] = list(self.sort_by)
+        return df
+
+
+def _lease_path(version: Path) -> Path:
+    return version.with_name(version.name + LEASE_SUFFIX)
+
+
+def _open_lease(version: Path) -> IO:
+    handle = open(_lease_path(version), "a+")
+    fcntl.flock(handle, fcntl.LOCK_SH)
+    return handle
+
+
+def _unleased(version: Path) -> bool:
+    try:
+        with open(_lease_path(version), "a+") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+    except BlockingIOError:
+        return False
+
+
+def _trim_heap() -> None:
+    # The parsed frame is garbage once published, but glibc keeps its
+    # freed heap mapped; hand it back so the publisher ends up as small
+    # as the workers that only attached
+    try:
+        ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+@contextmanager
+def _publish_lock(directory: Path) -> Iterator[None]:
+    with open(directory / PUBLISH_LOCK_NAME, "a+") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        yield
+
+
+# --------------------------------------------------
+# Process exit
+# --------------------------------------------------
+_instances: "weakref.WeakSet[SharedDataset]" = weakref.WeakSet()
+
+
+def release_shared_datasets() -> None:
+    """Release every lease held by this process (shutdown, atexit)."""
+    for dataset in list(_instances):
+        try:
+            dataset.release()
+        except OSError as e:
+            print(f"WARNING: Failed to release shared dataset: {str(e)}")
+
+
+atexit.register(release_shared_datasets)
@@ -0,0 +1,246 @@
+"""
+Compiled tree evaluator
+-----------------------
+Evaluates fitted sklearn tree ensembles from flat NumPy node arrays.
+
+``model.predict`` validates its input (feature names, dtype, finiteness)
+and walks the ensemble one tree at a time, which dominates the cost of
+scoring one or a few rows. ``compile_model`` flattens every tree into
+shared contiguous arrays once; ``predict`` then advances all
+(row, tree) cursors together, one tree level per step.
+
+Supported:
+- ``GradientBoostingRegressor`` with a constant (``DummyRegressor``) or
+  ``"zero"`` initial estimator
+- ``RandomForestRegressor`` / ``ExtraTreesRegressor``
+- ``DecisionTreeRegressor`` / ``ExtraTreeRegressor``
+
+Anything else compiles to ``None`` and callers keep using sklearn.
+Inputs with NaN or infinity are also handed to the model's own
+``predict``, which rejects them or routes missing values as fitted.
+
+Inputs are compared as float32, exactly like sklearn's tree code, so
+every row lands in the same leaf; only the order of the final sum
+differs, which keeps results within float rounding of ``predict``.
+
+``contributions`` decomposes each prediction along its decision paths
+(Saabas): every split credits the change in node value to the split
+feature, so ``baseline + contributions.sum(axis=1)`` equals the
+prediction for every row.
+"""
+
+import threading
+import weakref
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# (row, tree) cursors advanced per step; bounds temporary memory
+ROW_CHUNK = 4096
+
+
+class CompiledTreeEnsemble:
+    """
+    CompiledTreeEnsemble
+    --------------------
+    - Node arrays of all trees concatenated; leaves point to themselves
+    - ``predict(X)``: ``offset + scale * sum(leaf values)`` per row
+    - ``contributions(X)``: per-row, per-feature additive decomposition
+    - ``X`` may be a DataFrame (columns in model order) or a 2-D array
+    - Non-finite inputs go to ``fallback`` (the source model's predict)
+    """
+
+    def __init__(
+        self,
+        trees: Sequence,
+        scale: float,
+        offset: float,
+        feature_names: Optional[Sequence[str]] = None,
+        fallback: Optional[Callable] = None
+    ):
+        sizes = [tree.node_count for tree in trees]
+        roots = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+        features, thresholds, lefts, rights, values = [], [], [], [], []
+        for tree, root in zip(trees, roots):
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left == -1
+
+            # Leaves loop back to themselves, so every cursor can take
+            # the same number of steps regardless of leaf depth
+            lefts.append(np.where(leaf, nodes, tree.children_left) + root)
+            rights.append(np.where(leaf, nodes, tree.children_right) + root)
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            values.append(tree.value[:, 0, 0])
+
+        self.roots = roots.astype(np.intp)
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds).astype(np.float64)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.value = np.concatenate(values).astype(np.float64) * scale
+        self.offset = float(offset)
+        self.depth = max(tree.max_depth for tree in trees)
+        self.n_features = int(self.feature.max(initial=0)) + 1
+        self.feature_names: Optional[List[str]] = (
+            list(feature_names) if feature_names is not None else None
+        )
+        # Weak, so a cached compiled form never keeps its model alive
+        self._fallback = weakref.WeakMethod(fallback) if fallback is not None else None
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def predict(self, X) -> np.ndarray:
+        values = self._as_array(X)
+        if not np.isfinite(values).all():
+            fallback = self._fallback() if self._fallback is not None else None
+            if fallback is None:
+                raise ValueError("Input X contains NaN or infinity.")
+            return fallback(X)
+
+        out = np.empty(len(values), dtype=np.float64)
+        for start in range(0, len(values), ROW_CHUNK):
+            chunk = values[start:start + ROW_CHUNK]
+            out[start:start + len(chunk)] = self._predict_chunk(chunk)
+        return out
+
+    @property
+    def baseline(self) -> float:
+        """Prediction before any split: offset plus every root value."""
+        return float(self.value[self.roots].sum() + self.offset)
+
+    def contributions(self, X) -> np.ndarray:
+        """
+        (rows, features) matrix of path contributions in input column
+        order; each row sums to ``predict(X) - baseline``. Raises
+        ValueError on NaN or infinite inputs, which have no path.
+        """
+        values = self._as_array(X)
+        if not np.isfinite(values).all():
+            raise ValueError("Input X contains NaN or infinity.")
+        out = np.empty(values.shape, dtype=np.float64)
+        for start in range(0, len(values), ROW_CHUNK):
+            chunk = values[start:start + ROW_CHUNK]
+            out[start:start + len(chunk)] = self._contributions_chunk(chunk)
+        return out
+
+    def _contributions_chunk(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_features = X.shape
+        rows = np.arange(n_rows)[:, None]
+        # Flat (row, feature) slot of every cursor, for one bincount per level
+        slots = rows * n_features
+
+        out = np.zeros(n_rows * n_features)
+        nodes = np.broadcast_to(self.roots, (n_rows, self.n_trees))
+        for _ in range(self.depth):
+            feature = self.feature[nodes]
+            go_left = X[rows, feature] <= self.threshold[nodes]
+            children = np.where(go_left, self.left[nodes], self.right[nodes])
+            # Leaves loop to themselves and contribute nothing
+            out += np.bincount(
+                (slots + feature).ravel(),
+                weights=(self.value[children] - self.value[nodes]).ravel(),
+                minlength=out.size,
+            )
+            nodes = children
+        return out.reshape(n_rows, n_features)
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.value[nodes].sum(axis=1) + self.offset
+
+    def _as_array(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            if self.feature_names is not None and list(X.columns) != self.feature_names:
+                X = X[self.feature_names]
+            X = X.to_numpy(dtype=np.float32)
+        else:
+            X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] < self.n_features:
+            raise ValueError(
+                f"X has {X.shape[1]} features, the model uses {self.n_features}"
+            )
+        return X
+
+
+# --------------------------------------------------
+# Compilation
+# --------------------------------------------------
+def compile_model(model) -> Optional[CompiledTreeEnsemble]:
+    """Flatten a supported fitted ensemble; ``None`` if unsupported."""
+    from sklearn.dummy import DummyRegressor
+    from sklearn.ensemble import (
+        ExtraTreesRegressor,
+        GradientBoostingRegressor,
+        RandomForestRegressor,
+    )
+    from sklearn.tree import DecisionTreeRegressor, ExtraTreeRegressor
+
+    names = getattr(model, "feature_names_in_", None)
+
+    if type(model) is GradientBoostingRegressor:
+        init = model.init_
+        if isinstance(init, str) and init == "zero":
+            offset = 0.0
+        elif isinstance(init, DummyRegressor) and np.size(init.constant_) == 1:
+            offset = float(np.ravel(init.constant_)[0])
+        else:
+            return None
+        trees = [stage[0].tree_ for stage in model.estimators_]
+        return CompiledTreeEnsemble(
+            trees, model.learning_rate, offset, names, model.predict
+        )
+
+    if type(model) in (RandomForestRegressor, ExtraTreesRegressor):
+        if model.n_outputs_ != 1:
+            return None
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        return CompiledTreeEnsemble(
+            trees, 1.0 / len(trees), 0.0, names, model.predict
+        )
+
+    if type(model) in (DecisionTreeRegressor, ExtraTreeRegressor):
+        if model.n_outputs_ != 1:
+            return None
+        return CompiledTreeEnsemble(
+            [model.tree_], 1.0, 0.0, names, model.predict
+        )
+
+    return None
+
+
+# Compiled form per model object; dropped with the model on reload
+_compiled = weakref.WeakKeyDictionary()
+_compiled_lock = threading.Lock()
+
+
+def compiled_predictor(model):
+    """
+    The compiled evaluator for ``model`` (built once per model object),
+    or ``model`` itself when its type is not supported.
+    """
+    try:
+        compiled = _compiled[model]
+    except (KeyError, TypeError):
+        with _compiled_lock:
+            try:
+                compiled = _compiled[model]
+            except KeyError:
+                compiled = compile_model(model)
+                _compiled[model] = compiled
+            except TypeError:
+                # Not weak-referenceable: compile per call would defeat
+                # the purpose, so stay on the model's own predict
+                return model
+    return compiled if compiled is not None else model
@@ -0,0 +1,201 @@
+"""
+Startup warm-up
+---------------
+Services are built lazily on first use, so importing the app and binding
+the port no longer wait on model and data loading. At startup a
+background warm-up builds them ahead of traffic instead:
+
+- Tasks are named callables with optional dependencies (``after``);
+  independent tasks run concurrently on a small thread pool (parsing,
+  unpickling and NumPy work largely release the GIL)
+- A task runs once everything it depends on succeeded; when a
+  dependency failed it is skipped
+- ``ready`` turns true once every ``required`` task succeeded; optional
+  tasks only shorten the first request of their endpoints
+
+``GET /ready`` reports this status (503 until ready) while ``/health``
+stays a liveness probe that answers as soon as the process is up.
+
+Requests arriving before their service is warm build it themselves;
+the service accessors' locks make them wait for the warm-up's build
+instead of loading a second copy.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, Optional, Sequence
+
+from backend.app.core.config import settings
+from backend.app.core.metrics import timed
+
+
+WARMUP_SETTINGS = settings.get("warmup") or {}
+
+ENABLED = bool(WARMUP_SETTINGS.get("enabled", True))
+WORKERS = int(WARMUP_SETTINGS.get("workers", 4))
+
+
+class _Task:
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], object],
+        after: Sequence[str],
+        required: bool
+    ):
+        self.name = name
+        self.fn = fn
+        self.after = tuple(after)
+        self.required = required
+        self.state = "pending"
+        self.error: Optional[str] = None
+        self.seconds: Optional[float] = None
+
+    def info(self) -> Dict:
+        return {
+            "state": self.state,
+            "required": self.required,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+            "error": self.error,
+        }
+
+
+class Warmup:
+    """
+    Warmup
+    ------
+    - ``add(name, fn, after, required)`` registers a task
+    - ``start()`` runs every task on a background thread
+    - ``run()`` does the same on the calling thread (scripts, benchmarks)
+    - ``ready`` / ``status()`` feed the readiness probe
+    """
+
+    def __init__(self, workers: int = WORKERS):
+        self.workers = max(1, workers)
+        self._tasks: Dict[str, _Task] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[[], object],
+        after: Sequence[str] = (),
+        required: bool = True
+    ) -> None:
+        unknown = [dep for dep in after if dep not in self._tasks]
+        if unknown:
+            raise ValueError(f"Warm-up task '{name}' depends on unknown {unknown}")
+        self._tasks[name] = _Task(name, fn, after, required)
+
+    @property
+    def ready(self) -> bool:
+        return all(
+            task.state == "ready" for task in self._tasks.values() if task.required
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self.run, name="warmup", daemon=True
+            )
+            self._thread.start()
+
+    def run(self) -> None:
+        self.started_at = datetime.now()
+        pending = dict(self._tasks)
+        running: Dict[Future, _Task] = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="warmup"
+        ) as pool:
+            while pending or running:
+                for name, task in list(pending.items()):
+                    states = [self._tasks[dep].state for dep in task.after]
+                    if any(state in ("failed", "skipped") for state in states):
+                        task.state = "skipped"
+                        task.error = "dependency failed"
+                        del pending[name]
+                    elif all(state == "ready" for state in states):
+                        task.state = "running"
+                        running[pool.submit(self._execute, task)] = task
+                        del pending[name]
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+
+        self.finished_at = datetime.now()
+        elapsed = (self.finished_at - self.started_at).total_seconds()
+        if self.ready:
+            print(f"✓ Warm-up finished in {elapsed:.1f}s")
+        else:
+            failed = [t.name for t in self._tasks.values() if t.state != "ready" and t.required]
+            print(f"WARNING: Warm-up incomplete after {elapsed:.1f}s: {', '.join(failed)}")
+
+    def status(self) -> Dict:
+        if self.ready:
+            state = "ready"
+        elif self.finished_at is not None:
+            state = "failed"
+        else:
+            state = "warming_up"
+        return {
+            "status": state,
+            "ready": self.ready,
+            "started_at": (
+                self.started_at.strftime("%Y-%m-%d %H:%M:%S")
+                if self.started_at else None
+            ),
+            "finished_at": (
+                self.finished_at.strftime("%Y-%m-%d %H:%M:%S")
+                if self.finished_at else None
+            ),
+            "tasks": {name: task.info() for name, task in self._tasks.items()},
+        }
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+    @staticmethod
+    def _execute(task: _Task) -> None:
+        start = time.perf_counter()
+        try:
+            with timed(f"warmup.{task.name}"):
+                task.fn()
+            task.state = "ready"
+        except Exception as e:
+            task.state = "failed"
+            task.error = str(e)
+            print(f"WARNING: Warm-up task '{task.name}' failed: {str(e)}")
+        finally:
+            task.seconds = time.perf_counter() - start
+
+
+# --------------------------------------------------
+# Process-wide instance
+# --------------------------------------------------
+_warmup: Optional[Warmup] = None
+_warmup_lock = threading.Lock()
+
+
+def get_warmup() -> Warmup:
+    """Return the process-wide Warmup, creating it on first use."""
+    global _warmup
+    if _warmup is None:
+        with _warmup_lock:
+            if _warmup is None:
+                _warmup = Warmup()
+    return _warmup
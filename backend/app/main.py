@@ -1,7 +1,22 @@
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 
+from backend.app.core.artifacts import WATCH, get_artifact_registry
+from backend.app.core.http_cache import ENABLED as HTTP_CACHE_ENABLED, HTTPCacheMiddleware
+from backend.app.core.inference import InferenceUnavailable, get_inference_executor
+from backend.app.core.metrics import ENABLED as METRICS_ENABLED, MetricsMiddleware
+from backend.app.core.shared_data import release_shared_datasets
+from backend.app.core.warmup import ENABLED as WARMUP_ENABLED, get_warmup
+from backend.app.services.confidence_service import get_confidence_service
+from backend.app.services.demand_cube import get_demand_cube_service
+from backend.app.services.dimension_catalog import get_dimension_catalog
+from backend.app.services.feature_store import get_feature_store
+from backend.app.services.forecast_explanation_service import get_explanation_service
+from backend.app.services.forecasting_service import get_forecasting_service
+from backend.app.services.market_intelligence_service import get_market_intelligence_service
+
 # Routers
 from backend.app.routers import (
     forecast,
@@ -14,6 +29,8 @@ from backend.app.routers import (
     forecast_confidence,
     market_intelligence,
     inventory_planning,
+    demand,
+    metrics,
 )
 
 
@@ -36,6 +53,31 @@ templates = Jinja2Templates(
     directory="backend/app/templates"
 )
 
+# -------------------------------
+# ETag / 304 + response LRU for read-only data endpoints
+# -------------------------------
+if HTTP_CACHE_ENABLED:
+    app.add_middleware(HTTPCacheMiddleware)
+
+# -------------------------------
+# Request metrics (outermost: 304s and cache hits are timed too)
+# -------------------------------
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# -------------------------------
+# Inference backpressure
+# -------------------------------
+@app.exception_handler(InferenceUnavailable)
+async def inference_unavailable_handler(request: Request, exc: InferenceUnavailable):
+    # Saturated or timed-out inference: fail fast, let the client retry
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # -------------------------------
 # Web Pages
 # -------------------------------
@@ -60,6 +102,41 @@ app.include_router(forecast_scenario.router)
 app.include_router(forecast_confidence.router)
 app.include_router(market_intelligence.router)
 app.include_router(inventory_planning.router)
+app.include_router(demand.router)
+if METRICS_ENABLED:
+    app.include_router(metrics.router)
+
+# -------------------------------
+# Background warm-up (GET /ready reports progress)
+# -------------------------------
+def register_warmup_tasks(warmup) -> None:
+    """Forecast serving is required for readiness; the rest is best-effort."""
+    warmup.add("model", get_artifact_registry().model)
+    warmup.add("feature_data", get_feature_store().load)
+    warmup.add("forecasts", get_forecasting_service, after=["model", "feature_data"])
+    warmup.add(
+        "explanations", get_explanation_service,
+        after=["model", "feature_data"], required=False,
+    )
+    warmup.add(
+        "confidence", lambda: get_confidence_service().prepare(),
+        after=["forecasts"], required=False,
+    )
+    warmup.add("dimension_catalog", lambda: get_dimension_catalog().stores(), required=False)
+    warmup.add("market_intelligence", get_market_intelligence_service, required=False)
+    warmup.add(
+        "demand_cube", get_demand_cube_service,
+        after=["feature_data", "dimension_catalog"], required=False,
+    )
+    warmup.add(
+        "inventory_recommendations", inventory_planning.load_recommendations_with_metadata,
+        required=False,
+    )
+
+
+if WARMUP_ENABLED:
+    register_warmup_tasks(get_warmup())
+
 
 # Verify critical endpoints are accessible
 @app.on_event("startup")
@@ -68,3 +145,18 @@ async def startup_event():
     print("✓ FastAPI application started successfully")
     print("✓ Enterprise endpoints (/api/v1/markets, /api/v1/categories) are available")
     print("✓ Inventory planning endpoints (/api/v1/inventory/plan) are available")
+    if WATCH:
+        get_artifact_registry().start()
+        print("✓ Watching model and processed data for changes")
+    if WARMUP_ENABLED:
+        # Returns immediately: the server binds while artifacts load
+        get_warmup().start()
+        print("✓ Warm-up started (GET /ready reports progress)")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    get_artifact_registry().stop()
+    get_inference_executor().shutdown()
+    # Let the remaining workers collect snapshot versions we held
+    release_shared_datasets()
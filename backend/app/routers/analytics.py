@@ -1,62 +1,105 @@
-from fastapi import APIRouter, HTTPException
-import pandas as pd
-from pathlib import Path
+from datetime import date
+from typing import Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query
+
+from backend.app.core.downsampling import lttb_indices
+from backend.app.services.feature_store import get_feature_store
 
 router = APIRouter(prefix="/api/v1", tags=["Analytics"])
 
-BASE_DIR = Path(__file__).resolve().parents[3]
-DATA_PATH = BASE_DIR / "data/processed/feature_engineered_data.csv"
+SALES_COLUMN = "weekly_units_sold"
+VOLATILITY_COLUMN = "rolling_4wk_std"
 
-df = pd.read_csv(DATA_PATH, parse_dates=["week"])
 
 @router.get("/timeseries")
-def get_timeseries(store_id: str, product_id: str):
+def get_timeseries(
+    store_id: str,
+    product_id: str,
+    start_week: Optional[date] = Query(
+        default=None,
+        description="First week to include (YYYY-MM-DD). Leave empty for the full history."
+    ),
+    end_week: Optional[date] = Query(
+        default=None,
+        description="Last week to include (YYYY-MM-DD). Leave empty for the full history."
+    ),
+    points: Optional[int] = Query(
+        default=None,
+        ge=3,
+        description="Downsample to at most this many points for charting (LTTB). "
+                    "Metrics always cover every week in the range."
+    )
+):
     """
     Get time-series data for a specific product in a store.
     Includes historical units sold and volatility metrics.
+
+    The pair's history is a contiguous, week-ordered block of the
+    feature store, so the week range is two binary searches and every
+    metric is computed over array views.
     """
-    subset = df[
-        (df["store_id"] == store_id) &
-        (df["product_id"] == product_id)
-    ].sort_values("week")
+    history = get_feature_store().arrays(
+        store_id, product_id, ["week", SALES_COLUMN, VOLATILITY_COLUMN]
+    )
 
-    if subset.empty:
+    if history is None or len(history["week"]) == 0:
         raise HTTPException(status_code=404, detail="No data found")
 
-    weeks = subset["week"].astype(str).tolist()
-    units_sold = subset["units_sold"].tolist()
-    rolling_std = subset["rolling_4wk_std"].tolist()
-    
-    # Calculate additional metrics for the overview
-    valid_units = [u for u in units_sold if u is not None and isinstance(u, (int, float))]
-    valid_volatility = [v for v in rolling_std if v is not None and isinstance(v, (int, float))]
-    
-    avg_demand = sum(valid_units) / len(valid_units) if valid_units else 0
-    peak_demand = max(valid_units) if valid_units else 0
-    min_demand = min(valid_units) if valid_units else 0
-    avg_volatility = sum(valid_volatility) / len(valid_volatility) if valid_volatility else 0
-    
+    weeks = history["week"].astype("datetime64[D]")
+    lo = 0 if start_week is None else int(np.searchsorted(weeks, np.datetime64(start_week), side="left"))
+    hi = len(weeks) if end_week is None else int(np.searchsorted(weeks, np.datetime64(end_week), side="right"))
+    if lo >= hi:
+        raise HTTPException(status_code=404, detail="No data found in the requested weeks")
+
+    weeks = weeks[lo:hi]
+    units = history[SALES_COLUMN][lo:hi]
+    volatility = history[VOLATILITY_COLUMN][lo:hi]
+
+    metrics = _series_metrics(units, volatility)
+
+    if points is not None and points < len(weeks):
+        kept = lttb_indices(weeks.astype(np.int64), units, points)
+        weeks, units, volatility = weeks[kept], units[kept], volatility[kept]
+
+    return {
+        "weeks": np.datetime_as_string(weeks, unit="D").tolist(),
+        "units_sold": units.tolist(),
+        "rolling_std": volatility.tolist(),
+        "metrics": metrics,
+        "returned_points": len(weeks)
+    }
+
+
+def _series_metrics(units: np.ndarray, volatility: np.ndarray) -> dict:
+    """Overview metrics over the finite values of the selected weeks."""
+    units = units.astype(float)
+    volatility = volatility.astype(float)
+    valid_units = units[np.isfinite(units)]
+    valid_volatility = volatility[np.isfinite(volatility)]
+
+    avg_demand = valid_units.mean() if valid_units.size else 0
+    peak_demand = valid_units.max() if valid_units.size else 0
+    min_demand = valid_units.min() if valid_units.size else 0
+    avg_volatility = valid_volatility.mean() if valid_volatility.size else 0
+
     # Calculate trend (recent vs early weeks)
-    if len(valid_units) >= 8:
-        recent_avg = sum(valid_units[-4:]) / 4
-        early_avg = sum(valid_units[:4]) / 4
+    if valid_units.size >= 8:
+        recent_avg = valid_units[-4:].mean()
+        early_avg = valid_units[:4].mean()
         trend_direction = "increasing" if recent_avg > early_avg else "declining"
-        trend_pct = round(((recent_avg - early_avg) / early_avg * 100), 1) if early_avg > 0 else 0
+        trend_pct = round(float((recent_avg - early_avg) / early_avg * 100), 1) if early_avg > 0 else 0
     else:
         trend_direction = "insufficient_data"
         trend_pct = 0
 
     return {
-        "weeks": weeks,
-        "units_sold": units_sold,
-        "rolling_std": rolling_std,
-        "metrics": {
-            "avg_demand": round(avg_demand, 2),
-            "peak_demand": int(peak_demand),
-            "min_demand": int(min_demand),
-            "avg_volatility": round(avg_volatility, 2),
-            "trend_direction": trend_direction,
-            "trend_pct": trend_pct,
-            "data_points": len(weeks)
-        }
+        "avg_demand": round(float(avg_demand), 2),
+        "peak_demand": int(peak_demand),
+        "min_demand": int(min_demand),
+        "avg_volatility": round(float(avg_volatility), 2),
+        "trend_direction": trend_direction,
+        "trend_pct": trend_pct,
+        "data_points": len(units)
     }
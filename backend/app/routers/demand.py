@@ -0,0 +1,75 @@
+"""
+Demand Drilldown Router
+-----------------------
+Slices of weekly demand served from the in-memory demand cube.
+
+Endpoints:
+- GET /api/v1/demand/levels      → Members of every drilldown level
+- GET /api/v1/demand/drilldown   → Demand of a slice broken down by one level
+
+Levels: market → region → store_id and category → product_id.
+Any level can be filtered on and any one (or ``week``) broken down by.
+"""
+
+from datetime import date
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, List, Optional
+
+from backend.app.services.demand_cube import get_demand_cube_service
+
+router = APIRouter(prefix="/api/v1", tags=["Demand Drilldown"])
+
+BY_PATTERN = "^(market|region|store_id|category|product_id|week)$"
+
+
+def _demand_cube_service():
+    """
+    Shared DemandCubeService, built by the startup warm-up or on first use.
+    503 while its data cannot be loaded.
+    """
+    try:
+        return get_demand_cube_service()
+    except Exception as e:
+        print(f"WARNING: Failed to load DemandCubeService: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Demand data unavailable. Please check the processed data."
+        )
+
+
+@router.get("/demand/levels")
+def get_demand_levels() -> Dict[str, List[str]]:
+    """Members of every drilldown level, sorted."""
+    return _demand_cube_service().levels()
+
+
+@router.get("/demand/drilldown")
+def get_demand_drilldown(
+    by: str = Query(
+        default="market",
+        pattern=BY_PATTERN,
+        description="Level to break the slice down by: market, region, store_id, category, product_id or week"
+    ),
+    market: Optional[str] = Query(default=None, description="Filter by market"),
+    region: Optional[str] = Query(default=None, description="Filter by region"),
+    store_id: Optional[str] = Query(default=None, description="Filter by store"),
+    category: Optional[str] = Query(default=None, description="Filter by product category"),
+    product_id: Optional[str] = Query(default=None, description="Filter by product"),
+    start_week: Optional[date] = Query(default=None, description="First week to include (YYYY-MM-DD)"),
+    end_week: Optional[date] = Query(default=None, description="Last week to include (YYYY-MM-DD)")
+) -> Dict:
+    """
+    Demand of the filtered slice, broken down by ``by``.
+
+    Rows report total units, share of the slice, average weekly units,
+    average units per store-product week and the number of pairs; with
+    ``by=week`` the slice is returned as a weekly series instead.
+    """
+    filters = {
+        "market": market,
+        "region": region,
+        "store_id": store_id,
+        "category": category,
+        "product_id": product_id,
+    }
+    return _demand_cube_service().drilldown(by, filters, start_week, end_week)
@@ -1,63 +1,88 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+import json
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from typing import Iterator, List, Tuple
 
-from backend.app.services.forecasting_service import ForecastingService
+from backend.app.core.inference import InferenceUnavailable
+from backend.app.services.forecasting_service import get_forecasting_service
 from backend.app.services.inventory_service import InventoryService
 from backend.app.routers.schemas import (
+    MAX_HORIZON,
     BatchForecastRequest,
     ForecastResponse,
+    StreamForecastRequest,
 )
 
 router = APIRouter(prefix="/api/v1", tags=["Forecast"])
 
-# Initialize forecast service with error handling
-try:
-    forecast_service = ForecastingService()
-except Exception as e:
-    print(f"WARNING: Failed to load ForecastingService: {str(e)}")
-    print("The /api/v1/forecast endpoints may not work, but metadata endpoints will.")
-    forecast_service = None
+def _forecast_service():
+    """
+    Shared ForecastingService, built by the startup warm-up or on first use.
+    503 while its model or data cannot be loaded.
+    """
+    try:
+        return get_forecasting_service()
+    except InferenceUnavailable:
+        raise
+    except Exception as e:
+        print(f"WARNING: Failed to load ForecastingService: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Forecast service unavailable. Please check model dependencies."
+        )
 
 
 # --------------------------------------------------
 # SINGLE FORECAST (NO RELATIVE RISK)
 # --------------------------------------------------
 @router.get("/forecast")
-def get_forecast(store_id: str, product_id: str):
+def get_forecast(
+    store_id: str,
+    product_id: str,
+    horizon: int = Query(
+        default=1,
+        ge=1,
+        le=MAX_HORIZON,
+        description="Weeks ahead to forecast; > 1 adds horizon_forecasts"
+    )
+):
     """
     Single forecast endpoint.
     Risk is NOT applied here because relative risk
     requires batch context.
     """
-    if forecast_service is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Forecast service unavailable. Please check model dependencies."
-        )
+    forecast_service = _forecast_service()
     
-    result = forecast_service.forecast(store_id, product_id)
+    # Precomputed InventoryService.recommend output (materialized table)
+    inventory_decision = forecast_service.recommendation(store_id, product_id)
 
-    if result is None:
+    if inventory_decision is None:
         raise HTTPException(status_code=404, detail="No data found")
 
-    inventory_decision = InventoryService.recommend(
-        result["forecast_units"],
-        result["rolling_std"]
-    )
-
-    return {
+    response = {
         "store_id": store_id,
         "product_id": product_id,
         **inventory_decision,
     }
 
+    if horizon > 1:
+        response["horizon_forecasts"] = forecast_service.horizon_forecasts(
+            [(store_id, product_id)], horizon
+        )[0]
+
+    return response
+
 
 # --------------------------------------------------
 # BATCH FORECAST (RELATIVE RISK APPLIED)
 # --------------------------------------------------
 @router.post(
     "/forecast/batch",
-    response_model=List[ForecastResponse]
+    response_model=List[ForecastResponse],
+    response_model_exclude_none=True
 )
 def batch_forecast(request: BatchForecastRequest):
     """
@@ -65,36 +90,168 @@ def batch_forecast(request: BatchForecastRequest):
     Relative risk is calculated AFTER collecting
     all recommendations.
     """
-    if forecast_service is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Forecast service unavailable. Please check model dependencies."
-        )
+    forecast_service = _forecast_service()
     
-    responses = []
-
-    for item in request.items:
-        result = forecast_service.forecast(
-            item.store_id, item.product_id
-        )
-
-        if result is None:
-            continue  # skip missing data safely
-
-        rec = InventoryService.recommend(
-            result["forecast_units"],
-            result["rolling_std"]
-        )
+    # --------------------------------------------------
+    # LOOK UP MATERIALIZED RECOMMENDATIONS
+    # --------------------------------------------------
+    pairs = [(item.store_id, item.product_id) for item in request.items]
+    recs = forecast_service.recommendations(pairs)
 
-        responses.append({
-            "store_id": item.store_id,
-            "product_id": item.product_id,
+    responses = [
+        {
+            "store_id": store_id,
+            "product_id": product_id,
             **rec
-        })
+        }
+        for (store_id, product_id), rec in zip(pairs, recs)
+        if rec is not None  # skip missing data safely
+    ]
 
     # --------------------------------------------------
     # APPLY RELATIVE (PERCENTILE-BASED) RISK
     # --------------------------------------------------
     responses = InventoryService.apply_relative_risk(responses)
 
+    # --------------------------------------------------
+    # MULTI-WEEK HORIZON (OPTIONAL)
+    # --------------------------------------------------
+    if request.horizon > 1:
+        found = [(item["store_id"], item["product_id"]) for item in responses]
+        paths = forecast_service.horizon_forecasts(found, request.horizon)
+        for item, path in zip(responses, paths):
+            item["horizon_forecasts"] = path
+
     return responses
+
+
+# --------------------------------------------------
+# STREAMING BATCH FORECAST (NDJSON)
+# --------------------------------------------------
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+@router.post("/forecast/batch/stream")
+async def batch_forecast_stream(
+    request: Request,
+    chunk_size: int = Query(
+        default=1000,
+        ge=1,
+        le=10000,
+        description="Items looked up and flushed per chunk"
+    )
+):
+    """
+    Streaming batch forecast for portfolio-scale requests.
+
+    Request body, either:
+    - NDJSON (Content-Type: application/x-ndjson), one
+      {"store_id", "product_id"} object per line, parsed as it arrives
+    - the same {"items": [...]} JSON as /forecast/batch (``horizon``
+      other than 1 is rejected with 422)
+
+    Response: NDJSON, one ForecastResponse-shaped object per found item,
+    flushed every ``chunk_size`` items, then a final {"summary": {...}}
+    line. Missing pairs are skipped as in /forecast/batch.
+
+    Relative risk needs a global view, so here it is classified against
+    the precomputed portfolio-wide p33 / p66 volatility thresholds
+    (reported in the summary) instead of the batch's own percentiles.
+    """
+    # First use may still be building the forecast table: off the event loop
+    forecast_service = await run_in_threadpool(_forecast_service)
+
+    # The body is fully consumed before streaming starts: the response
+    # task listens on the same receive channel for client disconnects
+    pairs = await _read_stream_pairs(request)
+
+    # Pins table + thresholds now, so failures still return an error
+    # status; a pending table rebuild runs off the event loop
+    chunks, thresholds = await run_in_threadpool(
+        forecast_service.recommendation_chunks, pairs, chunk_size
+    )
+
+    return StreamingResponse(
+        _ndjson_lines(pairs, chunks, thresholds),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+async def _read_stream_pairs(request: Request) -> List[Tuple[str, str]]:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type in NDJSON_CONTENT_TYPES:
+        pairs: List[Tuple[str, str]] = []
+        buffer = b""
+        line_no = 0
+        async for data in request.stream():
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line_no += 1
+                _append_ndjson_item(pairs, line, line_no)
+        _append_ndjson_item(pairs, buffer, line_no + 1)
+        return pairs
+
+    try:
+        payload = StreamForecastRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])} for error in e.errors()
+        ])
+    return [(item.store_id, item.product_id) for item in payload.items]
+
+
+def _append_ndjson_item(pairs: List[Tuple[str, str]], line: bytes, line_no: int) -> None:
+    if not line.strip():
+        return
+    try:
+        item = json.loads(line)
+        store_id, product_id = item["store_id"], item["product_id"]
+        if not isinstance(store_id, str) or not isinstance(product_id, str):
+            raise TypeError
+    except (ValueError, KeyError, TypeError):
+        raise RequestValidationError([{
+            "type": "value_error",
+            "loc": ("body", line_no),
+            "msg": 'Expected a JSON object with string "store_id" and "product_id"',
+            "input": line[:200].decode("utf-8", "replace"),
+        }])
+    pairs.append((store_id, product_id))
+
+
+def _ndjson_lines(
+    pairs: List[Tuple[str, str]],
+    chunks: Iterator[List],
+    thresholds: Tuple[float, float]
+) -> Iterator[str]:
+    found = 0
+    offset = 0
+    for recs in chunks:
+        lines = [
+            json.dumps({
+                "store_id": store_id,
+                "product_id": product_id,
+                "forecast_units": rec["forecast_units"],
+                "recommended_order_qty": rec["recommended_order_qty"],
+                "safety_stock": rec["safety_stock"],
+                "risk_level": rec["risk_level"],
+            }, separators=(",", ":"))
+            for (store_id, product_id), rec in zip(
+                pairs[offset:offset + len(recs)], recs
+            )
+            if rec is not None  # skip missing data safely
+        ]
+        offset += len(recs)
+        found += len(lines)
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    yield json.dumps({"summary": {
+        "items": len(pairs),
+        "found": found,
+        "missing": len(pairs) - found,
+        "risk_basis": "portfolio",
+        "risk_thresholds": {"p33": thresholds[0], "p66": thresholds[1]},
+    }}, separators=(",", ":")) + "\n"
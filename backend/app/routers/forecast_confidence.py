@@ -1,29 +1,46 @@
-from fastapi import APIRouter, HTTPException
-from backend.app.services.forecasting_service import ForecastingService
-from backend.app.services.confidence_service import ConfidenceService
+from fastapi import APIRouter, HTTPException, Query
+from typing import List
+
+from backend.app.core.inference import InferenceUnavailable
+from backend.app.services.confidence_service import get_confidence_service
+from backend.app.routers.schemas import BatchConfidenceRequest, ConfidenceResponse
 
 router = APIRouter(
     prefix="/api/v1",
     tags=["Forecast Confidence"]
 )
 
-try:
-    forecast_service = ForecastingService()
-except Exception as e:
-    print(f"WARNING: Failed to load ForecastingService: {str(e)}")
-    forecast_service = None
+
+def _confidence_service():
+    """
+    Shared ConfidenceService, built by the startup warm-up or on first use.
+    503 while its model or data cannot be loaded.
+    """
+    try:
+        return get_confidence_service()
+    except InferenceUnavailable:
+        raise
+    except Exception as e:
+        print(f"WARNING: Failed to load ConfidenceService: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Forecast service unavailable. Please check model dependencies."
+        )
 
 
 @router.get("/forecast/confidence")
 def forecast_confidence(
     store_id: str,
-    product_id: str
+    product_id: str,
+    confidence_level: float = Query(default=0.95, gt=0, lt=1)
 ):
     """
-    Returns confidence bounds around forecast.
+    Returns confidence bounds around forecast, from the empirical
+    quantiles of the model's historical errors for this pair.
     """
+    confidence_service = _confidence_service()
 
-    result = forecast_service.forecast(store_id, product_id)
+    result = confidence_service.band(store_id, product_id, confidence_level)
 
     if not result:
         raise HTTPException(
@@ -31,7 +48,29 @@ def forecast_confidence(
             detail="No data found for the given store and product"
         )
 
-    return ConfidenceService.confidence_band(
-        result["forecast_units"],
-        result["rolling_std"]
-    )
+    return result
+
+
+@router.post(
+    "/forecast/confidence/batch",
+    response_model=List[ConfidenceResponse]
+)
+def forecast_confidence_batch(request: BatchConfidenceRequest):
+    """
+    Confidence bounds for many pairs at one level.
+    Pairs without data are skipped.
+    """
+    confidence_service = _confidence_service()
+
+    pairs = [(item.store_id, item.product_id) for item in request.items]
+    results = confidence_service.bands(pairs, request.confidence_level)
+
+    return [
+        {
+            "store_id": store_id,
+            "product_id": product_id,
+            **result
+        }
+        for (store_id, product_id), result in zip(pairs, results)
+        if result is not None
+    ]
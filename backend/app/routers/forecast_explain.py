@@ -1,16 +1,31 @@
 from fastapi import APIRouter, HTTPException
-from backend.app.services.forecast_explanation_service import ForecastExplanationService
+from typing import List
+
+from backend.app.core.inference import InferenceUnavailable
+from backend.app.services.forecast_explanation_service import get_explanation_service
+from backend.app.routers.schemas import BatchExplainRequest, ExplanationResponse
 
 router = APIRouter(
     prefix="/api/v1",
     tags=["Forecast Explanation"]
 )
 
-try:
-    explain_service = ForecastExplanationService()
-except Exception as e:
-    print(f"WARNING: Failed to load ForecastExplanationService: {str(e)}")
-    explain_service = None
+
+def _explain_service():
+    """
+    Shared ForecastExplanationService, built by the startup warm-up or on first use.
+    503 while its model or data cannot be loaded.
+    """
+    try:
+        return get_explanation_service()
+    except InferenceUnavailable:
+        raise
+    except Exception as e:
+        print(f"WARNING: Failed to load ForecastExplanationService: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Explanation service unavailable. Please check model dependencies."
+        )
 
 
 @router.get("/forecast/explain")
@@ -18,6 +33,7 @@ def explain_forecast(store_id: str, product_id: str):
     """
     Returns top contributing features driving the forecast.
     """
+    explain_service = _explain_service()
 
     result = explain_service.explain(store_id, product_id)
 
@@ -30,5 +46,31 @@ def explain_forecast(store_id: str, product_id: str):
     return {
         "store_id": store_id,
         "product_id": product_id,
-        "top_features": result
+        **result
     }
+
+
+@router.post(
+    "/forecast/explain/batch",
+    response_model=List[ExplanationResponse],
+    response_model_exclude_none=True
+)
+def explain_forecast_batch(request: BatchExplainRequest):
+    """
+    Explanations for many pairs, served from the precomputed
+    portfolio contributions. Pairs without data are skipped.
+    """
+    explain_service = _explain_service()
+
+    pairs = [(item.store_id, item.product_id) for item in request.items]
+    results = explain_service.explain_many(pairs)
+
+    return [
+        {
+            "store_id": store_id,
+            "product_id": product_id,
+            **result
+        }
+        for (store_id, product_id), result in zip(pairs, results)
+        if result is not None
+    ]
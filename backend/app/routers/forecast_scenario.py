@@ -1,17 +1,36 @@
-from fastapi import APIRouter, HTTPException
-from backend.app.services.forecasting_service import ForecastingService
-from backend.app.services.scenario_service import ScenarioService
+import json
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Dict, Iterator
+
+from backend.app.core.inference import InferenceUnavailable
+from backend.app.services.dimension_catalog import get_dimension_catalog
+from backend.app.services.forecasting_service import get_forecasting_service
+from backend.app.services.scenario_service import COST_MEASURES, ScenarioService, ScenarioSweep
+from backend.app.routers.schemas import ScenarioSweepRequest, ScenarioSweepResponse
 
 router = APIRouter(
     prefix="/api/v1",
     tags=["Forecast Scenario"]
 )
 
-try:
-    forecast_service = ForecastingService()
-except Exception as e:
-    print(f"WARNING: Failed to load ForecastingService: {str(e)}")
-    forecast_service = None
+
+def _forecast_service():
+    """
+    Shared ForecastingService, built by the startup warm-up or on first use.
+    503 while its model or data cannot be loaded.
+    """
+    try:
+        return get_forecasting_service()
+    except InferenceUnavailable:
+        raise
+    except Exception as e:
+        print(f"WARNING: Failed to load ForecastingService: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Forecast service unavailable. Please check model dependencies."
+        )
 
 
 @router.post("/forecast/scenario")
@@ -23,6 +42,7 @@ def simulate_scenario(
     """
     Simulates a demand change scenario without retraining.
     """
+    forecast_service = _forecast_service()
 
     base = forecast_service.forecast(store_id, product_id)
 
@@ -36,3 +56,100 @@ def simulate_scenario(
         base["forecast_units"],
         demand_multiplier
     )
+
+
+# --------------------------------------------------
+# SCENARIO SWEEP (PAIRS x MULTIPLIERS)
+# --------------------------------------------------
+@router.post("/forecast/scenario/sweep", response_model=ScenarioSweepResponse)
+def scenario_sweep(request: ScenarioSweepRequest):
+    """
+    Sweeps a grid of demand multipliers across a set of pairs and
+    returns the portfolio surface: per multiplier, total forecast,
+    safety stock, order quantity and order cost, with deltas against
+    the current recommendation.
+    """
+    sweep = _build_sweep(request)
+    return {
+        "pairs": len(sweep.pairs),
+        "priced_pairs": sweep.priced_pairs,
+        "multipliers": sweep.multipliers.tolist(),
+        "surface": sweep.surface(),
+    }
+
+
+@router.post("/forecast/scenario/sweep/stream")
+def scenario_sweep_stream(
+    request: ScenarioSweepRequest,
+    chunk_size: int = Query(
+        default=1000,
+        ge=1,
+        le=10000,
+        description="Pairs computed and flushed per chunk"
+    )
+):
+    """
+    Same sweep as /forecast/scenario/sweep, streamed as NDJSON: one
+    line per pair with one value per multiplier for every measure,
+    then a final {"summary": {...}} line carrying the surface.
+    """
+    sweep = _build_sweep(request)
+    return StreamingResponse(
+        _sweep_lines(sweep, chunk_size),
+        media_type="application/x-ndjson"
+    )
+
+
+def _build_sweep(request: ScenarioSweepRequest) -> ScenarioSweep:
+    forecast_service = _forecast_service()
+
+    if request.items is not None:
+        pairs = [(item.store_id, item.product_id) for item in request.items]
+    else:
+        pairs = get_dimension_catalog().pairs(
+            market=request.market,
+            category=request.category,
+            store_id=request.store_id,
+        )
+
+    sweep = ScenarioSweep(forecast_service, pairs, request.multiplier_values())
+    if not sweep.pairs:
+        raise HTTPException(
+            status_code=404,
+            detail="No forecastable store-product pairs match the selection"
+        )
+    return sweep
+
+
+def _sweep_lines(sweep: ScenarioSweep, chunk_size: int) -> Iterator[str]:
+    totals: Dict[str, np.ndarray] = {}
+    for pairs, prices, matrices in sweep.chunks(chunk_size):
+        ScenarioSweep.add_totals(totals, matrices)
+        # Python round() on floats, matching the forecast endpoints
+        rounded = {
+            name: matrix.tolist() if matrix.dtype.kind == "i" else [
+                [round(v, 2) for v in row] for row in matrix.tolist()
+            ]
+            for name, matrix in matrices.items()
+        }
+
+        lines = []
+        for i, ((store_id, product_id), price) in enumerate(zip(pairs, prices.tolist())):
+            priced = price == price  # NaN: no price for this pair
+            lines.append(json.dumps({
+                "store_id": store_id,
+                "product_id": product_id,
+                "avg_price": round(price, 2) if priced else None,
+                **{
+                    name: values[i] if priced or name not in COST_MEASURES else None
+                    for name, values in rounded.items()
+                },
+            }, separators=(",", ":")))
+        yield "\n".join(lines) + "\n"
+
+    yield json.dumps({"summary": {
+        "pairs": len(sweep.pairs),
+        "priced_pairs": sweep.priced_pairs,
+        "multipliers": sweep.multipliers.tolist(),
+        "surface": sweep.surface_rows(totals),
+    }}, separators=(",", ":")) + "\n"
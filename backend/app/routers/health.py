@@ -1,8 +1,22 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+
+from backend.app.core.warmup import get_warmup
 
 router = APIRouter()
 
 
 @router.get("/health")
-def health_check():
+async def health_check():
+    # async: answered on the event loop, never queued behind
+    # threadpool-bound forecast requests
     return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness_check(response: Response):
+    # Readiness: 503 until the startup warm-up has loaded what forecasts
+    # need, so rolling deploys route traffic only to warm workers
+    status = get_warmup().status()
+    if not status["ready"]:
+        response.status_code = 503
+    return status
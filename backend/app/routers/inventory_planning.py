@@ -12,129 +12,311 @@ Design principles:
 - Market-level aggregation by default
 - Optional category filtering (does NOT re-trigger forecasting)
 - Uses precomputed recommendations data
+- Enriched data is cached per version of the source files
+
+Plan index (built with the enriched data, once per version):
+- One stable priority order over all items (risk, then order quantity
+  descending, then file order)
+- Row positions per market, per category and per market x category,
+  each already in priority order, so a page is a slice instead of a
+  filter + sort over the whole frame
+- Summary metrics per group, so ``summary`` never rescans rows
+- ``next_cursor`` resumes after the last item of a page; cursors are
+  tied to the data version and rejected once it changes
 """
 
+import base64
+import binascii
+import hashlib
+import numpy as np
 import pandas as pd
 from fastapi import APIRouter, Query, HTTPException
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from pathlib import Path
 
+from backend.app.core.config import DATA_DIR
+from backend.app.core.cache import VersionedCache
+from backend.app.core.datasets import dataset_exists, dataset_signature, load_dataset
+from backend.app.core.metrics import timed
+from backend.app.services.dimension_catalog import (
+    CATEGORY_DISPLAY_NAMES,
+    CLEANED_DATA_PATH,
+    REGION_TO_MARKET,
+    filter_label,
+    get_dimension_catalog,
+)
+
 router = APIRouter(prefix="/api/v1", tags=["Inventory Planning"])
 
 BASE_DIR = Path(__file__).resolve().parents[3]
-RECOMMENDATIONS_PATH = BASE_DIR / "data" / "processed" / "inventory_recommendations.csv"
-CLEANED_DATA_PATH = BASE_DIR / "data" / "processed" / "cleaned_data.csv"
-MARKET_SUMMARY_PATH = BASE_DIR / "data" / "processed" / "market_summary.csv"
-
-# Market mapping based on data analysis (regions -> markets)
-REGION_TO_MARKET = {
-    "North": "North America",
-    "South": "APAC", 
-    "East": "APAC",
-    "West": "Europe"
-}
+RECOMMENDATIONS_PATH = DATA_DIR / "inventory_recommendations.csv"
+MARKET_SUMMARY_PATH = DATA_DIR / "market_summary.csv"
+
+
+@timed("inventory.load_recommendations")
+def load_recommendations_with_metadata():
+    """
+    Recommendations enriched with category and market data.
+
+    The enriched frame is cached and rebuilt only when
+    inventory_recommendations or cleaned_data change on disk.
+    Callers share the cached frame and must not mutate it.
+    """
+    return _recommendations_cache.get().frame
+
+
+def recommendations_cache_info() -> Dict:
+    """Hit/miss counters of the enriched recommendations cache."""
+    return _recommendations_cache.info()
+
 
-# Category mapping for enterprise display names
-CATEGORY_DISPLAY_NAMES = {
-    "Electronics": "Consumer Electronics",
-    "Clothing": "Apparel & Fashion",
-    "Groceries": "Consumer Goods",
-    "Toys": "Toys & Games",
-    "Furniture": "Home & Furniture"
+# Product display names for known catalog items (when cleaned data has no product_name)
+PRODUCT_NAME_MAP = {
+    "P0007": "Noise-Canceling Headphones",
+    "P0012": "Smart Home Speaker",
+    "P0018": "Wireless Earbuds",
+    "P0025": "4K Action Camera",
+    "P0031": "Portable Bluetooth Speaker",
+    "P0044": "Ergonomic Office Chair",
+    "P0050": "Stainless Steel Cookware Set"
 }
 
 
-def load_recommendations_with_metadata():
+def enrich_recommendations(
+    recs_df: pd.DataFrame,
+    cleaned_df: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Add category, market, display names and relative risk to recommendations.
+    All steps are column-wise (no per-row Python).
+    """
+    if cleaned_df is not None:
+        # Get unique store-product-category-region mapping (+ optional product_name)
+        cols = ["store_id", "product_id", "category", "region"]
+        if "product_name" in cleaned_df.columns:
+            cols.append("product_name")
+        mapping_df = cleaned_df[cols].drop_duplicates()
+        
+        # Merge to add category and region to recommendations
+        recs_df = recs_df.merge(
+            mapping_df, 
+            on=["store_id", "product_id"], 
+            how="left"
+        )
+        
+        # Add market based on region
+        recs_df["market"] = recs_df["region"].map(REGION_TO_MARKET).fillna("Other")
+        
+        # Add display category name
+        recs_df["category_display"] = recs_df["category"].map(
+            CATEGORY_DISPLAY_NAMES
+        ).fillna(recs_df["category"])
+
+        # Add product display name (prefer provided product_name, else mapping, else fallback)
+        recs_df["product_name_display"] = _product_display_names(recs_df)
+    
+    # ========== RECALCULATE RISK BASED ON RELATIVE DISTRIBUTION ==========
+    # Instead of using precomputed "High" for all, calculate relative risk
+    # based on safety stock ratio (higher ratio = higher safety buffer = higher cost impact)
+    
+    recs_df["safety_buffer_ratio"] = (
+        (recs_df["recommended_order_qty"] - recs_df["forecast_units"]) / 
+        recs_df["forecast_units"]
+    )
+    
+    # Calculate percentiles to distribute risk levels
+    # Products in top 25% of safety buffer ratio = High Risk (high cost)
+    # Products in middle 50% = Medium Risk 
+    # Products in bottom 25% = Low Risk (lean, optimized)
+    percentile_75 = recs_df["safety_buffer_ratio"].quantile(0.75)
+    percentile_25 = recs_df["safety_buffer_ratio"].quantile(0.25)
+    
+    # High = expensive (high safety stock), Low = lean/optimized.
+    # NaN ratios fail both comparisons and land in "Low".
+    ratio = recs_df["safety_buffer_ratio"].to_numpy()
+    recs_df["demand_risk"] = np.select(
+        [ratio >= percentile_75, ratio >= percentile_25],
+        ["High", "Medium"],
+        default="Low"
+    ).astype(object)
+    
+    return recs_df
+
+
+def _product_display_names(recs_df: pd.DataFrame) -> pd.Series:
+    """Provided product_name, else PRODUCT_NAME_MAP, else 'Product <id>'."""
+    product_ids = recs_df["product_id"].astype(str)
+    names = product_ids.map(PRODUCT_NAME_MAP).fillna("Product " + product_ids)
+    
+    if "product_name" in recs_df.columns:
+        provided = recs_df["product_name"]
+        has_name = provided.notna()
+        names = names.where(~has_name, provided.astype(str).str.strip())
+    
+    return names
+
+
+def _build_recommendations_with_metadata():
     """Load recommendations enriched with category and market data."""
     try:
         # Load recommendations
-        if not RECOMMENDATIONS_PATH.exists():
+        if not dataset_exists(RECOMMENDATIONS_PATH):
             raise FileNotFoundError(f"Recommendations file not found: {RECOMMENDATIONS_PATH}")
         
-        recs_df = pd.read_csv(RECOMMENDATIONS_PATH)
+        recs_df = load_dataset(RECOMMENDATIONS_PATH)
         
         # Load cleaned data to get category and region info
-        if CLEANED_DATA_PATH.exists():
-            cleaned_df = pd.read_csv(CLEANED_DATA_PATH)
-            
-            # Get unique store-product-category-region mapping (+ optional product_name)
-            cols = ["store_id", "product_id", "category", "region"]
-            if "product_name" in cleaned_df.columns:
-                cols.append("product_name")
-            mapping_df = cleaned_df[cols].drop_duplicates()
-            
-            # Merge to add category and region to recommendations
-            recs_df = recs_df.merge(
-                mapping_df, 
-                on=["store_id", "product_id"], 
-                how="left"
-            )
-            
-            # Add market based on region
-            recs_df["market"] = recs_df["region"].map(REGION_TO_MARKET).fillna("Other")
-            
-            # Add display category name
-            recs_df["category_display"] = recs_df["category"].map(
-                CATEGORY_DISPLAY_NAMES
-            ).fillna(recs_df["category"])
-
-            # Add product display name (prefer provided product_name, else mapping, else fallback)
-            product_name_map = {
-                "P0007": "Noise-Canceling Headphones",
-                "P0012": "Smart Home Speaker",
-                "P0018": "Wireless Earbuds",
-                "P0025": "4K Action Camera",
-                "P0031": "Portable Bluetooth Speaker",
-                "P0044": "Ergonomic Office Chair",
-                "P0050": "Stainless Steel Cookware Set"
-            }
-            def _name_for_row(row):
-                if "product_name" in row and pd.notna(row["product_name"]):
-                    return str(row["product_name"]).strip()
-                mapped = product_name_map.get(str(row.get("product_id", "")))
-                if mapped:
-                    return mapped
-                # Graceful fallback
-                return f"Product {row.get('product_id', 'Unknown')}"
-            recs_df["product_name_display"] = recs_df.apply(_name_for_row, axis=1)
-        
-        # ========== RECALCULATE RISK BASED ON RELATIVE DISTRIBUTION ==========
-        # Instead of using precomputed "High" for all, calculate relative risk
-        # based on safety stock ratio (higher ratio = higher safety buffer = higher cost impact)
-        
-        recs_df["safety_buffer_ratio"] = (
-            (recs_df["recommended_order_qty"] - recs_df["forecast_units"]) / 
-            recs_df["forecast_units"]
-        )
+        cleaned_df = None
+        if dataset_exists(CLEANED_DATA_PATH):
+            cleaned_df = load_dataset(CLEANED_DATA_PATH)
         
-        # Calculate percentiles to distribute risk levels
-        # Products in top 25% of safety buffer ratio = High Risk (high cost)
-        # Products in middle 50% = Medium Risk 
-        # Products in bottom 25% = Low Risk (lean, optimized)
-        percentile_75 = recs_df["safety_buffer_ratio"].quantile(0.75)
-        percentile_25 = recs_df["safety_buffer_ratio"].quantile(0.25)
-        
-        def assign_risk_level(ratio):
-            """
-            Assign risk level based on safety buffer ratio.
-            High = expensive (high safety stock)
-            Low = lean/optimized (low safety stock)
-            """
-            if ratio >= percentile_75:
-                return "High"  # Expensive inventory strategy
-            elif ratio >= percentile_25:
-                return "Medium"  # Balanced approach
-            else:
-                return "Low"  # Lean, cost-optimized
-        
-        recs_df["demand_risk"] = recs_df["safety_buffer_ratio"].apply(assign_risk_level)
-        
-        return recs_df
+        return enrich_recommendations(recs_df, cleaned_df)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading data: {str(e)}")
 
 
+# --------------------------------------------------
+# Plan index
+# --------------------------------------------------
+RISK_PRIORITY = {"High": 0, "Medium": 1, "Low": 2}
+GROUP_COLUMNS = ("market", "category")
+MAX_PAGE_SIZE = 500
+
+GroupKey = Tuple[Optional[str], Optional[str]]
+
+
+class _PlanIndex:
+    """Enriched recommendations plus per-group priority order and summaries."""
+
+    def __init__(self, frame: pd.DataFrame, version: str):
+        self.frame = frame
+        self.version = version
+
+        # Stable priority order; ties keep file order like a stable sort
+        priority = frame["demand_risk"].map(RISK_PRIORITY).to_numpy(dtype=float)
+        order_qty = frame["recommended_order_qty"].to_numpy(dtype=float)
+        positions = np.arange(len(frame))
+        order = np.lexsort((positions, -order_qty, priority))
+        self.rank = np.empty(len(frame), dtype=np.int64)
+        self.rank[order] = np.arange(len(frame))
+
+        # Case-insensitive group labels (None where the value is missing)
+        labels = {
+            column: frame[column].str.lower().to_numpy()
+            for column in GROUP_COLUMNS if column in frame.columns
+        }
+
+        self.groups: Dict[GroupKey, np.ndarray] = {(None, None): order}
+        for column, values in labels.items():
+            for label, members in _group_positions(values[order], order).items():
+                key = (label, None) if column == "market" else (None, label)
+                self.groups[key] = members
+        if len(labels) == len(GROUP_COLUMNS):
+            by = [labels["market"][order], labels["category"][order]]
+            for pair, members in pd.Series(order).groupby(by, sort=False):
+                self.groups[pair] = members.to_numpy()
+
+        self.summaries = {
+            key: self._summarize(members) for key, members in self.groups.items()
+        }
+
+    def lookup(
+        self,
+        market: Optional[str],
+        category: Optional[str]
+    ) -> Tuple[np.ndarray, Optional[Dict]]:
+        """Row positions (priority order) and summary of a filter."""
+        for column, label in zip(GROUP_COLUMNS, (market, category)):
+            if label is not None and column not in self.frame.columns:
+                # Same failure as filtering on a missing column
+                raise KeyError(column)
+        key = (market, category)
+        members = self.groups.get(key)
+        if members is None:
+            return np.empty(0, dtype=np.int64), None
+        return members, self.summaries[key]
+
+    def page(
+        self,
+        members: np.ndarray,
+        cursor: Optional[str],
+        limit: int
+    ) -> Tuple[np.ndarray, Optional[str]]:
+        """Next ``limit`` positions after ``cursor`` and the cursor after them."""
+        start = 0
+        if cursor is not None:
+            # members are in priority order, so their ranks are ascending
+            start = int(np.searchsorted(
+                self.rank[members], self._decode(cursor), side="right"
+            ))
+        selected = members[start:start + limit]
+        next_cursor = None
+        if start + limit < len(members):
+            next_cursor = self._encode(int(self.rank[selected[-1]]))
+        return selected, next_cursor
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+    def _summarize(self, members: np.ndarray) -> Dict:
+        rows = self.frame.iloc[np.sort(members)]
+        risk_counts = rows["demand_risk"].value_counts().to_dict()
+        return {
+            "total_items": len(rows),
+            "total_forecast": rows["forecast_units"].sum(),
+            "total_order_qty": rows["recommended_order_qty"].sum(),
+            "high_risk_count": risk_counts.get("High", 0),
+            "medium_risk_count": risk_counts.get("Medium", 0),
+            "low_risk_count": risk_counts.get("Low", 0),
+        }
+
+    def _encode(self, rank: int) -> str:
+        token = f"{self.version}:{rank}".encode()
+        return base64.urlsafe_b64encode(token).decode().rstrip("=")
+
+    def _decode(self, cursor: str) -> int:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            version, rank = base64.urlsafe_b64decode(padded).decode().split(":")
+            rank = int(rank)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if version != self.version:
+            raise HTTPException(
+                status_code=409,
+                detail="Recommendations changed since this cursor was issued; "
+                       "restart from the first page",
+            )
+        return rank
+
+
+def _group_positions(labels: np.ndarray, positions: np.ndarray) -> Dict[str, np.ndarray]:
+    """Split ``positions`` by label, keeping their order within each group."""
+    codes, uniques = pd.factorize(labels)
+    return {
+        label: positions[codes == code]
+        for code, label in enumerate(uniques.tolist())
+    }
+
+
+def _build_plan_index() -> _PlanIndex:
+    # Version of the sources, so cursors from other workers stay valid
+    # and cursors from older data are rejected
+    signature = tuple(
+        dataset_signature(p) for p in (RECOMMENDATIONS_PATH, CLEANED_DATA_PATH)
+    )
+    version = hashlib.sha1(repr(signature).encode()).hexdigest()[:12]
+    return _PlanIndex(_build_recommendations_with_metadata(), version)
+
+
+_recommendations_cache = VersionedCache(
+    "inventory_recommendations",
+    _build_plan_index,
+    [RECOMMENDATIONS_PATH, CLEANED_DATA_PATH],
+)
+
+
 @router.get("/categories")
 def get_categories() -> List[Dict[str, str]]:
     """
@@ -144,23 +326,8 @@ def get_categories() -> List[Dict[str, str]]:
         List of category objects with id and display name
     """
     try:
-        if not CLEANED_DATA_PATH.exists():
-            # Return default categories if file not found
-            return [
-                {"id": cat, "name": display} 
-                for cat, display in CATEGORY_DISPLAY_NAMES.items()
-            ]
-        
-        df = pd.read_csv(CLEANED_DATA_PATH)
-        categories = df["category"].unique().tolist()
-        
-        return [
-            {
-                "id": cat,
-                "name": CATEGORY_DISPLAY_NAMES.get(cat, cat)
-            }
-            for cat in sorted(categories)
-        ]
+        # Prebuilt per version of cleaned_data (defaults if it is missing)
+        return get_dimension_catalog().categories()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading categories: {str(e)}")
 
@@ -177,9 +344,13 @@ def get_inventory_plan(
     ),
     limit: int = Query(
         default=20,
-        description="Maximum number of recommendations to return",
+        description="Maximum number of recommendations to return (page size)",
         ge=1,
-        le=100
+        le=MAX_PAGE_SIZE
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="next_cursor of the previous page. Leave empty for the first page."
     )
 ) -> Dict:
     """
@@ -193,45 +364,40 @@ def get_inventory_plan(
         market: Optional market filter
         category: Optional category filter  
         limit: Max items to return
+        cursor: Resume after the previous page
         
     Returns:
         Dictionary with:
         - summary: Market-level summary metrics
         - recommendations: List of item recommendations
         - filters_applied: Currently active filters
+        - next_cursor: Cursor of the next page (None on the last page)
     """
     try:
-        df = load_recommendations_with_metadata()
+        index = _recommendations_cache.get()
         
-        if df.empty:
+        if index.frame.empty:
             return {
                 "summary": None,
                 "recommendations": [],
-                "filters_applied": {"market": market, "category": category}
+                "filters_applied": {"market": market, "category": category},
+                "next_cursor": None
             }
         
-        # Apply filters (convert to string if needed)
-        filtered_df = df.copy()
-        market_str = str(market) if market else None
-        category_str = str(category) if category else None
-        
         # Handle limit - extract from Query object if needed
         try:
             limit_int = int(limit) if isinstance(limit, int) else int(limit.default if hasattr(limit, 'default') else 20)
         except (ValueError, AttributeError):
             limit_int = 20
+        if not isinstance(cursor, str):
+            cursor = None
         
-        if market_str and market_str.lower() != "all":
-            filtered_df = filtered_df[
-                filtered_df["market"].str.lower() == market_str.lower()
-            ]
-        
-        if category_str and category_str.lower() != "all":
-            filtered_df = filtered_df[
-                filtered_df["category"].str.lower() == category_str.lower()
-            ]
+        # Precomputed group: positions in priority order + summary
+        members, group_summary = index.lookup(
+            filter_label(market), filter_label(category)
+        )
         
-        if filtered_df.empty:
+        if group_summary is None:
             return {
                 "summary": {
                     "total_items": 0,
@@ -245,58 +411,37 @@ def get_inventory_plan(
                     "category_context": category or "All Categories"
                 },
                 "recommendations": [],
-                "filters_applied": {"market": market, "category": category}
+                "filters_applied": {"market": market, "category": category},
+                "next_cursor": None
             }
         
-        # Calculate summary metrics
-        total_forecast = filtered_df["forecast_units"].sum()
-        total_order = filtered_df["recommended_order_qty"].sum()
+        # Summary metrics of the whole group (not just this page)
+        total_forecast = group_summary["total_forecast"]
+        total_order = group_summary["total_order_qty"]
         total_safety = total_order - total_forecast
         avg_safety_pct = (total_safety / total_forecast * 100) if total_forecast > 0 else 0
         
-        # Risk distribution
-        risk_counts = filtered_df["demand_risk"].value_counts().to_dict()
-        
         summary = {
-            "total_items": len(filtered_df),
+            "total_items": group_summary["total_items"],
             "total_forecast": round(total_forecast, 0),
             "total_order_qty": round(total_order, 0),
             "avg_safety_buffer_pct": round(avg_safety_pct, 1),
-            "high_risk_count": risk_counts.get("High", 0),
-            "medium_risk_count": risk_counts.get("Medium", 0),
-            "low_risk_count": risk_counts.get("Low", 0),
+            "high_risk_count": group_summary["high_risk_count"],
+            "medium_risk_count": group_summary["medium_risk_count"],
+            "low_risk_count": group_summary["low_risk_count"],
             "market_context": market or "All Markets",
             "category_context": category or "All Categories"
         }
         
-        # Prepare recommendations (sorted by risk, then order qty)
-        risk_priority = {"High": 0, "Medium": 1, "Low": 2}
-        filtered_df["risk_priority"] = filtered_df["demand_risk"].map(risk_priority)
-        sorted_df = filtered_df.sort_values(
-            ["risk_priority", "recommended_order_qty"], 
-            ascending=[True, False]
-        ).head(limit_int)
-        
-        recommendations = []
-        for _, row in sorted_df.iterrows():
-            safety_pct = ((row["recommended_order_qty"] - row["forecast_units"]) / row["forecast_units"] * 100) if row["forecast_units"] > 0 else 0
-            
-            recommendations.append({
-                "product_id": row["product_id"],
-                "product_name": row.get("product_name_display", f"Product {row.get('product_id', 'Unknown')}"),
-                "category": row.get("category_display", row.get("category", "Unknown")),
-                "market": row.get("market", "Unknown"),
-                "forecast_units": round(row["forecast_units"], 0),
-                "recommended_order_qty": int(row["recommended_order_qty"]),
-                "safety_stock": int(row["safety_stock"]),
-                "safety_buffer_pct": round(safety_pct, 1),
-                "risk_level": row["demand_risk"]
-            })
+        # Page of recommendations (sorted by risk, then order qty)
+        positions, next_cursor = index.page(members, cursor, limit_int)
+        recommendations = _recommendation_records(index.frame.iloc[positions])
         
         return {
             "summary": summary,
             "recommendations": recommendations,
-            "filters_applied": {"market": market, "category": category}
+            "filters_applied": {"market": market, "category": category},
+            "next_cursor": next_cursor
         }
         
     except HTTPException:
@@ -316,36 +461,27 @@ def get_inventory_metrics(
     Uses market-level data rather than store-level.
     """
     try:
-        df = load_recommendations_with_metadata()
+        index = _recommendations_cache.get()
         
-        if df.empty:
+        if index.frame.empty:
             return _empty_metrics_response(market, category)
         
-        # Apply filters
-        filtered_df = df.copy()
-        market_str = str(market) if market else None
-        category_str = str(category) if category else None
-        
-        if market_str and market_str.lower() != "all":
-            filtered_df = filtered_df[filtered_df["market"].str.lower() == market_str.lower()]
+        # Precomputed group summary (same groups as /inventory/plan)
+        _, group_summary = index.lookup(filter_label(market), filter_label(category))
         
-        if category_str and category_str.lower() != "all":
-            filtered_df = filtered_df[filtered_df["category"].str.lower() == category_str.lower()]
-        
-        if filtered_df.empty:
+        if group_summary is None:
             return _empty_metrics_response(market, category)
         
         # Calculate metrics
-        total_forecast = filtered_df["forecast_units"].sum()
-        total_order = filtered_df["recommended_order_qty"].sum()
+        total_forecast = group_summary["total_forecast"]
+        total_order = group_summary["total_order_qty"]
         total_safety = total_order - total_forecast
         
         # Risk analysis - now reframed as inventory cost strategy
-        risk_counts = filtered_df["demand_risk"].value_counts().to_dict()
-        high_risk_count = risk_counts.get("High", 0)  # High cost (aggressive safety)
-        medium_risk_count = risk_counts.get("Medium", 0)  # Balanced
-        low_risk_count = risk_counts.get("Low", 0)  # Lean/optimized
-        total_items = len(filtered_df)
+        high_risk_count = group_summary["high_risk_count"]  # High cost (aggressive safety)
+        medium_risk_count = group_summary["medium_risk_count"]  # Balanced
+        low_risk_count = group_summary["low_risk_count"]  # Lean/optimized
+        total_items = group_summary["total_items"]
         
         # Safety buffer percentage (actual inventory cost impact)
         safety_buffer_pct = round((total_safety / total_forecast * 100), 0) if total_forecast > 0 else 0
@@ -413,6 +549,49 @@ def get_inventory_metrics(
         raise HTTPException(status_code=500, detail=f"Error calculating metrics: {str(e)}")
 
 
+def _recommendation_records(df: pd.DataFrame) -> List[Dict]:
+    """Build plan response items column by column."""
+    def column(name, default):
+        return df[name].tolist() if name in df.columns else [default] * len(df)
+
+    product_ids = df["product_id"].tolist()
+    if "product_name_display" in df.columns:
+        product_names = df["product_name_display"].tolist()
+    else:
+        product_names = [f"Product {pid}" for pid in product_ids]
+    if "category_display" in df.columns:
+        categories = df["category_display"].tolist()
+    else:
+        categories = column("category", "Unknown")
+
+    forecast = df["forecast_units"].to_numpy(dtype=float)
+    order_qty = df["recommended_order_qty"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        safety_pct = (order_qty - forecast) / forecast * 100
+    # Python round() keeps the exact decimal behaviour of the JSON output
+    safety_pct = [
+        round(pct, 1) if units > 0 else 0
+        for pct, units in zip(safety_pct.tolist(), forecast.tolist())
+    ]
+
+    keys = (
+        "product_id", "product_name", "category", "market", "forecast_units",
+        "recommended_order_qty", "safety_stock", "safety_buffer_pct", "risk_level",
+    )
+    columns = (
+        product_ids,
+        product_names,
+        categories,
+        column("market", "Unknown"),
+        [round(units, 0) for units in df["forecast_units"].tolist()],
+        df["recommended_order_qty"].astype(np.int64).tolist(),
+        df["safety_stock"].astype(np.int64).tolist(),
+        safety_pct,
+        df["demand_risk"].tolist(),
+    )
+    return [dict(zip(keys, values)) for values in zip(*columns)]
+
+
 def _empty_metrics_response(market: Optional[str], category: Optional[str]) -> Dict:
     """Return empty metrics structure."""
     return {
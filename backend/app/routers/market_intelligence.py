@@ -17,7 +17,7 @@ from fastapi import APIRouter, Query
 from typing import Optional, List, Dict
 
 from backend.app.services.market_intelligence_service import (
-    market_intelligence_service
+    get_market_intelligence_service
 )
 
 router = APIRouter(prefix="/api/v1", tags=["Market Intelligence"])
@@ -31,7 +31,7 @@ def get_markets() -> List[str]:
     Returns:
         List of market names (e.g., ["APAC", "Europe", "North America"])
     """
-    return market_intelligence_service.get_markets()
+    return get_market_intelligence_service().get_markets()
 
 
 @router.get("/market/summary")
@@ -59,4 +59,4 @@ def get_market_summary(
     Returns:
         List of market intelligence objects
     """
-    return market_intelligence_service.get_market_summary(market)
+    return get_market_intelligence_service().get_market_summary(market)
@@ -1,30 +1,18 @@
-import pandas as pd
 from fastapi import APIRouter, HTTPException
-from pathlib import Path
 
-router = APIRouter(prefix="/api/v1", tags=["Metadata"])
+from backend.app.services.dimension_catalog import (
+    DimensionCatalog,
+    get_dimension_catalog,
+)
 
-BASE_DIR = Path(__file__).resolve().parents[3]
-DATA_PATH = BASE_DIR / "data/processed/feature_engineered_data.csv"
+router = APIRouter(prefix="/api/v1", tags=["Metadata"])
 
-def load_data():
-    """Load data with better error handling."""
+def load_catalog() -> DimensionCatalog:
+    """Dimension catalog with its store/product lists built, with better error handling."""
     try:
-        if not DATA_PATH.exists():
-            raise FileNotFoundError(f"Data file not found at {DATA_PATH}")
-        
-        df = pd.read_csv(DATA_PATH)
-        
-        if df.empty:
-            raise ValueError("Data file is empty")
-        
-        if "store_id" not in df.columns:
-            raise ValueError("store_id column not found in data")
-        
-        if "product_id" not in df.columns:
-            raise ValueError("product_id column not found in data")
-        
-        return df
+        catalog = get_dimension_catalog()
+        catalog.stores()
+        return catalog
     except FileNotFoundError as e:
         raise HTTPException(
             status_code=500, 
@@ -45,8 +33,7 @@ def load_data():
 def get_stores():
     """Get list of unique stores from the dataset."""
     try:
-        df = load_data()
-        stores = sorted(df["store_id"].unique().tolist())
+        stores = load_catalog().stores()
         
         if not stores:
             raise HTTPException(
@@ -67,8 +54,7 @@ def get_stores():
 def get_products(store_id: str):
     """Get list of unique products for a specific store."""
     try:
-        df = load_data()
-        products = df[df["store_id"] == store_id]["product_id"].unique()
+        products = load_catalog().products(store_id)
         
         if len(products) == 0:
             raise HTTPException(
@@ -76,7 +62,7 @@ def get_products(store_id: str):
                 detail=f"No products found for store: {store_id}"
             )
         
-        return sorted(products.tolist())
+        return products
     except HTTPException:
         raise
     except Exception as e:
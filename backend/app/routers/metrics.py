@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from backend.app.core.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    # Prometheus text exposition of this worker's counters and histograms
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -1,5 +1,31 @@
-from pydantic import BaseModel
-from typing import List
+import math
+from pydantic import BaseModel, Field, model_validator
+from typing import Annotated, List, Optional
+
+# Request limits live here rather than in the services, so importing
+# the request models never pulls in the model and data loading chain
+
+# Longest multi-week forecast served (weeks ahead)
+MAX_HORIZON = 52
+
+# Most multipliers evaluated by one sweep
+MAX_SWEEP_POINTS = 201
+
+# Largest demand multiplier a sweep accepts (10x the forecast)
+MAX_MULTIPLIER = 10.0
+
+# One finite sweep multiplier in (0, MAX_MULTIPLIER]
+Multiplier = Annotated[float, Field(gt=0, le=MAX_MULTIPLIER, allow_inf_nan=False)]
+
+
+def multiplier_count(start: float, stop: float, step: float) -> int:
+    """Points of ``multiplier_grid(start, stop, step)``."""
+    return int(math.floor((stop - start) / step + 1e-9)) + 1
+
+
+def multiplier_grid(start: float, stop: float, step: float) -> List[float]:
+    """``start``, ``start + step``, ... up to ``stop`` inclusive."""
+    return [round(start + i * step, 6) for i in range(multiplier_count(start, stop, step))]
 
 
 class ForecastRequest(BaseModel):
@@ -9,6 +35,29 @@ class ForecastRequest(BaseModel):
 
 class BatchForecastRequest(BaseModel):
     items: List[ForecastRequest]
+    horizon: int = Field(
+        default=1,
+        ge=1,
+        le=MAX_HORIZON,
+        description="Weeks ahead to forecast; > 1 adds horizon_forecasts"
+    )
+
+
+class StreamForecastRequest(BaseModel):
+    """JSON body of /forecast/batch/stream: latest-week forecasts only."""
+    items: List[ForecastRequest]
+    horizon: int = Field(
+        default=1,
+        ge=1,
+        le=1,
+        description="Streams serve the latest week; use /forecast/batch for horizon > 1"
+    )
+
+
+class HorizonForecast(BaseModel):
+    week_ahead: int
+    week: str
+    forecast_units: float
 
 
 class ForecastResponse(BaseModel):
@@ -18,3 +67,96 @@ class ForecastResponse(BaseModel):
     recommended_order_qty: int
     safety_stock: float
     risk_level: str
+    horizon_forecasts: Optional[List[HorizonForecast]] = None
+
+
+class BatchExplainRequest(BaseModel):
+    items: List[ForecastRequest]
+
+
+class FeatureContribution(BaseModel):
+    feature: str
+    impact: float
+    contribution: Optional[float] = None
+
+
+class ExplanationResponse(BaseModel):
+    store_id: str
+    product_id: str
+    baseline_units: Optional[float] = None
+    forecast_units: Optional[float] = None
+    top_features: List[FeatureContribution]
+
+
+class BatchConfidenceRequest(BaseModel):
+    items: List[ForecastRequest]
+    confidence_level: float = Field(
+        default=0.95,
+        gt=0,
+        lt=1,
+        description="Central coverage of the interval, e.g. 0.8 or 0.95"
+    )
+
+
+class ConfidenceResponse(BaseModel):
+    store_id: str
+    product_id: str
+    forecast: float
+    lower_bound: float
+    upper_bound: float
+    margin_of_error: float
+    confidence_level: float
+    method: str
+
+
+class ScenarioSweepRequest(BaseModel):
+    """
+    Pairs come from ``items`` when given, otherwise from the
+    market / category / store filters (whole portfolio if none).
+    Multipliers come from ``multipliers`` when given, otherwise from
+    the ``min_multiplier`` .. ``max_multiplier`` grid by ``step``.
+    """
+    items: Optional[List[ForecastRequest]] = None
+    market: Optional[str] = None
+    category: Optional[str] = None
+    store_id: Optional[str] = None
+    multipliers: Optional[List[Multiplier]] = None
+    min_multiplier: Multiplier = 0.7
+    max_multiplier: Multiplier = 1.5
+    step: float = Field(default=0.05, gt=0, allow_inf_nan=False)
+
+    @model_validator(mode="after")
+    def check_multipliers(self) -> "ScenarioSweepRequest":
+        if self.multipliers is not None:
+            if not self.multipliers:
+                raise ValueError("multipliers must be a non-empty list of positive numbers")
+            points = len(self.multipliers)
+        else:
+            if self.max_multiplier < self.min_multiplier:
+                raise ValueError("max_multiplier must be >= min_multiplier")
+            points = multiplier_count(self.min_multiplier, self.max_multiplier, self.step)
+        if points > MAX_SWEEP_POINTS:
+            raise ValueError(f"A sweep evaluates at most {MAX_SWEEP_POINTS} multipliers")
+        return self
+
+    def multiplier_values(self) -> List[float]:
+        if self.multipliers is not None:
+            return list(self.multipliers)
+        return multiplier_grid(self.min_multiplier, self.max_multiplier, self.step)
+
+
+class ScenarioSurfacePoint(BaseModel):
+    demand_multiplier: float
+    forecast_units: float
+    safety_stock: float
+    recommended_order_qty: int
+    order_qty_delta: int
+    order_cost: float
+    cost_delta: float
+
+
+class ScenarioSweepResponse(BaseModel):
+    pairs: int
+    priced_pairs: int
+    multipliers: List[float]
+    surface: List[ScenarioSurfacePoint]
@@ -0,0 +1,376 @@
+"""
+Walk-forward Backtesting
+------------------------
+Rolling-origin evaluation of the candidate demand models over every
+store/product pair, replacing the one-off split of
+``notebooks/08_model_comparison.ipynb``.
+
+Folds:
+- The evaluation weeks are the weeks after the notebook's split date
+  (the ``1 - test_fraction`` quantile of ``week`` over all rows)
+- They are cut into ``folds`` contiguous windows; each window is
+  predicted by models trained on every row before its first week
+  (expanding window), so no fold sees its own future
+- ``folds=1`` is exactly the notebook's train/test split
+
+Execution:
+- Every (model, fold) fit is an independent task fanned out over a
+  process pool; the feature matrix is handed to each worker once by the
+  pool initializer instead of being pickled per task
+- Estimators that parallelise internally are pinned to one thread
+  inside the pool so workers do not oversubscribe the cores
+- ``workers=1`` runs in-process, which is also the fallback on
+  single-core machines
+
+Outputs (``BacktestResult.write``):
+- ``model_comparison_metrics.csv``: model, MAE, RMSE pooled over all
+  folds, sorted by MAE (the notebook's file)
+- ``backtest/fold_metrics.csv``: the same per fold, with window bounds,
+  row counts and fit time
+- ``backtest/pair_errors.csv``: rows, MAE, RMSE and bias per
+  store/product pair and model
+- ``backtest/residuals.csv``: actual minus predicted units of every
+  evaluated row per model; out-of-sample errors the confidence service
+  turns into forecast intervals. Rows of the production model's type
+  carry the fingerprint of the serving model file
+  (``model_fingerprint``), so the bands are only used with the model
+  the backtest was run against
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+
+from backend.app.core.artifacts import METADATA_PATH, MODEL_PATH, file_fingerprint
+from backend.app.core.config import DATA_DIR
+from backend.app.core.datasets import load_dataset
+
+
+FEATURE_DATA_PATH = DATA_DIR / "feature_engineered_data.csv"
+
+TARGET = "weekly_units_sold"
+PAIR_KEYS = ["store_id", "product_id"]
+
+# Candidate features of the notebook; the ones present in the data are used
+FEATURE_CANDIDATES = [
+    "lag_1_units_sold",
+    "lag_2_units_sold",
+    "rolling_4wk_mean",
+    "rolling_4wk_std",
+    "price",
+    "discount",
+    "competitor_pricing",
+    "seasonality",
+]
+BASELINE_FEATURE = "lag_1_units_sold"
+
+DEFAULT_FOLDS = 4
+DEFAULT_TEST_FRACTION = 0.2
+
+BACKTEST_SUBDIR = "backtest"
+METRICS_FILE = "model_comparison_metrics.csv"
+FOLD_METRICS_FILE = "fold_metrics.csv"
+PAIR_ERRORS_FILE = "pair_errors.csv"
+RESIDUALS_FILE = "residuals.csv"
+
+
+class NaiveLag1:
+    """
+    NaiveLag1
+    ----
+    - Baseline: next week's demand equals last week's
+    - Predicts the ``lag_1_units_sold`` column; fitting is a no-op
+    """
+
+    def __init__(self, column: int):
+        self.column = column
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> "NaiveLag1":
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return X[:, self.column].astype(float)
+
+
+# Candidate models with the notebook's hyperparameters. Factories take
+# the feature list so the baseline can locate its column.
+CANDIDATE_MODELS: Dict[str, Callable[[List[str]], object]] = {
+    "Naive_Lag1": lambda features: NaiveLag1(features.index(BASELINE_FEATURE)),
+    "Linear_Regression": lambda features: LinearRegression(),
+    "Ridge_Regression": lambda features: Ridge(alpha=1.0),
+    "Random_Forest": lambda features: RandomForestRegressor(
+        n_estimators=200,
+        max_depth=12,
+        random_state=42,
+        n_jobs=-1
+    ),
+    "Gradient_Boosting": lambda features: GradientBoostingRegressor(
+        n_estimators=200,
+        learning_rate=0.05,
+        max_depth=4,
+        random_state=42
+    ),
+}
+
+
+@dataclass
+class Fold:
+    """Training rows are weeks before ``start``; test rows weeks in [start, end]."""
+    number: int
+    train_end: pd.Timestamp
+    start: pd.Timestamp
+    end: pd.Timestamp
+    train_rows: int
+    test_rows: int
+
+
+@dataclass
+class BacktestResult:
+    metrics: pd.DataFrame
+    fold_metrics: pd.DataFrame
+    pair_errors: pd.DataFrame
+    residuals: pd.DataFrame
+    elapsed_seconds: float
+
+    def write(self, output_dir: Path) -> List[Path]:
+        """Write the metrics file and the backtest tables under ``output_dir``."""
+        output_dir = Path(output_dir)
+        detail_dir = output_dir / BACKTEST_SUBDIR
+        detail_dir.mkdir(parents=True, exist_ok=True)
+
+        paths = [
+            output_dir / METRICS_FILE,
+            detail_dir / FOLD_METRICS_FILE,
+            detail_dir / PAIR_ERRORS_FILE,
+            detail_dir / RESIDUALS_FILE,
+        ]
+        frames = [self.metrics, self.fold_metrics, self.pair_errors, self.residuals]
+        for frame, path in zip(frames, paths):
+            frame.to_csv(path, index=False)
+        return paths
+
+
+# ------------------------------------------------------------------
+# Data and folds
+# ------------------------------------------------------------------
+
+def production_model(
+    model_path: Path = MODEL_PATH,
+    metadata_path: Path = METADATA_PATH
+) -> Tuple[Optional[str], Optional[str]]:
+    """(selected model name, model file fingerprint), or Nones without one."""
+    if not Path(model_path).exists() or not Path(metadata_path).exists():
+        return None, None
+    selected = pd.read_csv(metadata_path).iloc[0]["selected_model"]
+    return selected, file_fingerprint(model_path)
+
+
+def load_backtest_frame(path: Path = FEATURE_DATA_PATH) -> pd.DataFrame:
+    """Feature rows in pair/week order, as the notebook prepared them."""
+    df = load_dataset(path, parse_dates=["week"])
+    return df.sort_values(PAIR_KEYS + ["week"]).reset_index(drop=True)
+
+
+def select_features(df: pd.DataFrame) -> List[str]:
+    return [col for col in FEATURE_CANDIDATES if col in df.columns]
+
+
+def rolling_origin_folds(
+    weeks: pd.Series,
+    folds: int = DEFAULT_FOLDS,
+    test_fraction: float = DEFAULT_TEST_FRACTION
+) -> List[Fold]:
+    """
+    Contiguous evaluation windows over the weeks after the split date.
+
+    The split date is the ``1 - test_fraction`` quantile of ``weeks``
+    taken over rows, as in the notebook. Windows hold a near-equal
+    number of distinct weeks; ``folds`` is capped at that many weeks.
+    """
+    if folds < 1:
+        raise ValueError("folds must be at least 1")
+    if not 0 < test_fraction < 1:
+        raise ValueError("test_fraction must be between 0 and 1")
+
+    split_date = weeks.quantile(1 - test_fraction)
+    test_weeks = np.sort(weeks[weeks > split_date].unique())
+    if len(test_weeks) == 0:
+        raise ValueError("No weeks after the split date to evaluate")
+
+    values = weeks.to_numpy()
+    result = []
+    for number, window in enumerate(np.array_split(test_weeks, min(folds, len(test_weeks))), start=1):
+        start, end = window[0], window[-1]
+        result.append(Fold(
+            number=number,
+            train_end=pd.Timestamp(values[values < start].max()),
+            start=pd.Timestamp(start),
+            end=pd.Timestamp(end),
+            train_rows=int((values < start).sum()),
+            test_rows=int(((values >= start) & (values <= end)).sum())
+        ))
+    return result
+
+
+# ------------------------------------------------------------------
+# Fitting (runs in pool workers)
+# ------------------------------------------------------------------
+
+# Per-process feature matrix, set by _init_worker (or directly when serial)
+_WORKER_DATA: Dict[str, object] = {}
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, weeks: np.ndarray, features: List[str], pooled: bool) -> None:
+    _WORKER_DATA.update(X=X, y=y, weeks=weeks, features=features, pooled=pooled)
+
+
+def _fit_predict(name: str, start: np.datetime64, end: np.datetime64):
+    """Fit ``name`` on the rows before ``start``; predict the rows in [start, end]."""
+    X, y, weeks = _WORKER_DATA["X"], _WORKER_DATA["y"], _WORKER_DATA["weeks"]
+
+    model = CANDIDATE_MODELS[name](_WORKER_DATA["features"])
+    if _WORKER_DATA["pooled"] and hasattr(model, "n_jobs"):
+        model.set_params(n_jobs=1)
+
+    train = weeks < start
+    test = (weeks >= start) & (weeks <= end)
+
+    fit_start = time.perf_counter()
+    model.fit(X[train], y[train])
+    fit_seconds = time.perf_counter() - fit_start
+    return model.predict(X[test]), fit_seconds
+
+
+# ------------------------------------------------------------------
+# Backtest
+# ------------------------------------------------------------------
+
+def run_backtest(
+    df: Optional[pd.DataFrame] = None,
+    models: Optional[Sequence[str]] = None,
+    folds: int = DEFAULT_FOLDS,
+    test_fraction: float = DEFAULT_TEST_FRACTION,
+    workers: Optional[int] = None
+) -> BacktestResult:
+    """
+    Walk-forward evaluation of ``models`` (default: all candidates).
+
+    ``df`` defaults to the processed feature data; rows missing a
+    feature or the target are dropped. ``workers`` defaults to the CPU
+    count, capped at the number of (model, fold) tasks.
+    """
+    start_time = time.perf_counter()
+    if df is None:
+        df = load_backtest_frame()
+
+    models = list(models or CANDIDATE_MODELS)
+    unknown = [name for name in models if name not in CANDIDATE_MODELS]
+    if unknown:
+        raise ValueError(f"Unknown models: {', '.join(unknown)}")
+
+    features = select_features(df)
+    if BASELINE_FEATURE not in features and "Naive_Lag1" in models:
+        raise ValueError(f"Naive_Lag1 needs the {BASELINE_FEATURE} column")
+    df = df.dropna(subset=features + [TARGET])
+
+    fold_list = rolling_origin_folds(df["week"], folds, test_fraction)
+
+    X = df[features].to_numpy(dtype=float)
+    y = df[TARGET].to_numpy(dtype=float)
+    weeks = df["week"].to_numpy()
+
+    tasks = [(name, fold) for name in models for fold in fold_list]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+
+    if workers == 1:
+        _init_worker(X, y, weeks, features, pooled=False)
+        outputs = [
+            _fit_predict(name, fold.start.to_datetime64(), fold.end.to_datetime64())
+            for name, fold in tasks
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(X, y, weeks, features, True)
+        ) as pool:
+            futures = [
+                pool.submit(_fit_predict, name, fold.start.to_datetime64(), fold.end.to_datetime64())
+                for name, fold in tasks
+            ]
+            outputs = [future.result() for future in futures]
+
+    # Test rows of every fold, in fold order; predictions line up with them
+    test_masks = [
+        (weeks >= fold.start.to_datetime64()) & (weeks <= fold.end.to_datetime64())
+        for fold in fold_list
+    ]
+    test_rows = np.concatenate([np.flatnonzero(mask) for mask in test_masks])
+    actual = y[test_rows]
+    test_keys = df[PAIR_KEYS + ["week"]].iloc[test_rows].reset_index(drop=True)
+    pair_codes, pairs = pd.MultiIndex.from_frame(test_keys[PAIR_KEYS]).factorize()
+
+    fold_rows = []
+    predictions: Dict[str, List[np.ndarray]] = {name: [] for name in models}
+    for (name, fold), (preds, fit_seconds), mask in zip(tasks, outputs, test_masks * len(models)):
+        predictions[name].append(preds)
+        errors = preds - y[mask]
+        fold_rows.append({
+            "model": name,
+            "fold": fold.number,
+            "train_end": fold.train_end.date(),
+            "test_start": fold.start.date(),
+            "test_end": fold.end.date(),
+            "train_rows": fold.train_rows,
+            "test_rows": fold.test_rows,
+            "MAE": float(np.abs(errors).mean()),
+            "RMSE": float(np.sqrt((errors ** 2).mean())),
+            "fit_seconds": round(fit_seconds, 3),
+        })
+
+    metric_rows = []
+    pair_frames = []
+    residual_frames = []
+    counts = np.bincount(pair_codes, minlength=len(pairs))
+    selected_model, fingerprint = production_model()
+    for name in models:
+        errors = np.concatenate(predictions[name]) - actual
+        metric_rows.append({
+            "model": name,
+            "MAE": float(np.abs(errors).mean()),
+            "RMSE": float(np.sqrt((errors ** 2).mean())),
+        })
+
+        pair_frame = pairs.to_frame(index=False, name=PAIR_KEYS)
+        pair_frame["model"] = name
+        pair_frame["rows"] = counts
+        pair_frame["MAE"] = np.bincount(pair_codes, np.abs(errors), len(pairs)) / counts
+        pair_frame["RMSE"] = np.sqrt(np.bincount(pair_codes, errors ** 2, len(pairs)) / counts)
+        pair_frame["bias"] = np.bincount(pair_codes, errors, len(pairs)) / counts
+        pair_frames.append(pair_frame)
+
+        residual_frame = test_keys.copy()
+        residual_frame["model"] = name
+        residual_frame["residual"] = -errors
+        residual_frame["model_fingerprint"] = (
+            fingerprint if name == selected_model else ""
+        )
+        residual_frames.append(residual_frame)
+
+    return BacktestResult(
+        metrics=pd.DataFrame(metric_rows).sort_values("MAE").reset_index(drop=True),
+        fold_metrics=pd.DataFrame(fold_rows),
+        pair_errors=pd.concat(pair_frames, ignore_index=True).sort_values(
+            PAIR_KEYS + ["MAE"]
+        ).reset_index(drop=True),
+        residuals=pd.concat(residual_frames, ignore_index=True),
+        elapsed_seconds=time.perf_counter() - start_time
+    )
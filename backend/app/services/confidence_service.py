@@ -1,26 +1,325 @@
+import threading
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+from backend.app.core.artifacts import background_reload_active, get_artifact_registry
+from backend.app.core.cache import VersionedCache
+from backend.app.core.config import MODELS_DIR
+from backend.app.core.datasets import dataset_exists, load_dataset
+from backend.app.core.metrics import timed
+from backend.app.services.forecasting_service import get_forecasting_service
+
+
+# Out-of-sample residuals written by scripts/run_backtest.py
+RESIDUALS_PATH = MODELS_DIR / "backtest" / "residuals.csv"
+
+# Residual quantiles stored per pair: 0, 0.005, ..., 1
+QUANTILE_GRID = np.linspace(0.0, 1.0, 201)
+
+# Pairs with fewer residuals borrow the portfolio-wide quantiles. The
+# default backtest evaluates about 20 weeks per pair.
+MIN_RESIDUALS = 12
+
+# Fallback margin when a pair has no volatility estimate
+FALLBACK_MARGIN_PCT = 0.15
+
+
+class _ResidualQuantiles:
+    """Per-pair residual quantile grid for one (model, residual file) version."""
+
+    def __init__(
+        self,
+        model_version: int,
+        residuals: Optional[pd.DataFrame],
+        pairs: List[Tuple[str, str]],
+        grid: np.ndarray,
+        pooled: Optional[np.ndarray],
+        counts: np.ndarray
+    ):
+        self.model_version = model_version
+        self.residuals = residuals
+        self.index: Dict[Tuple[str, str], int] = {
+            pair: i for i, pair in enumerate(pairs)
+        }
+        self.grid = grid
+        self.pooled = pooled
+        self.counts = counts
+
+
 class ConfidenceService:
-    """Service for calculating confidence bounds around forecasts."""
-    
+    """
+    ConfidenceService
+    -----------------
+    - Forecast intervals from the model's out-of-sample errors: the
+      walk-forward backtest (``scripts/run_backtest.py``) records the
+      residual of every week it predicted with models refit on earlier
+      weeks only, and each pair keeps a compact grid of the production
+      model's residual quantiles
+    - ``band`` / ``bands`` answer any confidence level by interpolating
+      two grid entries, so request time stays O(1) per pair
+    - Pairs with few backtested weeks use the portfolio-wide quantiles
+
+    Residual rows are matched on the serving model file's fingerprint,
+    not just the model type, so a retrained model never borrows the
+    previous model's errors. Without residuals for the loaded model
+    (file missing, or backtested against another model file) bands fall
+    back to forecast +/- z * rolling_std, reported as
+    ``method: rolling_std``; those are not calibrated.
+    """
+
+    def __init__(self, forecast_service=None):
+        self.forecast_service = forecast_service
+        self.artifacts = get_artifact_registry()
+        self.residuals = VersionedCache(
+            "backtest_residuals", _load_residuals, [RESIDUALS_PATH]
+        )
+
+        self._table: Optional[_ResidualQuantiles] = None
+        self._lock = threading.Lock()
+
+        # Recompute after a reload, once the table has been used
+        self.artifacts.add_listener(self._refresh_after_reload)
+
+    def band(
+        self,
+        store_id: str,
+        product_id: str,
+        confidence_level: float = 0.95
+    ) -> Optional[Dict]:
+        """Interval around a pair's latest forecast (None if not found)."""
+        return self.bands([(store_id, product_id)], confidence_level)[0]
+
+    @timed("confidence.bands")
+    def bands(
+        self,
+        pairs: List[Tuple[str, str]],
+        confidence_level: float = 0.95
+    ) -> List[Optional[Dict]]:
+        """Batch variant of ``band``, aligned with ``pairs``."""
+        table = self._current()
+        forecasts = self.forecast_service.recommendations(pairs)
+
+        low_q = (1 - confidence_level) / 2
+        high_q = 1 - low_q
+        z = NormalDist().inv_cdf(high_q)
+
+        results: List[Optional[Dict]] = []
+        for pair, forecast in zip(pairs, forecasts):
+            if forecast is None:
+                results.append(None)
+                continue
+
+            row = table.index.get(pair)
+            if row is not None and table.counts[row] >= MIN_RESIDUALS:
+                quantiles, method = table.grid[row], "backtest_residual_quantiles"
+            elif table.pooled is not None:
+                quantiles, method = table.pooled, "portfolio_backtest_residual_quantiles"
+            else:
+                margin = (
+                    z * forecast["rolling_std"] if forecast["rolling_std"]
+                    else forecast["forecast_units"] * FALLBACK_MARGIN_PCT
+                )
+                results.append(self._interval(
+                    forecast["forecast_units"], -margin, margin,
+                    confidence_level, "rolling_std",
+                ))
+                continue
+
+            results.append(self._interval(
+                forecast["forecast_units"],
+                interpolate(quantiles, low_q),
+                interpolate(quantiles, high_q),
+                confidence_level,
+                method,
+            ))
+        return results
+
+    def prepare(self) -> None:
+        """Build the residual quantiles now instead of on first use."""
+        self._current()
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
     @staticmethod
-    def confidence_band(forecast_units, rolling_std, confidence_level=0.95):
-        """
-        Calculate confidence bounds using rolling standard deviation.
-        
-        Args:
-            forecast_units: Forecasted quantity
-            rolling_std: Rolling standard deviation of historical data
-            confidence_level: Confidence level (default 95%)
-        
-        Returns:
-            Dictionary with lower_bound and upper_bound
-        """
-        # Use rolling_std as margin of error
-        # For 95% confidence, use ~1.96 * std, but rolling_std already captures volatility
-        margin = rolling_std * 1.96 if rolling_std else forecast_units * 0.15
-        
+    def _interval(
+        forecast_units: float,
+        low_residual: float,
+        high_residual: float,
+        confidence_level: float,
+        method: str
+    ) -> Dict:
+        lower = forecast_units + low_residual
+        upper = forecast_units + high_residual
         return {
             "forecast": forecast_units,
-            "lower_bound": max(0, forecast_units - margin),
-            "upper_bound": forecast_units + margin,
-            "margin_of_error": margin
+            "lower_bound": round(max(0.0, lower), 2),
+            "upper_bound": round(max(0.0, upper), 2),
+            "margin_of_error": round((upper - lower) / 2, 2),
+            "confidence_level": confidence_level,
+            "method": method,
         }
+
+    def _current(self) -> _ResidualQuantiles:
+        table = self._table
+        if table is not None and background_reload_active():
+            # The artifact watcher swaps in the recomputed table
+            return table
+
+        self.artifacts.refresh_model()
+        artifact = self.artifacts.model()
+        residuals = self.residuals.get()
+
+        table = self._table
+        if not _built_from(table, artifact.version, residuals):
+            with self._lock:
+                table = self._table
+                if not _built_from(table, artifact.version, residuals):
+                    table = self._build(
+                        artifact.version,
+                        artifact.fingerprint,
+                        residuals,
+                    )
+                    self._table = table
+
+        return table
+
+    def _refresh_after_reload(self) -> None:
+        if self._table is not None:
+            self._current()
+
+    @timed("confidence.residuals_build")
+    def _build(
+        self,
+        model_version: int,
+        model_fingerprint: str,
+        residuals: Optional[pd.DataFrame]
+    ) -> _ResidualQuantiles:
+        rows = (
+            residuals[residuals["model_fingerprint"] == model_fingerprint]
+            if residuals is not None
+            else None
+        )
+        if rows is None or rows.empty:
+            if residuals is not None:
+                print(
+                    f"WARNING: No backtest residuals for model file {model_fingerprint}; "
+                    "using rolling_std bands"
+                )
+            return _ResidualQuantiles(
+                model_version, residuals, [], np.zeros((0, len(QUANTILE_GRID))), None,
+                np.zeros(0, dtype=np.int64),
+            )
+
+        # Group each pair's residuals into one contiguous block
+        codes, pairs = pd.MultiIndex.from_frame(rows[["store_id", "product_id"]]).factorize()
+        order = np.argsort(codes, kind="stable")
+        values = rows["residual"].to_numpy(dtype=float)[order]
+        sizes = np.bincount(codes, minlength=len(pairs))
+        stops = np.cumsum(sizes)
+        grid, counts = block_quantiles(values, stops - sizes, stops, QUANTILE_GRID)
+
+        pooled = (
+            np.quantile(values[np.isfinite(values)], QUANTILE_GRID)
+            if np.isfinite(values).any() else None
+        )
+        return _ResidualQuantiles(
+            model_version, residuals, list(pairs), grid.astype(np.float32), pooled, counts
+        )
+
+
+def _built_from(
+    table: Optional[_ResidualQuantiles],
+    model_version: int,
+    residuals: Optional[pd.DataFrame]
+) -> bool:
+    return (
+        table is not None
+        and table.model_version == model_version
+        and table.residuals is residuals
+    )
+
+
+def _load_residuals() -> Optional[pd.DataFrame]:
+    """Backtest residuals (None until the backtest has been run)."""
+    if not dataset_exists(RESIDUALS_PATH):
+        return None
+    residuals = load_dataset(RESIDUALS_PATH, dtype={"model_fingerprint": str})
+    if "model_fingerprint" not in residuals.columns:
+        # Written before fingerprints were recorded: matches no model
+        residuals["model_fingerprint"] = None
+    return residuals[["store_id", "product_id", "model_fingerprint", "residual"]]
+
+
+def block_quantiles(
+    values: np.ndarray,
+    starts: np.ndarray,
+    stops: np.ndarray,
+    quantiles: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Linear-interpolated quantiles (``np.quantile`` default) of each
+    contiguous block ``values[start:stop]``, ignoring NaN, in one pass.
+
+    Returns:
+        (blocks x quantiles matrix, finite values per block)
+    """
+    n_blocks = len(starts)
+    if n_blocks == 0:
+        return np.zeros((0, len(quantiles))), np.zeros(0, dtype=np.int64)
+
+    lengths = stops - starts
+    block = np.repeat(np.arange(n_blocks), lengths)
+    # Positions of every block's rows, gathered without a Python loop
+    positions = np.arange(lengths.sum()) + np.repeat(
+        starts - np.cumsum(lengths) + lengths, lengths
+    )
+    taken = values[positions]
+    finite = np.isfinite(taken)
+    block, taken = block[finite], taken[finite]
+
+    # Sort by value within each block; blocks stay contiguous
+    order = np.lexsort((taken, block))
+    taken = taken[order]
+    counts = np.bincount(block, minlength=n_blocks)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    out = np.zeros((n_blocks, len(quantiles)))
+    present = counts > 0
+    ranks = quantiles[None, :] * (counts[present, None] - 1)
+    low = np.floor(ranks).astype(np.int64)
+    high = np.minimum(low + 1, counts[present, None] - 1)
+    fraction = ranks - low
+    base = offsets[present, None]
+    out[present] = (
+        taken[base + low] * (1 - fraction) + taken[base + high] * fraction
+    )
+    return out, counts
+
+
+def interpolate(grid: np.ndarray, q: float) -> float:
+    """Quantile ``q`` from a ``QUANTILE_GRID``-aligned row."""
+    position = q * (len(grid) - 1)
+    low = int(position)
+    high = min(low + 1, len(grid) - 1)
+    fraction = position - low
+    return float(grid[low]) * (1 - fraction) + float(grid[high]) * fraction
+
+
+# --------------------------------------------------
+# Process-wide instance
+# --------------------------------------------------
+_confidence_service: Optional[ConfidenceService] = None
+_confidence_service_lock = threading.Lock()
+
+
+def get_confidence_service() -> ConfidenceService:
+    """Return the process-wide ConfidenceService, creating it on first use."""
+    global _confidence_service
+    if _confidence_service is None:
+        with _confidence_service_lock:
+            if _confidence_service is None:
+                _confidence_service = ConfidenceService(get_forecasting_service())
+    return _confidence_service
@@ -0,0 +1,538 @@
+"""
+Demand Cube
+-----------
+In-memory aggregation cube of weekly demand over
+
+- location: market -> region -> store
+- product:  category -> product
+- week
+
+built from the shared feature data plus the store / product attribute
+mappings of the dimension catalog (cleaned_data). Stores without a
+region roll up to ``Unknown`` / ``Other``, products without a category
+to ``Unknown``.
+
+Rollups:
+- Every combination of a location level (all, market, region, store)
+  and a product level (all, category, product) is pre-aggregated:
+  12 rollups whose rows are the member combinations present in the data
+- Each row stores running totals over the week axis (units sold and
+  pair-weeks with data), so the total of any week range is one
+  subtraction per row
+- A drilldown picks the coarsest rollup that can answer it and filters
+  its rows; raw feature rows are never rescanned per request
+
+Incremental updates:
+- The cube is keyed on (feature data version, attribute mappings)
+- It remembers each pair's row count and the week and units of its last
+  row; a reload with the same pairs and mappings whose rows up to those
+  counts still end on the same tails only appended weeks
+- Only the rows past the remembered counts are aggregated, and the
+  running totals of every rollup are extended with their weeks: the
+  cost follows the new rows, not the history
+- Anything else (new pairs, changed tails, remapped stores, no new
+  rows, rows at or before the last known week) rebuilds
+- The signature is deliberately cheap: a file that appends weeks and
+  also restates older weeks of a pair without touching its last row is
+  taken as append-only. Regenerated history normally arrives without
+  new weeks, which always rebuilds
+- After a hot reload the artifact watcher updates the cube in the
+  background while requests keep reading the previous one
+"""
+
+import copy
+import threading
+import numpy as np
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from backend.app.core.artifacts import background_reload_active, get_artifact_registry
+from backend.app.core.metrics import timed
+from backend.app.services.dimension_catalog import (
+    DEFAULT_MARKET,
+    AttributeDimensions,
+    filter_label,
+    get_dimension_catalog,
+)
+from backend.app.services.feature_store import _IndexedFeatures, get_feature_store
+from backend.app.services.forecast_horizon import SALES_COLUMN
+
+
+LOCATION_LEVELS = ["market", "region", "store_id"]
+PRODUCT_LEVELS = ["category", "product_id"]
+LEVELS = LOCATION_LEVELS + PRODUCT_LEVELS
+
+# Pseudo-level of a hierarchy that is not broken down
+ALL = "all"
+ALL_MEMBER = "All"
+
+UNKNOWN_REGION = "Unknown"
+UNKNOWN_CATEGORY = "Unknown"
+
+
+class _Rollup:
+    """
+    One pre-aggregated level combination. Rows are the distinct
+    (location member, product member) combinations, in code order.
+    """
+
+    def __init__(
+        self,
+        levels: Tuple[str, str],
+        pair_codes: Dict[str, np.ndarray],
+        sizes: Dict[str, int],
+        units: np.ndarray,
+        counts: np.ndarray
+    ):
+        location, product = levels
+        combined = pair_codes[location] * sizes[product] + pair_codes[product]
+        keys, row_of_pair = np.unique(combined, return_inverse=True)
+
+        # Pairs grouped by row, so each row is a contiguous reduceat range
+        self._order = np.argsort(row_of_pair, kind="stable")
+        self._starts = np.searchsorted(row_of_pair[self._order], np.arange(len(keys)))
+
+        # Member codes of every row at each level it determines
+        first_pair = self._order[self._starts]
+        self.codes = {
+            level: pair_codes[level][first_pair]
+            for level in _covered(location, LOCATION_LEVELS) + _covered(product, PRODUCT_LEVELS)
+        }
+        self.pairs = np.diff(np.append(self._starts, len(row_of_pair)))
+
+        self.units = _running_total(self._sum(units))
+        self.counts = _running_total(self._sum(counts))
+
+    def append(self, units: np.ndarray, counts: np.ndarray) -> None:
+        """Extend the running totals with new week columns."""
+        self.units = _extend_running_total(self.units, self._sum(units))
+        self.counts = _extend_running_total(self.counts, self._sum(counts))
+
+    def _sum(self, values: np.ndarray) -> np.ndarray:
+        if values.shape[1] == 0 or len(self._starts) == 0:
+            return np.zeros((len(self._starts), values.shape[1]))
+        return np.add.reduceat(values[self._order], self._starts, axis=0)
+
+
+class _PairTails:
+    """
+    Row count of every pair plus the week and units of its last row:
+    the signature an append-only reload must preserve.
+    """
+
+    def __init__(self, snapshot: _IndexedFeatures, pairs: List[Tuple[str, str]]):
+        bounds = np.array(
+            [snapshot.slices[pair] for pair in pairs], dtype=np.int64
+        ).reshape(-1, 2)
+        self.starts = bounds[:, 0]
+        self.rows = bounds[:, 1] - bounds[:, 0]
+        self.last_week, self.last_units = _rows_at(snapshot, bounds[:, 1] - 1)
+
+    def continues(self, previous: "_PairTails", snapshot: _IndexedFeatures) -> bool:
+        """
+        True if some pair gained rows and every pair still holds
+        ``previous``'s rows, ending on the same tail. A reload without
+        new rows rewrote existing ones, so it never continues.
+        """
+        if len(self.rows) != len(previous.rows) or (self.rows < previous.rows).any():
+            return False
+        if not (self.rows > previous.rows).any():
+            return False
+        last_week, last_units = _rows_at(snapshot, self.starts + previous.rows - 1)
+        return (
+            np.array_equal(last_week, previous.last_week)
+            and np.array_equal(last_units, previous.last_units, equal_nan=True)
+        )
+
+
+class _Cube:
+    """Week axis, dimension members and every rollup of one data version."""
+
+    def __init__(
+        self,
+        version: Tuple[int, int],
+        attributes: AttributeDimensions,
+        pairs: List[Tuple[str, str]],
+        tails: _PairTails,
+        weeks: np.ndarray,
+        units: np.ndarray,
+        counts: np.ndarray
+    ):
+        self.version = version
+        self.attributes = attributes
+        self.pairs = pairs
+        self.tails = tails
+        self.weeks = weeks
+        self.loaded_at = datetime.now()
+
+        stores = [store for store, _ in pairs]
+        products = [product for _, product in pairs]
+        regions = [attributes.store_regions.get(s, UNKNOWN_REGION) for s in stores]
+        labels = {
+            "market": [attributes.store_markets.get(s, DEFAULT_MARKET) for s in stores],
+            "region": regions,
+            "store_id": stores,
+            "category": [attributes.product_categories.get(p, UNKNOWN_CATEGORY) for p in products],
+            "product_id": products,
+        }
+
+        # Member names (sorted) and the code of every pair at each level
+        self.members: Dict[str, List[str]] = {ALL: [ALL_MEMBER]}
+        self.pair_codes: Dict[str, np.ndarray] = {ALL: np.zeros(len(pairs), dtype=np.int64)}
+        for level, values in labels.items():
+            names, codes = np.unique(np.array(values, dtype=object), return_inverse=True)
+            self.members[level] = names.tolist()
+            self.pair_codes[level] = codes.astype(np.int64)
+        # Lower-cased member -> codes, so filters match case-insensitively
+        # like /inventory/plan (members differing only in case share a key)
+        self.lookup: Dict[str, Dict[str, np.ndarray]] = {}
+        for level, names in self.members.items():
+            codes_by_name: Dict[str, List[int]] = {}
+            for code, name in enumerate(names):
+                codes_by_name.setdefault(str(name).lower(), []).append(code)
+            self.lookup[level] = {
+                name: np.array(codes, dtype=np.int64)
+                for name, codes in codes_by_name.items()
+            }
+
+        sizes = {level: len(names) for level, names in self.members.items()}
+        self.rollups = {
+            (location, product): _Rollup(
+                (location, product), self.pair_codes, sizes, units, counts
+            )
+            for location in [ALL] + LOCATION_LEVELS
+            for product in [ALL] + PRODUCT_LEVELS
+        }
+
+    def extends(
+        self,
+        attributes: AttributeDimensions,
+        pairs: List[Tuple[str, str]],
+        tails: _PairTails,
+        snapshot: _IndexedFeatures
+    ) -> bool:
+        """True if ``snapshot`` holds this cube's rows plus rows appended per pair."""
+        return (
+            len(self.weeks) > 0
+            and attributes is self.attributes
+            and pairs == self.pairs
+            and tails.continues(self.tails, snapshot)
+        )
+
+    def appended(
+        self,
+        version: Tuple[int, int],
+        tails: _PairTails,
+        weeks: np.ndarray,
+        units: np.ndarray,
+        counts: np.ndarray
+    ) -> "_Cube":
+        """Copy of this cube extended with new week columns (``units`` / ``counts``)."""
+        cube = copy.copy(self)
+        cube.version = version
+        cube.tails = tails
+        cube.weeks = np.concatenate([self.weeks, weeks])
+        cube.loaded_at = datetime.now()
+
+        # Readers of the previous cube keep its rollups untouched
+        cube.rollups = {}
+        for levels, rollup in self.rollups.items():
+            extended = copy.copy(rollup)
+            extended.append(units, counts)
+            cube.rollups[levels] = extended
+        return cube
+
+
+def _covered(level: str, hierarchy: List[str]) -> List[str]:
+    """Levels of a hierarchy determined by ``level`` (itself and above)."""
+    if level == ALL:
+        return [ALL]
+    return [ALL] + hierarchy[:hierarchy.index(level) + 1]
+
+
+def _running_total(values: np.ndarray) -> np.ndarray:
+    total = np.zeros((values.shape[0], values.shape[1] + 1))
+    np.cumsum(values, axis=1, out=total[:, 1:])
+    return total
+
+
+def _extend_running_total(total: np.ndarray, values: np.ndarray) -> np.ndarray:
+    if values.shape[1] == 0:
+        return total
+    tail = total[:, -1:] + np.cumsum(values, axis=1)
+    return np.hstack([total, tail])
+
+
+class DemandCubeService:
+    """
+    DemandCubeService
+    -----------------
+    - ``drilldown(by, filters, start_week, end_week)`` serves any slice
+      of weekly demand from the pre-aggregated rollups
+    - Built once per data version, extended in place of a rebuild when
+      only new weeks arrived
+
+    Returned structures are built per request; the cube is shared.
+    """
+
+    def __init__(self):
+        self.store = get_feature_store()
+        self.catalog = get_dimension_catalog()
+
+        self._cube: Optional[_Cube] = None
+        self._lock = threading.Lock()
+        self.incremental_updates = 0
+        self.full_builds = 0
+        self._current()
+
+        # Update the cube on the watcher thread after a reload
+        get_artifact_registry().add_listener(self._current_after_reload)
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def levels(self) -> Dict[str, List[str]]:
+        """Members of every level (sorted)."""
+        cube = self._current()
+        return {level: cube.members[level] for level in LEVELS}
+
+    @timed("demand_cube.drilldown")
+    def drilldown(
+        self,
+        by: str,
+        filters: Dict[str, str],
+        start_week: Optional[date] = None,
+        end_week: Optional[date] = None
+    ) -> Dict:
+        """
+        Demand of a slice broken down by one level (or by ``week``).
+
+        ``filters`` maps levels to member names, matched
+        case-insensitively ("all" or empty: no filter); unknown members
+        select nothing. Weeks are inclusive bounds.
+        """
+        cube = self._current()
+        filters = {
+            level: name for level, name in filters.items()
+            if filter_label(name) is not None
+        }
+
+        # Finest level each hierarchy has to resolve
+        location = _finest([by, *filters], LOCATION_LEVELS)
+        product = _finest([by, *filters], PRODUCT_LEVELS)
+        rollup = cube.rollups[(location, product)]
+
+        selected = np.ones(len(rollup.pairs), dtype=bool)
+        for level, name in filters.items():
+            codes = cube.lookup[level].get(filter_label(name))
+            if codes is None:
+                selected[:] = False
+                break
+            selected &= np.isin(rollup.codes[level], codes)
+        rows = np.flatnonzero(selected)
+
+        lo = 0 if start_week is None else int(np.searchsorted(cube.weeks, np.datetime64(start_week), side="left"))
+        hi = len(cube.weeks) if end_week is None else int(np.searchsorted(cube.weeks, np.datetime64(end_week), side="right"))
+        hi = max(hi, lo)
+
+        units = rollup.units[rows]
+        counts = rollup.counts[rows]
+        total_units = float(units[:, hi].sum() - units[:, lo].sum())
+
+        if by == "week":
+            weekly_units = np.diff(units[:, lo:hi + 1], axis=1).sum(axis=0)
+            weekly_counts = np.diff(counts[:, lo:hi + 1], axis=1).sum(axis=0)
+            breakdown = [
+                {
+                    "week": week,
+                    "total_units": round(value, 2),
+                    "avg_units_per_pair": round(value / count, 2) if count else 0,
+                }
+                for week, value, count in zip(
+                    np.datetime_as_string(cube.weeks[lo:hi], unit="D").tolist(),
+                    weekly_units.tolist(),
+                    weekly_counts.tolist(),
+                )
+            ]
+        else:
+            # Rows of one member of ``by`` are combined (normally one row each)
+            groups = rollup.codes[by][rows]
+            size = len(cube.members[by])
+            row_units = np.bincount(groups, units[:, hi] - units[:, lo], minlength=size)
+            row_counts = np.bincount(groups, counts[:, hi] - counts[:, lo], minlength=size)
+            row_pairs = np.bincount(groups, rollup.pairs[rows], minlength=size).astype(np.int64)
+            present = np.flatnonzero(row_pairs)
+            present = present[np.argsort(-row_units[present], kind="stable")]
+            weeks_in_range = hi - lo
+            breakdown = [
+                {
+                    by: cube.members[by][code],
+                    "total_units": round(value, 2),
+                    "share_pct": round(value / total_units * 100, 1) if total_units else 0,
+                    "avg_weekly_units": round(value / weeks_in_range, 2) if weeks_in_range else 0,
+                    "avg_units_per_pair": round(value / count, 2) if count else 0,
+                    "pairs": pairs,
+                }
+                for code, value, count, pairs in zip(
+                    present.tolist(),
+                    row_units[present].tolist(),
+                    row_counts[present].tolist(),
+                    row_pairs[present].tolist(),
+                )
+            ]
+
+        week_labels = np.datetime_as_string(cube.weeks[lo:hi], unit="D").tolist()
+        return {
+            "by": by,
+            "filters": filters,
+            "weeks": {
+                "start": week_labels[0] if week_labels else None,
+                "end": week_labels[-1] if week_labels else None,
+                "count": len(week_labels),
+            },
+            "total_units": round(total_units, 2),
+            "rows": breakdown,
+        }
+
+    def info(self) -> Dict:
+        cube = self._cube
+        if cube is None:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            "pairs": len(cube.pairs),
+            "weeks": len(cube.weeks),
+            "rollup_rows": sum(len(r.pairs) for r in cube.rollups.values()),
+            "full_builds": self.full_builds,
+            "incremental_updates": self.incremental_updates,
+            "loaded_at": cube.loaded_at.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    # --------------------------------------------------
+    # Build / update
+    # --------------------------------------------------
+    def _current(self) -> _Cube:
+        cube = self._cube
+        if cube is not None and background_reload_active():
+            # The artifact watcher swaps in the updated cube
+            return cube
+        return self._update()
+
+    def _current_after_reload(self) -> None:
+        """Artifact listener: bring the cube up to date."""
+        self._update()
+
+    def _update(self) -> _Cube:
+        self.store.refresh()
+        attributes = self.catalog.attributes()
+        snapshot = self.store.snapshot()
+        version = (snapshot.version, id(attributes))
+
+        cube = self._cube
+        if cube is None or cube.version != version:
+            with self._lock:
+                cube = self._cube
+                if cube is None or cube.version != version:
+                    cube = self._build(version, attributes, snapshot, cube)
+                    self._cube = cube
+        return cube
+
+    @timed("demand_cube.build")
+    def _build(
+        self,
+        version: Tuple[int, int],
+        attributes: AttributeDimensions,
+        snapshot: _IndexedFeatures,
+        previous: Optional[_Cube]
+    ) -> _Cube:
+        pairs = snapshot.pairs()
+        tails = _PairTails(snapshot, pairs)
+
+        if previous is not None and previous.extends(attributes, pairs, tails, snapshot):
+            appended = self._appended_weeks(snapshot, previous, tails)
+            if appended is not None:
+                self.incremental_updates += 1
+                return previous.appended(version, tails, *appended)
+
+        self.full_builds += 1
+        weeks, units, counts = _pair_week_matrix(
+            snapshot, tails.starts, np.zeros(len(pairs), dtype=np.int64), tails.rows
+        )
+        return _Cube(version, attributes, pairs, tails, weeks, units, counts)
+
+    @staticmethod
+    def _appended_weeks(
+        snapshot: _IndexedFeatures,
+        previous: _Cube,
+        tails: _PairTails
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        (weeks, units, counts) of the rows each pair gained since
+        ``previous``, or None if any of them is not after its last week.
+        """
+        weeks, units, counts = _pair_week_matrix(
+            snapshot, tails.starts, previous.tails.rows, tails.rows - previous.tails.rows
+        )
+        if len(weeks) and weeks[0] <= previous.weeks[-1]:
+            return None
+        return weeks, units, counts
+
+
+def _rows_at(snapshot: _IndexedFeatures, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Week and units sold of the rows at ``positions``."""
+    data = snapshot.data
+    weeks = data["week"].to_numpy()[positions].astype("datetime64[D]")
+    units = data[SALES_COLUMN].to_numpy()[positions].astype(float)
+    return weeks, units
+
+
+def _pair_week_matrix(
+    snapshot: _IndexedFeatures,
+    starts: np.ndarray,
+    offsets: np.ndarray,
+    lengths: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Week axis plus units sold and data presence as (pair x week)
+    matrices, over rows ``starts + offsets`` .. ``+ lengths`` of each
+    pair's block (only those rows are read).
+    """
+    pair_index = np.repeat(np.arange(len(starts)), lengths)
+    # Positions of the selected rows, gathered without a Python loop
+    positions = np.arange(lengths.sum()) + np.repeat(
+        starts + offsets - np.cumsum(lengths) + lengths, lengths
+    )
+
+    week_values, sales = _rows_at(snapshot, positions)
+    weeks = np.unique(week_values)
+    week_index = np.searchsorted(weeks, week_values)
+    present = np.isfinite(sales)
+
+    units = np.zeros((len(starts), len(weeks)))
+    counts = np.zeros((len(starts), len(weeks)))
+    np.add.at(units, (pair_index[present], week_index[present]), sales[present])
+    np.add.at(counts, (pair_index[present], week_index[present]), 1.0)
+    return weeks, units, counts
+
+
+def _finest(levels: List[str], hierarchy: List[str]) -> str:
+    """Finest level of ``hierarchy`` among ``levels`` (ALL if none)."""
+    positions = [hierarchy.index(level) for level in levels if level in hierarchy]
+    return hierarchy[max(positions)] if positions else ALL
+
+
+# --------------------------------------------------
+# Process-wide instance
+# --------------------------------------------------
+_demand_cube_service: Optional[DemandCubeService] = None
+_demand_cube_service_lock = threading.Lock()
+
+
+def get_demand_cube_service() -> DemandCubeService:
+    """Return the process-wide DemandCubeService, creating it on first use."""
+    global _demand_cube_service
+    if _demand_cube_service is None:
+        with _demand_cube_service_lock:
+            if _demand_cube_service is None:
+                _demand_cube_service = DemandCubeService()
+    return _demand_cube_service
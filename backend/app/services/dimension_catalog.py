@@ -0,0 +1,240 @@
+"""
+Dimension Catalog
+-----------------
+Static dimension lists behind the UI dropdowns and planning filters:
+
+- sorted store IDs and the sorted product IDs of each store
+  (from the shared feature data)
+- product categories with display names, store -> region -> market
+  and product -> category mappings (from cleaned_data, when present)
+
+Each half is built once per version of its source file and then
+served from memory, so the metadata endpoints never re-parse a CSV.
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from backend.app.core.config import DATA_DIR
+from backend.app.core.cache import VersionedCache
+from backend.app.core.datasets import dataset_exists, load_dataset
+from backend.app.services.feature_store import get_feature_store
+
+
+# --------------------------------------------------
+# Project base directory
+# --------------------------------------------------
+BASE_DIR = Path(__file__).resolve().parents[3]
+
+CLEANED_DATA_PATH = DATA_DIR / "cleaned_data.csv"
+
+# Market mapping based on data analysis (regions -> markets)
+REGION_TO_MARKET = {
+    "North": "North America",
+    "South": "APAC",
+    "East": "APAC",
+    "West": "Europe"
+}
+
+# Category mapping for enterprise display names
+CATEGORY_DISPLAY_NAMES = {
+    "Electronics": "Consumer Electronics",
+    "Clothing": "Apparel & Fashion",
+    "Groceries": "Consumer Goods",
+    "Toys": "Toys & Games",
+    "Furniture": "Home & Furniture"
+}
+
+DEFAULT_MARKET = "Other"
+
+
+class StoreProductDimensions:
+    """Sorted stores and per-store sorted products."""
+
+    def __init__(self, stores: List[str], products_by_store: Dict[str, List[str]]):
+        self.stores = stores
+        self.products_by_store = products_by_store
+
+
+class AttributeDimensions:
+    """Categories and store/product attribute mappings from cleaned data."""
+
+    def __init__(
+        self,
+        categories: List[Dict[str, str]],
+        store_regions: Dict[str, str],
+        product_categories: Dict[str, str],
+        available: bool
+    ):
+        self.categories = categories
+        self.store_regions = store_regions
+        self.store_markets = {
+            store: REGION_TO_MARKET.get(region, DEFAULT_MARKET)
+            for store, region in store_regions.items()
+        }
+        self.product_categories = product_categories
+        # False when cleaned_data is missing and defaults are served
+        self.available = available
+
+
+class DimensionCatalog:
+    """
+    DimensionCatalog
+    ----------------
+    - ``stores()`` / ``products(store_id)`` come from the feature data
+    - ``categories()`` and the attribute mappings come from cleaned_data
+    - ``pairs(market, category, store_id)`` selects a portfolio slice
+    - Both halves are rebuilt only when their source file changes
+
+    Returned lists are shared and must not be mutated.
+    """
+
+    def __init__(self):
+        self.feature_store = get_feature_store()
+        self._store_products = VersionedCache(
+            "dimension_catalog.store_products",
+            self._build_store_products,
+            [self.feature_store.path],
+        )
+        self._attributes = VersionedCache(
+            "dimension_catalog.attributes",
+            self._build_attributes,
+            [CLEANED_DATA_PATH],
+        )
+
+    # --------------------------------------------------
+    # Store / product dimensions
+    # --------------------------------------------------
+    def stores(self) -> List[str]:
+        return self._store_products.get().stores
+
+    def products(self, store_id: str) -> List[str]:
+        """Sorted products of a store (empty list if the store is unknown)."""
+        return self._store_products.get().products_by_store.get(store_id, [])
+
+    # --------------------------------------------------
+    # Attribute dimensions
+    # --------------------------------------------------
+    def categories(self) -> List[Dict[str, str]]:
+        return self._attributes.get().categories
+
+    def attributes(self) -> AttributeDimensions:
+        return self._attributes.get()
+
+    def pairs(
+        self,
+        market: Optional[str] = None,
+        category: Optional[str] = None,
+        store_id: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Store-product pairs matching every given filter, in store /
+        product order. Market and category use the cleaned_data
+        mappings and match case-insensitively ("all" means no filter,
+        as on /inventory/plan); pairs without a mapping never match.
+        """
+        dims = self._store_products.get()
+        stores = [store_id] if store_id is not None else dims.stores
+        market = filter_label(market)
+        category = filter_label(category)
+        attributes = self.attributes() if market or category else None
+
+        selected = []
+        for store in stores:
+            if market and (attributes.store_markets.get(store) or "").lower() != market:
+                continue
+            for product in dims.products_by_store.get(store, []):
+                if category and (attributes.product_categories.get(product) or "").lower() != category:
+                    continue
+                selected.append((store, product))
+        return selected
+
+    def info(self) -> List[Dict]:
+        return [self._store_products.info(), self._attributes.info()]
+
+    # --------------------------------------------------
+    # Builders
+    # --------------------------------------------------
+    def _build_store_products(self) -> StoreProductDimensions:
+        store = self.feature_store
+        if not store.is_loaded and not dataset_exists(store.path):
+            raise FileNotFoundError(f"Data file not found at {store.path}")
+
+        store.refresh()
+        snapshot = store.snapshot()
+        df = snapshot.data
+
+        if df.empty:
+            raise ValueError("Data file is empty")
+        if "store_id" not in df.columns:
+            raise ValueError("store_id column not found in data")
+        if "product_id" not in df.columns:
+            raise ValueError("product_id column not found in data")
+
+        products_by_store: Dict[str, List[str]] = {}
+        for store_id, product_id in snapshot.pairs():
+            products_by_store.setdefault(store_id, []).append(product_id)
+        for products in products_by_store.values():
+            products.sort()
+
+        return StoreProductDimensions(sorted(products_by_store), products_by_store)
+
+    def _build_attributes(self) -> AttributeDimensions:
+        if not dataset_exists(CLEANED_DATA_PATH):
+            # Default categories if cleaned data is not available
+            return AttributeDimensions(
+                [
+                    {"id": cat, "name": display}
+                    for cat, display in CATEGORY_DISPLAY_NAMES.items()
+                ],
+                {},
+                {},
+                available=False,
+            )
+
+        df = load_dataset(CLEANED_DATA_PATH)
+        categories = df["category"].dropna().unique().tolist()
+
+        store_regions: Dict[str, str] = {}
+        if "region" in df.columns:
+            regions = df[["store_id", "region"]].dropna().drop_duplicates("store_id")
+            store_regions = dict(zip(regions["store_id"], regions["region"]))
+
+        product_categories = df[["product_id", "category"]].dropna().drop_duplicates(
+            "product_id"
+        )
+
+        return AttributeDimensions(
+            [
+                {"id": cat, "name": CATEGORY_DISPLAY_NAMES.get(cat, cat)}
+                for cat in sorted(categories)
+            ],
+            store_regions,
+            dict(zip(product_categories["product_id"], product_categories["category"])),
+            available=True,
+        )
+
+
+def filter_label(value: Optional[str]) -> Optional[str]:
+    """Lower-cased filter value, or None for no filter ("all" or empty)."""
+    if not value or value.lower() == "all":
+        return None
+    return value.lower()
+
+
+# --------------------------------------------------
+# Process-wide instance
+# --------------------------------------------------
+_catalog: Optional[DimensionCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_dimension_catalog() -> DimensionCatalog:
+    """Return the process-wide DimensionCatalog, creating it on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = DimensionCatalog()
+    return _catalog
@@ -0,0 +1,381 @@
+"""
+Feature Store
+-------------
+Single in-process home of the feature-engineered dataset.
+
+Every router and service that needs ``feature_engineered_data.csv``
+borrows the DataFrame from here instead of parsing its own copy, so a
+worker holds exactly one resident frame regardless of how many
+endpoints consume it.
+
+Lifecycle:
+- Nothing is read at import time
+- The first ``data`` access (or an explicit ``load()``) loads the
+  dataset (binary snapshot if present, CSV otherwise)
+- ``reload()`` re-reads the file and swaps the frame in one assignment
+- ``refresh()`` reloads only if the file changed on disk; ``version``
+  increases on every (re)load so consumers can key derived data on it
+- The store is registered with the artifact registry: while its
+  watcher runs, ``poll()`` reloads in the background and ``refresh()``
+  in request paths becomes a no-op
+
+Shared across workers (``core/shared_data.py``):
+- The ordered frame is published once per host as a memory-mapped
+  snapshot; every worker attaches to it instead of holding a private
+  copy, with store/product IDs as categoricals over the mapped codes
+- A changed file is re-published by one worker, the others attach to
+  the new version on their next reload
+
+Keyed access:
+- At load the frame is ordered by (store_id, product_id, week), so
+  every pair's history is one contiguous block of rows
+- A dictionary maps each (store_id, product_id) to its row range, so
+  the latest row or the full history of a pair is an O(1) lookup
+  instead of a full-frame mask and sort
+"""
+
+import itertools
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from backend.app.core.artifacts import background_reload_active, get_artifact_registry
+from backend.app.core.config import DATA_DIR
+from backend.app.core.datasets import dataset_signature, load_dataset
+from backend.app.core.shared_data import ENABLED as SHARED_DATA_ENABLED, SharedDataset
+
+
+# --------------------------------------------------
+# Project base directory
+# --------------------------------------------------
+BASE_DIR = Path(__file__).resolve().parents[3]
+
+FEATURE_DATA_PATH = DATA_DIR / "feature_engineered_data.csv"
+
+PAIR_KEYS = ["store_id", "product_id"]
+SORT_KEYS = PAIR_KEYS + ["week"]
+
+_versions = itertools.count(1)
+
+
+class _IndexedFeatures:
+    """Sorted feature frame plus its (store_id, product_id) row ranges."""
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        signature: Optional[Tuple[int, int]] = None
+    ):
+        if data.attrs.get("sorted_by") != SORT_KEYS:
+            data = data.sort_values(SORT_KEYS, kind="mergesort").reset_index(drop=True)
+
+        # Row positions where a new (store_id, product_id) block begins
+        # (compared on category codes when the IDs are categorical)
+        if len(data):
+            changed = np.zeros(len(data) - 1, dtype=bool)
+            for key in PAIR_KEYS:
+                column = data[key]
+                keys = (
+                    column.cat.codes.to_numpy()
+                    if isinstance(column.dtype, pd.CategoricalDtype)
+                    else column.to_numpy()
+                )
+                changed |= keys[1:] != keys[:-1]
+            starts = np.concatenate(([0], np.flatnonzero(changed) + 1))
+        else:
+            starts = np.array([], dtype=np.int64)
+        stops = np.append(starts[1:], len(data))
+        stores = data["store_id"].iloc[starts].tolist()
+        products = data["product_id"].iloc[starts].tolist()
+
+        self.data = data
+        self.signature = signature
+        self.version = next(_versions)
+        self.loaded_at = datetime.now()
+        self.slices: Dict[Tuple[str, str], Tuple[int, int]] = {
+            (store, product): (int(start), int(stop))
+            for store, product, start, stop in zip(
+                stores, products, starts.tolist(), stops.tolist()
+            )
+        }
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        return list(self.slices)
+
+    def latest_positions(self, pairs: List[Tuple[str, str]]) -> np.ndarray:
+        slices = self.slices
+        return np.fromiter(
+            (slices.get(pair, (0, 0))[1] - 1 for pair in pairs),
+            dtype=np.int64,
+            count=len(pairs),
+        )
+
+    def trailing_values(
+        self,
+        pairs: List[Tuple[str, str]],
+        column: str,
+        length: int
+    ) -> np.ndarray:
+        bounds = np.array(
+            [self.slices.get(pair, (0, 0)) for pair in pairs],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        starts, stops = bounds[:, 0], bounds[:, 1]
+
+        positions = stops[:, None] - length + np.arange(length)
+        positions = np.maximum(positions, starts[:, None])
+
+        values = self.data[column].to_numpy(dtype=float)
+        out = np.full(positions.shape, np.nan)
+        known = stops > starts
+        out[known] = values[positions[known]]
+        return out
+
+
+class FeatureStore:
+    """
+    FeatureStore
+    ------------
+    - Loads the feature-engineered dataset once per process
+    - Hands the same DataFrame to every consumer
+    - Indexes each store-product pair's contiguous history
+    - Reloads on request, or via refresh() when the file changed
+
+    Consumers must treat the returned DataFrames as read-only.
+    """
+
+    def __init__(self, path: Path = FEATURE_DATA_PATH):
+        self.path = Path(path)
+        self._shared = (
+            SharedDataset(
+                self.path, parse_dates=["week"], sort_by=SORT_KEYS,
+                categorical=PAIR_KEYS,
+            )
+            if SHARED_DATA_ENABLED else None
+        )
+        self._indexed: Optional[_IndexedFeatures] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> "FeatureStore":
+        """Build a store around an in-memory frame (benchmarks, tooling)."""
+        store = cls()
+        store._indexed = _IndexedFeatures(data)
+        return store
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._indexed is not None
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """Shared feature DataFrame (loaded on first access)."""
+        return self._current().data
+
+    @property
+    def version(self) -> int:
+        """Identifier of the loaded data; changes on every (re)load."""
+        return self._current().version
+
+    def load(self) -> pd.DataFrame:
+        """Load the dataset if it has not been loaded yet."""
+        return self._current().data
+
+    def reload(self) -> pd.DataFrame:
+        """Re-read the dataset and replace the shared frame and index."""
+        indexed = self._build()
+        with self._lock:
+            self._indexed = indexed
+        return indexed.data
+
+    def refresh(self) -> bool:
+        """
+        Request-path ``poll()``: skipped while the artifact watcher
+        reloads in the background.
+        """
+        if background_reload_active():
+            return False
+        return self.poll()
+
+    def poll(self) -> bool:
+        """
+        Reload if the source file changed since it was loaded.
+        Costs one ``stat`` call when nothing changed.
+
+        Returns:
+            True if the data was reloaded
+        """
+        if self._indexed is None or not self._is_stale():
+            return False
+        with self._refresh_lock:
+            # Another thread may have reloaded while we waited
+            if not self._is_stale():
+                return False
+            self.reload()
+        return True
+
+    def loaded_signature(self) -> Optional[Tuple[int, int]]:
+        indexed = self._indexed
+        return indexed.signature if indexed is not None else None
+
+    def info(self) -> Dict:
+        indexed = self._indexed
+        if indexed is None:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            "version": indexed.version,
+            "rows": len(indexed.data),
+            "pairs": len(indexed.slices),
+            "loaded_at": indexed.loaded_at.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    # --------------------------------------------------
+    # Keyed access
+    # --------------------------------------------------
+    def snapshot(self) -> _IndexedFeatures:
+        """
+        The loaded version as one unit: frame, row ranges and version.
+
+        Each accessor below reads whichever version is current when it
+        is called. Callers combining several lookups (positions, then
+        rows, then trailing values) pin one snapshot instead, so a
+        reload in between cannot index one version's positions into
+        another version's frame.
+        """
+        return self._current()
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        """All (store_id, product_id) pairs in storage order."""
+        return self._current().pairs()
+
+    def locate(
+        self,
+        store_id: str,
+        product_id: str
+    ) -> Optional[Tuple[int, int]]:
+        """Row range [start, stop) of a pair, or None if unknown."""
+        return self._current().slices.get((store_id, product_id))
+
+    def latest_positions(
+        self,
+        pairs: List[Tuple[str, str]]
+    ) -> np.ndarray:
+        """
+        Row positions of each pair's latest week in ``data``.
+        Unknown pairs are reported as -1.
+        """
+        return self._current().latest_positions(pairs)
+
+    def trailing_values(
+        self,
+        pairs: List[Tuple[str, str]],
+        column: str,
+        length: int
+    ) -> np.ndarray:
+        """
+        Last ``length`` values of ``column`` for each pair, oldest first,
+        as a (len(pairs), length) float matrix.
+
+        Pairs with a shorter history are left-padded with their first
+        value; unknown pairs get a row of NaN.
+        """
+        return self._current().trailing_values(pairs, column, length)
+
+    def history(
+        self,
+        store_id: str,
+        product_id: str
+    ) -> Optional[pd.DataFrame]:
+        """All rows of a pair ordered by week, or None if unknown."""
+        indexed = self._current()
+        bounds = indexed.slices.get((store_id, product_id))
+        if bounds is None:
+            return None
+        return indexed.data.iloc[bounds[0]:bounds[1]]
+
+    def arrays(
+        self,
+        store_id: str,
+        product_id: str,
+        columns: List[str]
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        A pair's history of ``columns`` as arrays ordered by week, or
+        None if unknown. The arrays are views into the shared frame.
+        """
+        indexed = self._current()
+        bounds = indexed.slices.get((store_id, product_id))
+        if bounds is None:
+            return None
+        start, stop = bounds
+        return {
+            column: indexed.data[column].to_numpy()[start:stop]
+            for column in columns
+        }
+
+    def latest(
+        self,
+        store_id: str,
+        product_id: str
+    ) -> Optional[pd.Series]:
+        """Latest-week row of a pair, or None if unknown."""
+        indexed = self._current()
+        bounds = indexed.slices.get((store_id, product_id))
+        if bounds is None:
+            return None
+        return indexed.data.iloc[bounds[1] - 1]
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+    def _current(self) -> _IndexedFeatures:
+        indexed = self._indexed
+        if indexed is None:
+            with self._lock:
+                if self._indexed is None:
+                    self._indexed = self._build()
+                indexed = self._indexed
+        return indexed
+
+    def _is_stale(self) -> bool:
+        loaded = self._current().signature
+        if loaded is None:
+            return False
+        current = dataset_signature(self.path)
+        # A missing file keeps the last good data in service
+        return current is not None and current != loaded
+
+    def _build(self) -> _IndexedFeatures:
+        signature = dataset_signature(self.path)
+        if self._shared is not None and signature is not None:
+            data = self._shared.load(signature)
+        else:
+            data = load_dataset(self.path, parse_dates=["week"])
+        return _IndexedFeatures(data, signature)
+
+
+# --------------------------------------------------
+# Process-wide instance
+# --------------------------------------------------
+_feature_store: Optional[FeatureStore] = None
+_feature_store_lock = threading.Lock()
+
+
+def get_feature_store() -> FeatureStore:
+    """Return the process-wide FeatureStore, creating it on first use."""
+    global _feature_store
+    if _feature_store is None:
+        with _feature_store_lock:
+            if _feature_store is None:
+                store = FeatureStore()
+                get_artifact_registry().register(
+                    "feature_data", store.poll, store.info,
+                    store.loaded_signature,
+                )
+                _feature_store = store
+    return _feature_store
@@ -1,9 +1,24 @@
+import threading
+import numpy as np
 import pandas as pd
-import joblib
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from backend.app.core.artifacts import (
+    ModelArtifact,
+    background_reload_active,
+    get_artifact_registry,
+)
+from backend.app.core.inference import get_inference_executor
+from backend.app.core.metrics import timed
+from backend.app.core.tree_evaluator import CompiledTreeEnsemble, compiled_predictor
+from backend.app.services.feature_store import _IndexedFeatures, get_feature_store
 
 BASE_DIR = Path(__file__).resolve().parents[3]
 
+# Features listed per explanation
+TOP_FEATURES = 5
+
 # Map ML feature names to business-friendly explanations
 FEATURE_NAMES = {
     "lag_1_units_sold": "Most recent sales trend",
@@ -21,63 +36,272 @@ FEATURE_NAMES = {
 }
 
 
+class _Contributions:
+    """
+    Portfolio path contributions for one (model, data) version.
+    ``unscored`` pairs have non-finite features and no decision path.
+    """
+
+    def __init__(
+        self,
+        version: Tuple[int, int],
+        features: List[str],
+        pairs: List[Tuple[str, str]],
+        baseline: float,
+        contributions: np.ndarray,
+        unscored: List[Tuple[str, str]]
+    ):
+        self.version = version
+        self.features = features
+        self.index: Dict[Tuple[str, str], int] = {
+            pair: i for i, pair in enumerate(pairs)
+        }
+        self.unscored = set(unscored)
+        self.baseline = baseline
+        self.contributions = contributions
+        self.forecasts = baseline + contributions.sum(axis=1)
+
+
 class ForecastExplanationService:
+    """
+    ForecastExplanationService
+    --------------------------
+    - Explains each pair's latest forecast by its own decision paths:
+      every tree split credits its change in predicted units to the
+      split feature (exact: baseline + contributions = forecast)
+    - Contributions for the whole portfolio are computed in one
+      vectorised pass when the model or data loads, then served from
+      memory (single and batch lookups)
+    - Models the compiled evaluator does not support fall back to the
+      global importance weighting, scored per request; so do pairs
+      whose latest features are NaN or infinite
+    """
+
     def __init__(self):
-        self.model = joblib.load(
-            BASE_DIR / "models" / "best_model.joblib"
-        )
+        # Shared production model + metadata (hot-reloadable)
+        self.artifacts = get_artifact_registry()
+        self.artifacts.model()
 
-        metadata = pd.read_csv(
-            BASE_DIR / "models" / "production_model_metadata.csv"
-        ).iloc[0]
+        self.store = get_feature_store()
+        self.store.load()
 
-        self.features = (
-            metadata["features_used"]
-            .strip("[]")
-            .replace("'", "")
-            .split(", ")
-        )
+        self.executor = get_inference_executor()
+
+        self._table: Optional[_Contributions] = None
+        self._unsupported: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self._current()
+
+        # Recompute on the watcher thread after a reload
+        self.artifacts.add_listener(self._rebuild)
+
+    @property
+    def model(self):
+        return self.artifacts.model().model
+
+    @property
+    def features(self):
+        return self.artifacts.model().features
+
+    @property
+    def data(self) -> pd.DataFrame:
+        return self.store.data
+
+    def explain(self, store_id: str, product_id: str) -> Optional[Dict]:
+        """
+        Explanation of a pair's latest forecast (None if not found):
+        ``top_features`` plus, for path contributions, the model
+        ``baseline_units`` and the ``forecast_units`` they add up to.
+        """
+        return self.explain_many([(store_id, product_id)])[0]
+
+    @timed("explanation.explain_many")
+    def explain_many(self, pairs: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+        """Batch variant of ``explain``, aligned with ``pairs``."""
+        table = self._current()
+        if table is None:
+            return [self._explain_by_importance(*pair) for pair in pairs]
+
+        results: List[Optional[Dict]] = []
+        for pair in pairs:
+            row = table.index.get(pair)
+            if row is None:
+                results.append(
+                    self._explain_by_importance(*pair)
+                    if pair in table.unscored else None
+                )
+                continue
+            results.append({
+                "baseline_units": round(table.baseline, 2),
+                "forecast_units": round(float(table.forecasts[row]), 2),
+                "top_features": top_contributions(
+                    table.contributions[row], table.features
+                ),
+            })
+        return results
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+    def _current(self) -> Optional[_Contributions]:
+        table = self._table
+        if table is not None and background_reload_active():
+            # The artifact watcher swaps in recomputed contributions
+            return table
+        return self._rebuild()
+
+    def _rebuild(self) -> Optional[_Contributions]:
+        self.artifacts.refresh_model()
+        self.store.refresh()
+        artifact = self.artifacts.model()
+        snapshot = self.store.snapshot()
+        version = (artifact.version, snapshot.version)
+
+        table = self._table
+        if (table is None or table.version != version) and self._unsupported != version:
+            with self._lock:
+                table = self._table
+                if (table is None or table.version != version) and self._unsupported != version:
+                    table = self._build(artifact, snapshot, version)
+                    if table is None:
+                        self._unsupported = version
+                    self._table = table
+
+        return table
+
+    @timed("explanation.contributions_build")
+    def _build(
+        self,
+        artifact: ModelArtifact,
+        snapshot: _IndexedFeatures,
+        version: Tuple[int, int]
+    ) -> Optional[_Contributions]:
+        pairs = snapshot.pairs()
+        positions = snapshot.latest_positions(pairs)
+        X = snapshot.data.iloc[positions][artifact.features].reset_index(drop=True)
 
-        self.data = pd.read_csv(
-            BASE_DIR / "data" / "processed" / "feature_engineered_data.csv",
-            parse_dates=["week"]
+        # Rows without a decision path are explained by importance instead
+        finite = np.isfinite(X.to_numpy(dtype=float)).all(axis=1)
+        scored = [pair for pair, ok in zip(pairs, finite) if ok]
+        unscored = [pair for pair, ok in zip(pairs, finite) if not ok]
+
+        result = self.executor.run(
+            path_contributions, artifact.model, X[finite].reset_index(drop=True)
+        )
+        if result is None:
+            return None
+        baseline, contributions = result
+        return _Contributions(
+            version, list(artifact.features), scored, baseline, contributions, unscored
         )
 
-    def explain(self, store_id: str, product_id: str):
-        df = self.data[
-            (df := self.data)["store_id"].eq(store_id) &
-            (df)["product_id"].eq(product_id)
-        ].sort_values("week")
+    def _explain_by_importance(self, store_id: str, product_id: str) -> Optional[Dict]:
+        latest = self.store.latest(store_id, product_id)
 
-        if df.empty:
+        if latest is None:
             return None
 
-        latest = df.iloc[-1]
-        X = pd.DataFrame([[latest[f] for f in self.features]], columns=self.features)
+        # One artifact for features and importances, even mid-reload
+        artifact = self.artifacts.model()
+        values = [latest[f] for f in artifact.features]
 
-        importances = self.model.feature_importances_
-        contributions = X.iloc[0] * importances
+        # Scored on the inference pool alongside forecasts
+        return {
+            "top_features": self.executor.run(
+                rank_contributions,
+                values,
+                artifact.features,
+                artifact.model.feature_importances_,
+            )
+        }
 
-        explanation = (
-            contributions
-            .abs()
-            .sort_values(ascending=False)
-            .head(5)
-            .reset_index()
-        )
 
-        explanation.columns = ["feature", "impact"]
-        
-        # Normalize impact to percentage (0-100)
-        total_impact = explanation["impact"].sum()
-        if total_impact > 0:
-            explanation["impact"] = (explanation["impact"] / total_impact * 100).round(1)
-        else:
-            explanation["impact"] = 0.0
-
-        # Convert ML feature names to business-friendly names
-        explanation["feature"] = explanation["feature"].map(
-            lambda x: FEATURE_NAMES.get(x, x)
-        )
+def path_contributions(model, X) -> Optional[Tuple[float, np.ndarray]]:
+    """
+    (baseline, rows x features contributions) from the model's decision
+    paths, or None if the model type cannot be decomposed.
+
+    Module-level so it can run in a worker process.
+    """
+    compiled = compiled_predictor(model)
+    if not isinstance(compiled, CompiledTreeEnsemble):
+        return None
+    return compiled.baseline, compiled.contributions(X)
+
+
+def top_contributions(
+    contributions: np.ndarray,
+    features: List[str]
+) -> List[Dict]:
+    """
+    Top features by |contribution| with business-friendly names:
+    ``impact`` is the share (percent) of the listed total, and
+    ``contribution`` the signed effect in forecast units.
+    """
+    order = np.argsort(-np.abs(contributions), kind="stable")[:TOP_FEATURES]
+    total = float(np.abs(contributions[order]).sum())
+
+    return [
+        {
+            "feature": FEATURE_NAMES.get(features[i], features[i]),
+            "impact": round(abs(float(contributions[i])) / total * 100, 1) if total > 0 else 0.0,
+            "contribution": round(float(contributions[i]), 2),
+        }
+        for i in order
+    ]
+
+
+def rank_contributions(values, features, importances):
+    """
+    Fallback for models without path contributions: top-5 features by
+    |value x importance|, as percentages of the top-5 total with
+    business-friendly names.
+
+    Module-level and free of service state so it can run in a
+    worker process.
+    """
+    X = pd.DataFrame([values], columns=features)
+
+    # A missing or infinite value carries no weight
+    contributions = (X.iloc[0] * importances).replace([np.inf, -np.inf], np.nan).fillna(0.0)
+
+    explanation = (
+        contributions
+        .abs()
+        .sort_values(ascending=False)
+        .head(5)
+        .reset_index()
+    )
+
+    explanation.columns = ["feature", "impact"]
+    
+    # Normalize impact to percentage (0-100)
+    total_impact = explanation["impact"].sum()
+    if total_impact > 0:
+        explanation["impact"] = (explanation["impact"] / total_impact * 100).round(1)
+    else:
+        explanation["impact"] = 0.0
+
+    # Convert ML feature names to business-friendly names
+    explanation["feature"] = explanation["feature"].map(
+        lambda x: FEATURE_NAMES.get(x, x)
+    )
+
+    return explanation.to_dict(orient="records")
+
+
+# --------------------------------------------------
+# Process-wide instance
+# --------------------------------------------------
+_explanation_service: Optional[ForecastExplanationService] = None
+_explanation_service_lock = threading.Lock()
+
 
-        return explanation.to_dict(orient="records")
+def get_explanation_service() -> ForecastExplanationService:
+    """Return the process-wide ForecastExplanationService, creating it on first use."""
+    global _explanation_service
+    if _explanation_service is None:
+        with _explanation_service_lock:
+            if _explanation_service is None:
+                _explanation_service = ForecastExplanationService()
+    return _explanation_service
@@ -0,0 +1,91 @@
+"""
+Recursive Horizon Features
+--------------------------
+Rebuilds the model's feature row for weeks beyond the data, so a
+forecast can be rolled forward one week at a time.
+
+Demand-derived features follow the notebook 04 definitions and are
+recomputed from a per-pair sales series (actuals, then forecasts):
+
+- ``lag_<k>_units_sold``        sales k weeks before the row's week
+- ``rolling_<w>wk_avg|mean|std`` trailing w-week window incl. the row's
+                                week (std with ddof=1, like pandas)
+- ``weekly_units_sold``          the row's week
+- ``week_over_week_change``      relative change vs the previous week
+
+Any other feature (price, discount, promotion, ...) has no forecast of
+its own and is carried forward from the latest observed row.
+"""
+
+import re
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+SALES_COLUMN = "weekly_units_sold"
+
+_LAG = re.compile(r"^lag_(\d+)_units_sold$")
+_ROLLING = re.compile(r"^rolling_(\d+)wk_(avg|mean|std)$")
+
+
+class FeatureRoller:
+    """
+    FeatureRoller
+    -------------
+    - ``history_length``: actual weeks of sales needed per pair
+    - ``row(sales, week, static)``: feature matrix for column ``week``
+      of a (pairs, weeks) sales matrix, in model feature order
+    """
+
+    def __init__(self, features: List[str]):
+        self.features = list(features)
+
+        needed = 2
+        for name in self.features:
+            lag = _LAG.match(name)
+            rolling = _ROLLING.match(name)
+            if lag:
+                needed = max(needed, int(lag.group(1)) + 1)
+            elif rolling:
+                needed = max(needed, int(rolling.group(1)))
+        self.history_length = needed
+
+    def static_features(self) -> List[str]:
+        """Features that are carried forward rather than recomputed."""
+        return [f for f in self.features if not self._is_dynamic(f)]
+
+    def row(
+        self,
+        sales: np.ndarray,
+        week: int,
+        static: Dict[str, np.ndarray]
+    ) -> pd.DataFrame:
+        columns = {}
+        for name in self.features:
+            lag = _LAG.match(name)
+            rolling = _ROLLING.match(name)
+            if lag:
+                columns[name] = sales[:, week - int(lag.group(1))]
+            elif rolling:
+                window = sales[:, week - int(rolling.group(1)) + 1:week + 1]
+                if rolling.group(2) == "std":
+                    columns[name] = window.std(axis=1, ddof=1)
+                else:
+                    columns[name] = window.mean(axis=1)
+            elif name == SALES_COLUMN:
+                columns[name] = sales[:, week]
+            elif name == "week_over_week_change":
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    columns[name] = sales[:, week] / sales[:, week - 1] - 1
+            else:
+                columns[name] = static[name]
+        return pd.DataFrame(columns, columns=self.features)
+
+    @staticmethod
+    def _is_dynamic(name: str) -> bool:
+        return bool(
+            _LAG.match(name) or _ROLLING.match(name)
+            or name in (SALES_COLUMN, "week_over_week_change")
+        )
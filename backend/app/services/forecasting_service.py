@@ -1,7 +1,20 @@
+import threading
+import numpy as np
 import pandas as pd
-import joblib
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Iterator, Optional, Dict, List, Tuple
+
+from backend.app.core.artifacts import (
+    MODEL_PATH,
+    ModelArtifact,
+    background_reload_active,
+    get_artifact_registry,
+)
+from backend.app.core.inference import get_inference_executor
+from backend.app.core.metrics import timed
+from backend.app.services.feature_store import _IndexedFeatures, get_feature_store
+from backend.app.services.forecast_horizon import SALES_COLUMN, FeatureRoller
+from backend.app.services.inventory_service import InventoryService
 
 
 # --------------------------------------------------
@@ -14,47 +27,78 @@ class ForecastingService:
     """
     ForecastingService
     ------------------
-    - Loads the selected production demand forecasting model
-    - Loads model metadata (features, metrics)
-    - Loads feature-engineered dataset
+    - Uses the shared production model + metadata (ArtifactRegistry)
+    - Uses the shared feature-engineered dataset (FeatureStore)
     - Produces next-period demand forecast for a given store-product pair
 
     Design principles:
     - Model selection happens offline (notebook)
     - Backend only consumes final artifacts
     - Feature list is metadata-driven (no hardcoding)
+
+    Materialized forecasts:
+    - The latest-week forecast only changes when the data changes, so
+      forecast_units, rolling_std, safety stock and order quantity are
+      computed for every pair in one vectorized pass per data version
+    - Request-time forecasts are dictionary lookups into that table
+    - The table is keyed on (model version, data version); after a
+      hot reload the artifact watcher rebuilds it in the background
+      while requests keep reading the previous table
+    - predict() is submitted to the inference pool, which raises
+      InferenceQueueFull when saturated
+    - Every batch computation pins one feature-store snapshot and one
+      model artifact, so a reload mid-call cannot mix versions
+    - Without the artifact watcher, the model files and the feature
+      data are both checked on access
+
+    Multi-week horizons:
+    - Forecasts are rolled forward recursively: each week's forecast
+      is appended to the sales series and the lag / rolling features
+      of the following week are rebuilt from it (FeatureRoller)
+    - Each step is one predict() over every pair; the portfolio's
+      paths are cached per data version like the forecast table
     """
 
     def __init__(self):
         # --------------------------------------------------
-        # Load production model
+        # Shared production model + metadata (hot-reloadable)
         # --------------------------------------------------
-        self.model = joblib.load(
-            BASE_DIR / "models" / "best_model.joblib"
-        )
+        self.artifacts = get_artifact_registry()
+        self.artifacts.model()
+
+        # predict() runs on the shared, bounded inference pool
+        self.executor = get_inference_executor()
 
         # --------------------------------------------------
-        # Load model metadata
+        # Borrow the shared feature-engineered data
         # --------------------------------------------------
-        metadata = pd.read_csv(
-            BASE_DIR / "models" / "production_model_metadata.csv"
-        ).iloc[0]
-
-        # Parse feature list safely
-        self.features = (
-            metadata["features_used"]
-            .strip("[]")
-            .replace("'", "")
-            .split(", ")
-        )
+        self.store = get_feature_store()
+        self.store.load()
 
         # --------------------------------------------------
-        # Load processed feature-engineered data
+        # Materialize the full-portfolio forecast table
         # --------------------------------------------------
-        self.data = pd.read_csv(
-            BASE_DIR / "data" / "processed" / "feature_engineered_data.csv",
-            parse_dates=["week"],
-        )
+        self._table: Optional[Tuple[Tuple[int, int], Dict, Tuple[float, float]]] = None
+        self._table_lock = threading.Lock()
+        self._materialized()
+
+        self._paths: Optional[Tuple[Tuple[int, int], int, Dict[Tuple[str, str], List[Dict]]]] = None
+        self._paths_lock = threading.Lock()
+
+        # Rebuild derived tables on the watcher thread after a reload
+        self.artifacts.add_listener(self._rebuild_after_reload)
+
+    @property
+    def model(self):
+        return self.artifacts.model().model
+
+    @property
+    def features(self) -> List[str]:
+        return self.artifacts.model().features
+
+    @property
+    def data(self) -> pd.DataFrame:
+        return self.store.data
 
     def forecast(
         self,
@@ -72,39 +116,356 @@ class ForecastingService:
             OR
             None if data not found
         """
+        row = self._materialized().get((store_id, product_id))
 
-        # --------------------------------------------------
-        # Filter data for store-product
-        # --------------------------------------------------
-        df = self.data[
-            (self.data["store_id"] == store_id) &
-            (self.data["product_id"] == product_id)
-        ].sort_values("week")
-
-        if df.empty:
+        if row is None:
             return None
 
-        # --------------------------------------------------
-        # Use latest available record
-        # --------------------------------------------------
-        latest_row = df.iloc[-1]
+        return {
+            "forecast_units": row["forecast_units"],
+            "rolling_std": row["rolling_std"],
+        }
 
-        # --------------------------------------------------
-        # Build input DataFrame (preserve feature names)
-        # --------------------------------------------------
-        X = pd.DataFrame(
-            [[latest_row[f] for f in self.features]],
-            columns=self.features
-        )
+    def recommendation(
+        self,
+        store_id: str,
+        product_id: str
+    ) -> Optional[Dict[str, float]]:
+        """
+        Precomputed ``InventoryService.recommend`` output for the
+        latest forecast of a store-product pair (None if not found).
+        """
+        row = self._materialized().get((store_id, product_id))
+        return dict(row) if row is not None else None
 
-        # --------------------------------------------------
-        # Predict demand
-        # --------------------------------------------------
-        forecast_units = self.model.predict(X)[0]
+    def recommendations(
+        self,
+        pairs: List[Tuple[str, str]]
+    ) -> List[Optional[Dict[str, float]]]:
+        """Batch variant of ``recommendation``, aligned with ``pairs``."""
+        table = self._materialized()
+        return [
+            dict(row) if row is not None else None
+            for row in map(table.get, pairs)
+        ]
 
-        return {
-            "forecast_units": round(float(forecast_units), 2),
-            "rolling_std": round(
-                float(latest_row.get("rolling_4wk_std", 0.0)), 2
-            ),
+    def recommendation_chunks(
+        self,
+        pairs: List[Tuple[str, str]],
+        chunk_size: int
+    ) -> Tuple[Iterator[List[Optional[Dict[str, float]]]], Tuple[float, float]]:
+        """
+        ``recommendations`` for ``pairs`` in chunks of ``chunk_size``,
+        each found record carrying ``risk_level`` from the portfolio
+        thresholds, plus those thresholds (p33, p66).
+
+        The table and thresholds are pinned together when this is
+        called (so load errors surface before any output), and every
+        chunk reads that same version even if the data reloads
+        mid-stream. May rebuild the table: call it off the event loop.
+        """
+        _, table, (p33, p66) = self._current()
+
+        def chunks():
+            for start in range(0, len(pairs), chunk_size):
+                chunk = []
+                for row in map(table.get, pairs[start:start + chunk_size]):
+                    if row is not None:
+                        row = dict(row)
+                        row["risk_level"] = InventoryService.classify_risk(
+                            row["rolling_std"], p33, p66
+                        )
+                    chunk.append(row)
+                yield chunk
+
+        return chunks(), (p33, p66)
+
+    def horizon_forecasts(
+        self,
+        pairs: List[Tuple[str, str]],
+        horizon: int
+    ) -> List[Optional[List[Dict]]]:
+        """
+        Weekly forecasts 1..``horizon`` weeks ahead for each pair,
+        aligned with ``pairs`` (None where data is not found).
+
+        Served from portfolio-wide paths computed once per data
+        version (and recomputed only for a longer horizon).
+        """
+        table = self._path_table(horizon)
+        return [
+            path[:horizon] if path is not None else None
+            for path in map(table.get, pairs)
+        ]
+
+    @timed("forecasting.forecast_paths")
+    def forecast_paths(
+        self,
+        pairs: List[Tuple[str, str]],
+        horizon: int,
+        artifact: Optional[ModelArtifact] = None,
+        snapshot: Optional[_IndexedFeatures] = None
+    ) -> List[Optional[List[Dict]]]:
+        """
+        Recursive multi-week forecasts for many pairs at once.
+
+        Step 1 is the latest-week forecast (same as ``forecast_many``).
+        Every later step rebuilds the feature rows from the sales series
+        extended with the previous forecasts and runs a single
+        ``predict`` for all pairs.
+        """
+        results: List[Optional[List[Dict]]] = [None] * len(pairs)
+        if not pairs:
+            return results
+
+        artifact = artifact or self.artifacts.model()
+        snapshot = snapshot or self.store.snapshot()
+        roller = FeatureRoller(artifact.features)
+
+        positions = snapshot.latest_positions(pairs)
+        found = _scorable(pairs, positions, snapshot, artifact.features)
+        if found.size == 0:
+            return results
+
+        rows = snapshot.data.iloc[positions[found]]
+        found_pairs = [pairs[i] for i in found.tolist()]
+
+        # Sales matrix: actual history, then one column per forecast week
+        history = roller.history_length
+        sales = np.empty((found.size, history + horizon))
+        sales[:, :history] = snapshot.trailing_values(
+            found_pairs, SALES_COLUMN, history
+        )
+        static = {
+            name: rows[name].to_numpy()
+            for name in roller.static_features()
         }
+
+        X = rows[artifact.features].reset_index(drop=True)
+        for step in range(horizon):
+            if step:
+                # Feature row of the week just forecast
+                X = roller.row(sales, history + step - 1, static)
+            sales[:, history + step] = self.executor.predict(
+                artifact.model, X, MODEL_PATH, artifact.fingerprint
+            )
+
+        latest_weeks = pd.to_datetime(rows["week"]).tolist()
+        forecasts = sales[:, history:].tolist()
+        for i, latest_week, path in zip(found.tolist(), latest_weeks, forecasts):
+            results[i] = [
+                {
+                    "week_ahead": step,
+                    "week": (latest_week + pd.Timedelta(weeks=step)).strftime("%Y-%m-%d"),
+                    "forecast_units": round(units, 2),
+                }
+                for step, units in enumerate(path, start=1)
+            ]
+
+        return results
+
+    def portfolio_risk_thresholds(self) -> Tuple[float, float]:
+        """
+        Relative-risk cut points (p33, p66) over every pair's latest
+        volatility. Lets a streamed batch classify each item on its own
+        instead of waiting for the whole batch.
+        """
+        return self._current()[2]
+
+    @timed("forecasting.forecast_many")
+    def forecast_many(
+        self,
+        pairs: List[Tuple[str, str]],
+        artifact: Optional[ModelArtifact] = None,
+        snapshot: Optional[_IndexedFeatures] = None
+    ) -> List[Optional[Dict[str, float]]]:
+        """
+        Compute latest-week forecasts for many pairs at once.
+
+        Gathers the latest feature vector of every requested pair into
+        one matrix and runs a single ``predict`` call. Results are
+        aligned with ``pairs`` (None where data is not found).
+        """
+        results: List[Optional[Dict[str, float]]] = [None] * len(pairs)
+        if not pairs:
+            return results
+
+        artifact = artifact or self.artifacts.model()
+        snapshot = snapshot or self.store.snapshot()
+        positions = snapshot.latest_positions(pairs)
+        found = _scorable(pairs, positions, snapshot, artifact.features)
+        if found.size == 0:
+            return results
+
+        rows = snapshot.data.iloc[positions[found]]
+        X = rows[artifact.features].reset_index(drop=True)
+        forecast_units = self.executor.predict(
+            artifact.model, X, MODEL_PATH, artifact.fingerprint
+        )
+
+        if "rolling_4wk_std" in rows.columns:
+            rolling_std = rows["rolling_4wk_std"].to_numpy(dtype=float)
+        else:
+            rolling_std = np.zeros(found.size)
+
+        for i, units, std in zip(
+            found.tolist(), forecast_units.tolist(), rolling_std.tolist()
+        ):
+            results[i] = {
+                "forecast_units": round(units, 2),
+                "rolling_std": round(std, 2),
+            }
+
+        return results
+
+    # --------------------------------------------------
+    # Helpers
+    # --------------------------------------------------
+    def _materialized(self) -> Dict[Tuple[str, str], Dict]:
+        """
+        Forecast table for the current data version.
+        Rebuilt only when the feature store reports new data.
+        """
+        return self._current()[1]
+
+    def _current(self) -> Tuple[Tuple[int, int], Dict[Tuple[str, str], Dict], Tuple[float, float]]:
+        """((model version, data version), forecast table, risk thresholds)."""
+        table = self._table
+        if table is not None and background_reload_active():
+            # The artifact watcher swaps in the rebuilt table
+            return table
+        return self._rebuild()
+
+    def _rebuild(self) -> Tuple[Tuple[int, int], Dict[Tuple[str, str], Dict], Tuple[float, float]]:
+        artifact, snapshot = self._pinned()
+        version = (artifact.version, snapshot.version)
+
+        table = self._table
+        if table is None or table[0] != version:
+            with self._table_lock:
+                table = self._table
+                if table is None or table[0] != version:
+                    rows = self._build_table(artifact, snapshot)
+                    table = (
+                        version,
+                        rows,
+                        InventoryService.risk_thresholds(
+                            [row["rolling_std"] for row in rows.values()]
+                        ) if rows else (0.0, 0.0),
+                    )
+                    self._table = table
+
+        return table
+
+    def _pinned(self) -> Tuple[ModelArtifact, _IndexedFeatures]:
+        """
+        Current model and feature snapshot, checking both for changes
+        first unless the artifact watcher owns reloads.
+        """
+        self.artifacts.refresh_model()
+        self.store.refresh()
+        return self.artifacts.model(), self.store.snapshot()
+
+    def _rebuild_after_reload(self) -> None:
+        """Artifact listener: rebuild the table (and cached paths)."""
+        self._rebuild()
+        paths = self._paths
+        if paths is not None:
+            self._path_table(paths[1])
+
+    def _path_table(self, horizon: int) -> Dict[Tuple[str, str], List[Dict]]:
+        """Portfolio forecast paths covering at least ``horizon`` weeks."""
+        artifact, snapshot = self._pinned()
+        version = (artifact.version, snapshot.version)
+
+        paths = self._paths
+        if paths is None or paths[0] != version or paths[1] < horizon:
+            with self._paths_lock:
+                paths = self._paths
+                if paths is None or paths[0] != version or paths[1] < horizon:
+                    pairs = snapshot.pairs()
+                    paths = (
+                        version,
+                        horizon,
+                        dict(zip(
+                            pairs,
+                            self.forecast_paths(pairs, horizon, artifact, snapshot)
+                        )),
+                    )
+                    self._paths = paths
+
+        return paths[2]
+
+    @timed("forecasting.table_build")
+    def _build_table(
+        self,
+        artifact: ModelArtifact,
+        snapshot: _IndexedFeatures
+    ) -> Dict[Tuple[str, str], Dict]:
+        all_pairs = snapshot.pairs()
+        scored = [
+            (pair, forecast)
+            for pair, forecast in zip(
+                all_pairs, self.forecast_many(all_pairs, artifact, snapshot)
+            )
+            if forecast is not None
+        ]
+        pairs = [pair for pair, _ in scored]
+        forecasts = [forecast for _, forecast in scored]
+
+        recs = InventoryService.recommend_many(
+            np.array([f["forecast_units"] for f in forecasts]),
+            np.array([f["rolling_std"] for f in forecasts]),
+        )
+
+        return dict(zip(pairs, recs))
+
+
+# --------------------------------------------------
+# Row screening
+# --------------------------------------------------
+def _scorable(
+    pairs: List[Tuple[str, str]],
+    positions: np.ndarray,
+    snapshot: _IndexedFeatures,
+    features: List[str]
+) -> np.ndarray:
+    """
+    Indices into ``pairs`` whose latest feature row exists and is finite.
+
+    A NaN or infinite feature fails the whole predict() call, so those
+    pairs are left out (and reported as not found) instead of taking
+    every other pair in the batch down with them.
+    """
+    found = np.flatnonzero(positions >= 0)
+    if found.size == 0:
+        return found
+
+    values = snapshot.data.iloc[positions[found]][features].to_numpy(dtype=float)
+    finite = np.isfinite(values).all(axis=1)
+    if not finite.all():
+        skipped = [pairs[i] for i in found[~finite].tolist()]
+        shown = ", ".join(f"{s}/{p}" for s, p in skipped[:10])
+        more = f" (+{len(skipped) - 10} more)" if len(skipped) > 10 else ""
+        print(
+            f"WARNING: Skipping {len(skipped)} pair(s) with non-finite "
+            f"features: {shown}{more}"
+        )
+    return found[finite]
+
+
+# --------------------------------------------------
+# Process-wide instance
+# --------------------------------------------------
+_forecasting_service: Optional[ForecastingService] = None
+_forecasting_service_lock = threading.Lock()
+
+
+def get_forecasting_service() -> ForecastingService:
+    """Return the process-wide ForecastingService, creating it on first use."""
+    global _forecasting_service
+    if _forecasting_service is None:
+        with _forecasting_service_lock:
+            if _forecasting_service is None:
+                _forecasting_service = ForecastingService()
+    return _forecasting_service
@@ -1,5 +1,5 @@
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from backend.app.core.config import Z_SCORE
 
 
@@ -43,6 +43,61 @@ class InventoryService:
             "rolling_std": float(volatility),
         }
 
+    @staticmethod
+    def recommend_many(
+        forecast_units: np.ndarray,
+        volatility: np.ndarray
+    ) -> List[Dict[str, float]]:
+        """
+        Vectorized ``recommend`` over aligned arrays.
+        Produces exactly the same records as calling ``recommend``
+        element by element.
+        """
+        forecast_units = np.asarray(forecast_units, dtype=float)
+        volatility = np.asarray(volatility, dtype=float)
+
+        safety_stock = volatility * Z_SCORE
+        # np.rint rounds half to even, like Python's round()
+        recommended_qty = np.maximum(
+            0, np.rint(forecast_units + safety_stock)
+        ).astype(np.int64)
+
+        # Two-decimal rounding stays on Python floats so values match
+        # round() exactly (np.round can differ in the last digit)
+        return [
+            {
+                "forecast_units": round(units, 2),
+                "safety_stock": round(stock, 2),
+                "recommended_order_qty": qty,
+                "rolling_std": vol,
+            }
+            for units, stock, qty, vol in zip(
+                forecast_units.tolist(),
+                safety_stock.tolist(),
+                recommended_qty.tolist(),
+                volatility.tolist(),
+            )
+        ]
+
+    @staticmethod
+    def risk_thresholds(volatilities) -> Tuple[float, float]:
+        """
+        33rd / 66th percentile of volatility: the Low / Medium / High
+        cut points used by ``apply_relative_risk``.
+        """
+        return (
+            float(np.percentile(volatilities, 33)),
+            float(np.percentile(volatilities, 66)),
+        )
+
+    @staticmethod
+    def classify_risk(volatility: float, p33: float, p66: float) -> str:
+        if volatility <= p33:
+            return "Low"
+        elif volatility <= p66:
+            return "Medium"
+        return "High"
+
     @staticmethod
     def apply_relative_risk(
         recommendations: List[Dict[str, float]]
@@ -62,17 +117,11 @@ class InventoryService:
             item["rolling_std"] for item in recommendations
         ]
 
-        p33 = np.percentile(volatilities, 33)
-        p66 = np.percentile(volatilities, 66)
+        p33, p66 = InventoryService.risk_thresholds(volatilities)
 
         for item in recommendations:
-            vol = item["rolling_std"]
-
-            if vol <= p33:
-                item["risk_level"] = "Low"
-            elif vol <= p66:
-                item["risk_level"] = "Medium"
-            else:
-                item["risk_level"] = "High"
+            item["risk_level"] = InventoryService.classify_risk(
+                item["rolling_std"], p33, p66
+            )
 
         return recommendations
@@ -5,15 +5,23 @@ Provides market-level insights from precomputed CSVs.
 Designed for business-friendly consumption — no ML jargon.
 
 This service:
-- Reads from precomputed market summary data
+- Reads from precomputed market summary data (snapshot or CSV)
 - Transforms technical metrics into plain-English insights
 - Does NOT recompute forecasts or modify existing data
 """
 
+import threading
+import numpy as np
 import pandas as pd
+from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from backend.app.core.config import DATA_DIR
+from backend.app.core.artifacts import get_artifact_registry
+from backend.app.core.datasets import dataset_signature, load_dataset
+from backend.app.core.metrics import timed
+
 
 # --------------------------------------------------
 # Project base directory
@@ -23,8 +31,8 @@ BASE_DIR = Path(__file__).resolve().parents[3]
 # --------------------------------------------------
 # Precomputed data paths
 # --------------------------------------------------
-MARKET_SUMMARY_PATH = BASE_DIR / "data" / "processed" / "market_summary.csv"
-MARKET_COMPARISON_PATH = BASE_DIR / "data" / "processed" / "market_comparison.csv"
+MARKET_SUMMARY_PATH = DATA_DIR / "market_summary.csv"
+MARKET_COMPARISON_PATH = DATA_DIR / "market_comparison.csv"
 
 
 class MarketIntelligenceService:
@@ -44,17 +52,45 @@ class MarketIntelligenceService:
         """Load precomputed market data on initialization."""
         self._load_data()
 
+    @timed("market_intelligence.load_data")
     def _load_data(self):
         """Load market summary and comparison data."""
+        signature = self._signature()
+
         try:
-            self.market_summary = pd.read_csv(MARKET_SUMMARY_PATH)
+            market_summary = load_dataset(MARKET_SUMMARY_PATH)
         except FileNotFoundError:
-            self.market_summary = pd.DataFrame()
+            market_summary = pd.DataFrame()
 
         try:
-            self.market_comparison = pd.read_csv(MARKET_COMPARISON_PATH)
+            market_comparison = load_dataset(MARKET_COMPARISON_PATH)
         except FileNotFoundError:
-            self.market_comparison = pd.DataFrame()
+            market_comparison = pd.DataFrame()
+
+        self.market_summary = market_summary
+        self.market_comparison = market_comparison
+        self.signature = signature
+        self.loaded_at = datetime.now()
+
+    def poll(self) -> bool:
+        """Reload (artifact watcher) when either market file changed."""
+        if self._signature() == self.signature:
+            return False
+        self._load_data()
+        return True
+
+    def info(self) -> Dict:
+        return {
+            "markets": len(self.market_summary),
+            "loaded_at": self.loaded_at.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    @staticmethod
+    def _signature():
+        return (
+            dataset_signature(MARKET_SUMMARY_PATH),
+            dataset_signature(MARKET_COMPARISON_PATH),
+        )
 
     def get_markets(self) -> List[str]:
         """
@@ -67,6 +103,7 @@ class MarketIntelligenceService:
             return []
         return self.market_summary["market"].tolist()
 
+    @timed("market_intelligence.market_summary")
     def get_market_summary(self, market: Optional[str] = None) -> List[Dict]:
         """
         Get business-friendly market summary.
@@ -84,7 +121,7 @@ class MarketIntelligenceService:
         if self.market_summary.empty:
             return []
 
-        df = self.market_summary.copy()
+        df = self.market_summary
 
         # Filter by market if specified
         if market and market != "all":
@@ -92,9 +129,7 @@ class MarketIntelligenceService:
             if df.empty:
                 return []
 
-        results = []
-        for _, row in df.iterrows():
-            results.append(self._transform_to_business_insight(row))
+        results = self._transform_to_business_insights(df)
 
         # Sort by attention level (High first)
         priority_order = {"High": 0, "Medium": 1, "Low": 2}
@@ -102,50 +137,59 @@ class MarketIntelligenceService:
 
         return results
 
-    def _transform_to_business_insight(self, row: pd.Series) -> Dict:
+    def _transform_to_business_insights(self, df: pd.DataFrame) -> List[Dict]:
         """
-        Transform raw market data into business-friendly insight.
+        Transform raw market data into business-friendly insights,
+        column by column.
         
         Uses Market Pressure Index (MPI) for relative prioritization:
-        - MPI >= 0.95: High attention needed
-        - MPI >= 0.90: Medium attention needed
-        - MPI < 0.90: Low attention needed
+        - MPI >= 0.98: High attention needed
+        - MPI >= 0.93: Medium attention needed
+        - MPI < 0.93: Low attention needed
         
         Note: MPI is a composite of normalized demand and volatility.
         Higher MPI = more demand pressure relative to other markets.
         """
-        market_name = row["market"]
-        mpi = row.get("market_pressure_index", 0.5)
-        avg_demand = row.get("avg_weekly_demand", 0)
-        volatility = row.get("demand_volatility", 0)
-        strategy = row.get("inventory_strategy", "")
+        def column(name, default):
+            if name in df.columns:
+                return df[name].to_numpy()
+            return np.full(len(df), default, dtype=object)
+
+        market_names = df["market"].tolist()
+        mpi = column("market_pressure_index", 0.5)
+        avg_demand = column("avg_weekly_demand", 0)
+        volatility = column("demand_volatility", 0)
+        strategies = column("inventory_strategy", "").tolist()
 
         # Determine attention level based on MPI
-        if mpi >= 0.98:
-            attention_level = "High"
-            explanation = f"{market_name} is showing the highest relative demand pressure. Prioritize inventory replenishment to prevent stockouts."
-        elif mpi >= 0.93:
-            attention_level = "Medium"
-            explanation = f"{market_name} has moderate demand pressure. Monitor closely and adjust orders if trends continue."
-        else:
-            attention_level = "Low"
-            explanation = f"{market_name} is operating within normal parameters. Standard inventory planning is sufficient."
+        attention_levels = np.select(
+            [mpi >= 0.98, mpi >= 0.93], ["High", "Medium"], default="Low"
+        ).tolist()
+        explanations = {
+            "High": "{} is showing the highest relative demand pressure. Prioritize inventory replenishment to prevent stockouts.",
+            "Medium": "{} has moderate demand pressure. Monitor closely and adjust orders if trends continue.",
+            "Low": "{} is operating within normal parameters. Standard inventory planning is sufficient.",
+        }
 
         # Add demand context
-        if volatility > 100:
-            demand_trend = "Variable demand patterns detected"
-        elif avg_demand > 950:
-            demand_trend = "Strong consistent demand"
-        else:
-            demand_trend = "Stable demand levels"
-
-        return {
-            "market": market_name,
-            "attention_level": attention_level,
-            "explanation": explanation,
-            "demand_trend": demand_trend,
-            "strategy_recommendation": self._simplify_strategy(strategy)
-        }
+        demand_trends = np.select(
+            [volatility > 100, avg_demand > 950],
+            ["Variable demand patterns detected", "Strong consistent demand"],
+            default="Stable demand levels"
+        ).tolist()
+
+        return [
+            {
+                "market": market_name,
+                "attention_level": attention_level,
+                "explanation": explanations[attention_level].format(market_name),
+                "demand_trend": demand_trend,
+                "strategy_recommendation": self._simplify_strategy(strategy)
+            }
+            for market_name, attention_level, demand_trend, strategy in zip(
+                market_names, attention_levels, demand_trends, strategies
+            )
+        ]
 
     def _simplify_strategy(self, strategy: str) -> str:
         """
@@ -165,6 +209,24 @@ class MarketIntelligenceService:
 
 
 # --------------------------------------------------
-# Singleton instance for import
+# Process-wide instance
 # --------------------------------------------------
-market_intelligence_service = MarketIntelligenceService()
+_market_intelligence_service: Optional[MarketIntelligenceService] = None
+_market_intelligence_service_lock = threading.Lock()
+
+
+def get_market_intelligence_service() -> MarketIntelligenceService:
+    """Return the process-wide MarketIntelligenceService, creating it on first use."""
+    global _market_intelligence_service
+    if _market_intelligence_service is None:
+        with _market_intelligence_service_lock:
+            if _market_intelligence_service is None:
+                service = MarketIntelligenceService()
+                get_artifact_registry().register(
+                    "market_intelligence",
+                    service.poll,
+                    service.info,
+                    lambda: service.signature,
+                )
+                _market_intelligence_service = service
+    return _market_intelligence_service
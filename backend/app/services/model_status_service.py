@@ -2,6 +2,12 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+from backend.app.core.artifacts import (
+    METADATA_PATH,
+    get_artifact_registry,
+    parse_feature_list,
+)
+
 
 class ModelStatusService:
     """
@@ -13,6 +19,7 @@ class ModelStatusService:
     Responsibilities:
     - Load model metadata generated by offline notebooks
     - Expose model performance & configuration
+    - Report the serving artifact version and when it was loaded
     - Support UI & BI dashboards
     """
 
@@ -25,11 +32,9 @@ class ModelStatusService:
         # --------------------------------------------------
         # Metadata file produced by model comparison notebook
         # --------------------------------------------------
-        self.metadata_path = (
-            self.base_dir
-            / "models"
-            / "production_model_metadata.csv"
-        )
+        self.metadata_path = METADATA_PATH
+
+        self.artifacts = get_artifact_registry()
 
     def get_status(self) -> dict:
         """
@@ -45,9 +50,17 @@ class ModelStatusService:
                 "message": "Production model metadata not available."
             }
 
-        metadata = pd.read_csv(self.metadata_path).iloc[0]
+        # Metadata of the model actually serving requests; the CSV
+        # is the fallback when the model itself cannot be loaded
+        try:
+            artifact = self.artifacts.model()
+            metadata = artifact.metadata
+        except Exception as e:
+            print(f"WARNING: Model artifact not available: {str(e)}")
+            artifact = None
+            metadata = pd.read_csv(self.metadata_path).iloc[0]
 
-        return {
+        status = {
             "status": "active",
             "active_model": metadata["selected_model"],
             "selection_metric": metadata["selection_metric"],
@@ -60,6 +73,16 @@ class ModelStatusService:
             "last_updated": self._last_updated(),
         }
 
+        if artifact is not None:
+            status.update({
+                "model_version": artifact.version,
+                "model_fingerprint": artifact.fingerprint,
+                "loaded_at": artifact.loaded_at.strftime("%Y-%m-%d %H:%M:%S"),
+            })
+        status["artifacts"] = self.artifacts.status()
+
+        return status
+
     # --------------------------------------------------
     # Helpers
     # --------------------------------------------------
@@ -67,12 +90,7 @@ class ModelStatusService:
         """
         Converts feature list stored as string into Python list.
         """
-        return (
-            features_raw
-            .strip("[]")
-            .replace("'", "")
-            .split(", ")
-        )
+        return parse_feature_list(features_raw)
 
     def _last_updated(self) -> str:
         """
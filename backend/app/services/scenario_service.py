@@ -1,3 +1,16 @@
+import numpy as np
+from typing import Dict, Iterator, List, Tuple
+
+from backend.app.core.config import Z_SCORE
+from backend.app.services.feature_store import get_feature_store
+
+# Price column of the feature data used for order cost
+PRICE_COLUMN = "avg_price"
+
+# Sweep measures priced with avg_price (NaN for unpriced pairs)
+COST_MEASURES = ("order_cost", "cost_delta")
+
+
 class ScenarioService:
     """Service for simulating forecast scenarios with demand multipliers."""
     
@@ -22,3 +35,131 @@ class ScenarioService:
             "difference": adjusted_forecast - base_forecast,
             "percent_change": ((adjusted_forecast - base_forecast) / base_forecast * 100) if base_forecast else 0
         }
+
+    @staticmethod
+    def sweep(
+        forecast_units: np.ndarray,
+        volatility: np.ndarray,
+        avg_price: np.ndarray,
+        multipliers: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Every (pair, multiplier) scenario as (pairs x multipliers) arrays.
+
+        Scaling demand by ``m`` scales its spread too, so forecast and
+        safety stock both scale by ``m``; the order quantity follows
+        ``InventoryService.recommend``. Deltas are against the
+        unscaled recommendation, costs are ``units x avg_price``
+        (NaN where the pair has no price).
+        """
+        forecast_units = np.asarray(forecast_units, dtype=float)[:, None]
+        safety_base = np.asarray(volatility, dtype=float)[:, None] * Z_SCORE
+        price = np.asarray(avg_price, dtype=float)[:, None]
+        m = np.asarray(multipliers, dtype=float)[None, :]
+
+        adjusted = forecast_units * m
+        safety_stock = safety_base * m
+        order_qty = np.maximum(0, np.rint(adjusted + safety_stock)).astype(np.int64)
+        base_qty = np.maximum(0, np.rint(forecast_units + safety_base)).astype(np.int64)
+        qty_delta = order_qty - base_qty
+
+        return {
+            "forecast_units": adjusted,
+            "safety_stock": safety_stock,
+            "recommended_order_qty": order_qty,
+            "order_qty_delta": qty_delta,
+            "order_cost": order_qty * price,
+            "cost_delta": qty_delta * price,
+        }
+
+
+class ScenarioSweep:
+    """
+    ScenarioSweep
+    -------------
+    - Pins the base forecast, volatility and price vectors of ``pairs``
+      (pairs without a forecast are dropped)
+    - ``chunks(size)``: per-pair scenario matrices, ``size`` pairs at a time
+    - ``surface()``: portfolio totals per multiplier
+
+    Memory is bounded by one chunk, whatever the portfolio size.
+    """
+
+    def __init__(
+        self,
+        forecast_service,
+        pairs: List[Tuple[str, str]],
+        multipliers: List[float]
+    ):
+        recs = forecast_service.recommendations(pairs)
+        found = [i for i, rec in enumerate(recs) if rec is not None]
+
+        self.pairs = [pairs[i] for i in found]
+        self.multipliers = np.asarray(multipliers, dtype=float)
+        self.forecast_units = np.array(
+            [recs[i]["forecast_units"] for i in found], dtype=float
+        )
+        self.volatility = np.array(
+            [recs[i]["rolling_std"] for i in found], dtype=float
+        )
+        self.avg_price = self._prices(self.pairs)
+
+    def chunks(
+        self,
+        size: int
+    ) -> Iterator[Tuple[List[Tuple[str, str]], np.ndarray, Dict[str, np.ndarray]]]:
+        """(pairs, avg_price, sweep matrices) per chunk of ``size`` pairs."""
+        for start in range(0, len(self.pairs), size):
+            stop = start + size
+            yield (
+                self.pairs[start:stop],
+                self.avg_price[start:stop],
+                ScenarioService.sweep(
+                    self.forecast_units[start:stop],
+                    self.volatility[start:stop],
+                    self.avg_price[start:stop],
+                    self.multipliers,
+                ),
+            )
+
+    def surface(self, chunk_size: int = 5000) -> List[Dict]:
+        """Totals over all pairs for each multiplier (costs skip unpriced pairs)."""
+        totals: Dict[str, np.ndarray] = {}
+        for _, _, matrices in self.chunks(chunk_size):
+            self.add_totals(totals, matrices)
+        return self.surface_rows(totals)
+
+    @staticmethod
+    def add_totals(totals: Dict[str, np.ndarray], matrices: Dict[str, np.ndarray]) -> None:
+        """Accumulate one chunk's per-multiplier column sums into ``totals``."""
+        for name, matrix in matrices.items():
+            column_sums = np.nansum(matrix, axis=0)
+            totals[name] = totals[name] + column_sums if name in totals else column_sums
+
+    def surface_rows(self, totals: Dict[str, np.ndarray]) -> List[Dict]:
+        if not totals:
+            return []
+        return [
+            {
+                "demand_multiplier": round(float(m), 6),
+                **{
+                    name: int(values[k]) if values.dtype.kind == "i"
+                    else round(float(values[k]), 2)
+                    for name, values in totals.items()
+                },
+            }
+            for k, m in enumerate(self.multipliers)
+        ]
+
+    @property
+    def priced_pairs(self) -> int:
+        return int(np.isfinite(self.avg_price).sum())
+
+    @staticmethod
+    def _prices(pairs: List[Tuple[str, str]]) -> np.ndarray:
+        snapshot = get_feature_store().snapshot()
+        if PRICE_COLUMN not in snapshot.data.columns:
+            return np.full(len(pairs), np.nan)
+        positions = snapshot.latest_positions(pairs)
+        prices = snapshot.data[PRICE_COLUMN].to_numpy(dtype=float)[np.maximum(positions, 0)]
+        return np.where(positions >= 0, prices, np.nan)
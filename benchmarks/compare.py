@@ -0,0 +1,83 @@
+"""
+Compare two benchmark result files.
+
+Prints, per endpoint, the baseline and candidate p50 / p95 latency and
+sequential throughput with the relative change, and flags endpoints
+whose p50 regressed by more than ``--threshold`` percent. Exits with
+status 1 when any endpoint regressed, so it can gate CI.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json [--threshold 10]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+
+def change_pct(old: float, new: float) -> Optional[float]:
+    if not old:
+        return None
+    return (new - old) / old * 100
+
+
+def format_change(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value:+.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="p50 regression (percent) that fails the run")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+
+    if baseline.get("dataset") != candidate.get("dataset"):
+        print("WARNING: results were produced on different datasets")
+
+    print(f"{'endpoint':<24} {'p50 ms':>18} {'change':>8} {'p95 ms':>18} "
+          f"{'change':>8} {'rps':>18} {'change':>8}")
+
+    regressions = []
+    for name in sorted(set(baseline["endpoints"]) | set(candidate["endpoints"])):
+        old = baseline["endpoints"].get(name)
+        new = candidate["endpoints"].get(name)
+        if old is None or new is None:
+            print(f"{name:<24} only in {'candidate' if old is None else 'baseline'}")
+            continue
+
+        p50 = change_pct(old["latency_ms"]["p50"], new["latency_ms"]["p50"])
+        p95 = change_pct(old["latency_ms"]["p95"], new["latency_ms"]["p95"])
+        rps = change_pct(old["throughput_rps"], new["throughput_rps"])
+
+        flag = ""
+        if p50 is not None and p50 > args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        if old["status_counts"] != new["status_counts"]:
+            flag += f"  status {old['status_counts']} -> {new['status_counts']}"
+
+        print(
+            f"{name:<24} "
+            f"{old['latency_ms']['p50']:>8.2f} -> {new['latency_ms']['p50']:>6.2f} "
+            f"{format_change(p50):>8} "
+            f"{old['latency_ms']['p95']:>8.2f} -> {new['latency_ms']['p95']:>6.2f} "
+            f"{format_change(p95):>8} "
+            f"{old['throughput_rps']:>8.1f} -> {new['throughput_rps']:>6.1f} "
+            f"{format_change(rps):>8}{flag}"
+        )
+
+    if regressions:
+        print(f"\n{len(regressions)} endpoint(s) regressed beyond "
+              f"{args.threshold:g}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+Synthetic dataset generator
+---------------------------
+Writes the processed files the API reads, with exactly the schemas the
+notebooks produce, at any number of store/product pairs:
+
+- weekly_time_series.csv       (notebook 03)
+- feature_engineered_data.csv  (notebook 04: lags, rolling stats, first
+                                7 weeks of each pair dropped)
+- inventory_recommendations.csv (notebook 07, latest week per pair,
+                                forecast from the production model)
+- market_weekly_demand.csv, market_summary.csv, market_comparison.csv
+                               (notebook 05)
+
+Pairs are generated in chunks so 100k pairs x 106 weeks stays within a
+few hundred MB of memory. Output is deterministic for a given seed.
+
+Usage:
+    python benchmarks/generate_data.py --pairs 10000 --out benchmarks/.data/10k
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import joblib
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+
+FIRST_WEEK = "2021-12-27"
+DEFAULT_WEEKS = 106
+PRODUCTS_PER_STORE = 20
+CHUNK_PAIRS = 10000
+
+# Rows before this week index lack lag_4 / rolling_8wk and are dropped
+FEATURE_WARMUP_WEEKS = 7
+
+# Notebook 05 store -> market assignment, repeated across stores
+MARKET_CYCLE = ["APAC", "APAC", "North America", "Europe", "Europe"]
+
+WEEKLY_COLUMNS = [
+    "store_id", "product_id", "week", "weekly_units_sold",
+    "weekly_units_ordered", "avg_inventory_level", "avg_price",
+    "avg_discount", "holiday_promotion",
+]
+FEATURE_COLUMNS = WEEKLY_COLUMNS + [
+    "lag_1_units_sold", "lag_2_units_sold", "lag_4_units_sold",
+    "rolling_4wk_avg", "rolling_8wk_avg", "rolling_4wk_std",
+    "week_over_week_change",
+]
+RECOMMENDATION_COLUMNS = [
+    "store_id", "product_id", "forecast_units", "safety_stock",
+    "recommended_order_qty", "demand_risk",
+]
+
+
+def pair_ids(n_pairs: int, products_per_store: int = PRODUCTS_PER_STORE):
+    """Store-major, sorted store and product IDs like S001 / P0001."""
+    n_stores = -(-n_pairs // products_per_store)
+    store_width = max(3, len(str(n_stores)))
+    product_width = max(4, len(str(products_per_store)))
+
+    index = np.arange(n_pairs)
+    stores = np.array(
+        [f"S{i + 1:0{store_width}d}" for i in range(n_stores)], dtype=object
+    )
+    products = np.array(
+        [f"P{i + 1:0{product_width}d}" for i in range(products_per_store)],
+        dtype=object,
+    )
+    store_index = index // products_per_store
+    return stores[store_index], products[index % products_per_store], store_index
+
+
+def _rolling(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """Trailing rolling statistic along weeks (NaN until the window fills)."""
+    out = np.full(values.shape, np.nan)
+    windows = sliding_window_view(values, window, axis=1)
+    out[:, window - 1:] = reducer(windows)
+    return out
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    out[:, periods:] = values[:, :-periods]
+    return out
+
+
+def weekly_chunk(rng: np.random.Generator, n_pairs: int, n_weeks: int) -> Dict:
+    """Raw weekly columns for ``n_pairs`` pairs as (pairs, weeks) arrays."""
+    t = np.arange(n_weeks)
+    level = rng.uniform(600, 1300, (n_pairs, 1))
+    phase = rng.uniform(0, 2 * np.pi, (n_pairs, 1))
+    season = 1 + 0.15 * np.sin(2 * np.pi * t / 52 + phase)
+
+    promotion = (rng.random((n_pairs, n_weeks)) < 0.35).astype(np.int64)
+    noise = rng.normal(0, 0.2, (n_pairs, n_weeks))
+    sold = np.maximum(
+        1, np.rint(level * season * (1 + 0.1 * promotion + noise))
+    ).astype(np.int64)
+
+    ordered = np.maximum(
+        0, np.rint(sold * rng.uniform(0.75, 1.25, sold.shape))
+    ).astype(np.int64)
+
+    price = rng.uniform(10, 100, (n_pairs, 1)) * rng.uniform(0.8, 1.2, sold.shape)
+
+    return {
+        "weekly_units_sold": sold,
+        "weekly_units_ordered": ordered,
+        "avg_inventory_level": rng.uniform(120, 320, sold.shape),
+        "avg_price": price,
+        "avg_discount": rng.uniform(0, 20, sold.shape),
+        "holiday_promotion": promotion,
+    }
+
+
+def feature_columns(sold: np.ndarray) -> Dict[str, np.ndarray]:
+    """Notebook 04 features, computed per pair along the week axis."""
+    sold = sold.astype(float)
+    previous = _shift(sold, 1)
+    return {
+        "lag_1_units_sold": previous,
+        "lag_2_units_sold": _shift(sold, 2),
+        "lag_4_units_sold": _shift(sold, 4),
+        "rolling_4wk_avg": _rolling(sold, 4, lambda w: w.mean(axis=-1)),
+        "rolling_8wk_avg": _rolling(sold, 8, lambda w: w.mean(axis=-1)),
+        "rolling_4wk_std": _rolling(sold, 4, lambda w: w.std(axis=-1, ddof=1)),
+        "week_over_week_change": sold / previous - 1,
+    }
+
+
+def _frame(columns: Dict, store_ids, product_ids, weeks, first_week: int = 0):
+    """Flatten (pairs, weeks) arrays into pair-major long format."""
+    n_pairs = len(store_ids)
+    n_weeks = len(weeks) - first_week
+    data = {
+        "store_id": np.repeat(store_ids, n_weeks),
+        "product_id": np.repeat(product_ids, n_weeks),
+        "week": np.tile(weeks[first_week:], n_pairs),
+    }
+    for name, values in columns.items():
+        data[name] = values[:, first_week:].reshape(-1)
+    return pd.DataFrame(data)
+
+
+def classify_risk(volatility: np.ndarray) -> np.ndarray:
+    """Notebook 07 absolute volatility bands."""
+    return np.select(
+        [volatility < 50, volatility < 150], ["Low", "Medium"], default="High"
+    ).astype(object)
+
+
+def market_tables(market_weekly: pd.DataFrame):
+    """Notebook 05 market summary and comparison from weekly market demand."""
+    summary = (
+        market_weekly
+        .groupby("market", as_index=False)
+        .agg(
+            avg_weekly_demand=("avg_units_sold", "mean"),
+            total_demand=("total_units_sold", "sum"),
+            demand_volatility=("avg_units_sold", "std"),
+        )
+    )
+
+    median_demand = summary["avg_weekly_demand"].median()
+    median_volatility = summary["demand_volatility"].median()
+    summary["inventory_strategy"] = np.select(
+        [
+            summary["avg_weekly_demand"] > median_demand * 1.1,
+            summary["demand_volatility"] > median_volatility * 1.1,
+        ],
+        [
+            "High demand market — prioritize inventory expansion.",
+            "Volatile demand — maintain higher safety buffers.",
+        ],
+        default="Stable demand — optimize inventory to reduce holding cost.",
+    )
+
+    comparison = summary[
+        ["market", "avg_weekly_demand", "total_demand", "demand_volatility"]
+    ].sort_values("avg_weekly_demand", ascending=False)
+
+    summary["norm_demand"] = (
+        summary["avg_weekly_demand"] / summary["avg_weekly_demand"].max()
+    )
+    summary["norm_volatility"] = (
+        summary["demand_volatility"] / summary["demand_volatility"].max()
+    )
+    summary["market_pressure_index"] = (
+        0.7 * summary["norm_demand"] + 0.3 * summary["norm_volatility"]
+    )
+    return summary, comparison
+
+
+def generate(
+    out_dir: Path,
+    n_pairs: int,
+    n_weeks: int = DEFAULT_WEEKS,
+    seed: int = 0,
+    products_per_store: int = PRODUCTS_PER_STORE,
+    chunk_pairs: int = CHUNK_PAIRS,
+    snapshots: bool = False
+) -> Dict:
+    """
+    Write every processed file for ``n_pairs`` pairs into ``out_dir``.
+    Returns a manifest (also saved as ``generator.json``).
+    """
+    # Imported here: the benchmark runner imports this module before it
+    # points INVENTORYIQ_DATA_DIR at the dataset, and config reads it once
+    from backend.app.core.config import MODELS_DIR, Z_SCORE
+    from backend.app.core.datasets import convert_csv
+
+    if n_weeks <= FEATURE_WARMUP_WEEKS:
+        raise ValueError(f"n_weeks must exceed {FEATURE_WARMUP_WEEKS}")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    weeks = pd.date_range(FIRST_WEEK, periods=n_weeks, freq="7D").strftime(
+        "%Y-%m-%d"
+    ).to_numpy(dtype=object)
+    store_ids, product_ids, store_index = pair_ids(n_pairs, products_per_store)
+    markets = np.array(MARKET_CYCLE, dtype=object)[store_index % len(MARKET_CYCLE)]
+
+    model = joblib.load(MODELS_DIR / "best_model.joblib")
+    features = (
+        pd.read_csv(MODELS_DIR / "production_model_metadata.csv")
+        .iloc[0]["features_used"]
+        .strip("[]")
+        .replace("'", "")
+        .split(", ")
+    )
+
+    weekly_path = out_dir / "weekly_time_series.csv"
+    feature_path = out_dir / "feature_engineered_data.csv"
+    recommendation_chunks = []
+    market_totals = {}
+
+    for start in range(0, n_pairs, chunk_pairs):
+        stop = min(start + chunk_pairs, n_pairs)
+        chunk = weekly_chunk(rng, stop - start, n_weeks)
+        ids = (store_ids[start:stop], product_ids[start:stop])
+        first = start == 0
+
+        _frame(chunk, *ids, weeks).to_csv(
+            weekly_path, mode="w" if first else "a", header=first, index=False
+        )
+
+        engineered = {**chunk, **feature_columns(chunk["weekly_units_sold"])}
+        feature_df = _frame(engineered, *ids, weeks, FEATURE_WARMUP_WEEKS)
+        feature_df[FEATURE_COLUMNS].to_csv(
+            feature_path, mode="w" if first else "a", header=first, index=False
+        )
+
+        # Market weekly totals / pair counts, accumulated across chunks
+        sold = chunk["weekly_units_sold"][:, FEATURE_WARMUP_WEEKS:]
+        for market in np.unique(markets[start:stop]):
+            rows = markets[start:stop] == market
+            totals, counts = market_totals.get(market, (0, 0))
+            market_totals[market] = (
+                totals + sold[rows].sum(axis=0), counts + int(rows.sum())
+            )
+
+        # Latest week per pair -> notebook 07 recommendation
+        latest = feature_df.groupby(
+            ["store_id", "product_id"], sort=False
+        ).tail(1)
+        forecast = np.round(model.predict(latest[features]), 2)
+        safety = latest["rolling_4wk_std"].to_numpy() * Z_SCORE
+        recommendation_chunks.append(pd.DataFrame({
+            "store_id": latest["store_id"].to_numpy(),
+            "product_id": latest["product_id"].to_numpy(),
+            "forecast_units": forecast,
+            "safety_stock": safety,
+            "recommended_order_qty": np.clip(np.round(forecast + safety), 0, None),
+            "demand_risk": classify_risk(latest["rolling_4wk_std"].to_numpy()),
+        }))
+
+    pd.concat(recommendation_chunks, ignore_index=True)[
+        RECOMMENDATION_COLUMNS
+    ].to_csv(out_dir / "inventory_recommendations.csv", index=False)
+
+    market_weekly = pd.concat(
+        [
+            pd.DataFrame({
+                "market": market,
+                "week": weeks[FEATURE_WARMUP_WEEKS:],
+                "total_units_sold": totals,
+                "avg_units_sold": totals / counts,
+            })
+            for market, (totals, counts) in sorted(market_totals.items())
+        ],
+        ignore_index=True,
+    )
+    summary, comparison = market_tables(market_weekly)
+    market_weekly.to_csv(out_dir / "market_weekly_demand.csv", index=False)
+    summary.to_csv(out_dir / "market_summary.csv", index=False)
+    comparison.to_csv(out_dir / "market_comparison.csv", index=False)
+
+    if snapshots:
+        for csv_path in sorted(out_dir.glob("*.csv")):
+            convert_csv(csv_path)
+
+    manifest = {
+        "pairs": n_pairs,
+        "weeks": n_weeks,
+        "feature_rows": n_pairs * (n_weeks - FEATURE_WARMUP_WEEKS),
+        "products_per_store": products_per_store,
+        "seed": seed,
+        "snapshots": snapshots,
+    }
+    with open(out_dir / "generator.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def parse_scale(value: str) -> int:
+    """'1000', '10k' or '1m' -> number of pairs."""
+    value = value.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(value[-1:], 1)
+    digits = value[:-1] if multiplier != 1 else value
+    return int(float(digits) * multiplier)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pairs", type=parse_scale, default=1000,
+                        help="store/product pairs, e.g. 1000, 10k, 100k")
+    parser.add_argument("--weeks", type=int, default=DEFAULT_WEEKS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument("--snapshots", action="store_true",
+                        help="also build binary snapshots of every CSV")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest = generate(
+        args.out, args.pairs, args.weeks, args.seed, snapshots=args.snapshots
+    )
+    print(f"{manifest['pairs']} pairs x {manifest['weeks']} weeks "
+          f"({manifest['feature_rows']} feature rows) -> {args.out} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
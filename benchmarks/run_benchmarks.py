@@ -0,0 +1,352 @@
+"""
+Endpoint benchmarks
+-------------------
+Drives every API route through the in-process ASGI test client against
+a synthetic dataset and records, per endpoint:
+
+- cold latency (first request: lazy loads, cache builds)
+- warm latency percentiles over ``--requests`` sequential calls
+- sequential and concurrent throughput (requests / second)
+- peak Python allocation of one warm request (tracemalloc)
+
+plus app import time, time until ``/ready`` and until the background
+warm-up finished, and process RSS. Results are written as JSON with
+stable keys, so two runs can be diffed with ``benchmarks/compare.py``.
+
+The app reads its data from ``INVENTORYIQ_DATA_DIR``, which is pointed
+at the generated dataset before the app is imported.
+
+Usage:
+    python benchmarks/run_benchmarks.py --pairs 10k
+    python benchmarks/run_benchmarks.py --data-dir /path/to/processed \\
+        --output benchmarks/results/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from benchmarks.generate_data import DEFAULT_WEEKS, parse_scale  # noqa: E402
+
+
+DATA_CACHE_DIR = BASE_DIR / "benchmarks" / ".data"
+RESULTS_DIR = BASE_DIR / "benchmarks" / "results"
+
+
+class Endpoint:
+    """One benchmarked request: method, route template and arguments."""
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        route: str,
+        path: Optional[str] = None,
+        params: Optional[Dict] = None,
+        json_body: Optional[Dict] = None
+    ):
+        self.name = name
+        self.method = method
+        self.route = route
+        self.path = path or route
+        self.params = params
+        self.json_body = json_body
+
+    def call(self, client):
+        return client.request(
+            self.method, self.path, params=self.params, json=self.json_body
+        )
+
+
+def endpoints(store_id: str, product_id: str, batch_items: List[Dict]) -> List[Endpoint]:
+    """Requests covering every route, using pairs that exist in the data."""
+    pair = {"store_id": store_id, "product_id": product_id}
+    return [
+        Endpoint("home", "GET", "/"),
+        Endpoint("health", "GET", "/health"),
+        Endpoint("ready", "GET", "/ready"),
+        Endpoint("stores", "GET", "/api/v1/stores"),
+        Endpoint("products", "GET", "/api/v1/products/{store_id}",
+                 f"/api/v1/products/{store_id}"),
+        Endpoint("categories", "GET", "/api/v1/categories"),
+        Endpoint("forecast", "GET", "/api/v1/forecast", params=pair),
+        Endpoint("forecast_horizon", "GET", "/api/v1/forecast",
+                 params={**pair, "horizon": 12}),
+        Endpoint("forecast_batch", "POST", "/api/v1/forecast/batch",
+                 json_body={"items": batch_items}),
+        Endpoint("forecast_batch_horizon", "POST", "/api/v1/forecast/batch",
+                 json_body={"items": batch_items, "horizon": 12}),
+        Endpoint("forecast_batch_stream", "POST", "/api/v1/forecast/batch/stream",
+                 json_body={"items": batch_items}),
+        Endpoint("forecast_confidence", "GET", "/api/v1/forecast/confidence",
+                 params=pair),
+        Endpoint("forecast_confidence_batch", "POST", "/api/v1/forecast/confidence/batch",
+                 json_body={"items": batch_items, "confidence_level": 0.9}),
+        Endpoint("forecast_explain", "GET", "/api/v1/forecast/explain",
+                 params=pair),
+        Endpoint("forecast_explain_batch", "POST", "/api/v1/forecast/explain/batch",
+                 json_body={"items": batch_items}),
+        Endpoint("forecast_scenario", "POST", "/api/v1/forecast/scenario",
+                 params={**pair, "demand_multiplier": 1.2}),
+        Endpoint("forecast_scenario_sweep", "POST", "/api/v1/forecast/scenario/sweep",
+                 json_body={}),
+        Endpoint("forecast_scenario_sweep_stream", "POST",
+                 "/api/v1/forecast/scenario/sweep/stream",
+                 json_body={"items": batch_items}),
+        Endpoint("timeseries", "GET", "/api/v1/timeseries", params=pair),
+        Endpoint("timeseries_downsampled", "GET", "/api/v1/timeseries",
+                 params={**pair, "points": 26}),
+        Endpoint("model_status", "GET", "/api/v1/model/status"),
+        Endpoint("markets", "GET", "/api/v1/markets"),
+        Endpoint("market_summary", "GET", "/api/v1/market/summary"),
+        Endpoint("inventory_plan", "GET", "/api/v1/inventory/plan",
+                 params={"limit": 100}),
+        Endpoint("inventory_metrics", "GET", "/api/v1/inventory/metrics"),
+        Endpoint("demand_drilldown", "GET", "/api/v1/demand/drilldown",
+                 params={"by": "store_id"}),
+        Endpoint("demand_drilldown_weekly", "GET", "/api/v1/demand/drilldown",
+                 params={"by": "week", "store_id": store_id}),
+        Endpoint("demand_levels", "GET", "/api/v1/demand/levels"),
+        Endpoint("metrics", "GET", "/metrics"),
+    ]
+
+
+# --------------------------------------------------
+# Measurement
+# --------------------------------------------------
+def percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def timed_call(endpoint: Endpoint, client):
+    start = time.perf_counter()
+    response = endpoint.call(client)
+    return time.perf_counter() - start, response.status_code
+
+
+def measure(endpoint: Endpoint, client, n_requests: int, concurrency: int) -> Dict:
+    cold_s, cold_status = timed_call(endpoint, client)
+
+    latencies = []
+    statuses = {}
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        elapsed, status = timed_call(endpoint, client)
+        latencies.append(elapsed)
+        statuses[status] = statuses.get(status, 0) + 1
+    sequential_s = time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        concurrent_statuses = list(pool.map(
+            lambda _: endpoint.call(client).status_code, range(n_requests)
+        ))
+        concurrent_s = time.perf_counter() - start
+    for status in concurrent_statuses:
+        statuses[status] = statuses.get(status, 0) + 1
+
+    tracemalloc.start()
+    endpoint.call(client)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies_ms = sorted(x * 1000 for x in latencies)
+    return {
+        "method": endpoint.method,
+        "route": endpoint.route,
+        "cold_status": cold_status,
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())},
+        "cold_ms": round(cold_s * 1000, 3),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies_ms), 3),
+            "p50": round(percentile(latencies_ms, 0.50), 3),
+            "p95": round(percentile(latencies_ms, 0.95), 3),
+            "p99": round(percentile(latencies_ms, 0.99), 3),
+            "max": round(latencies_ms[-1], 3),
+        },
+        "throughput_rps": round(n_requests / sequential_s, 2),
+        "concurrent_rps": round(n_requests / concurrent_s, 2),
+        "peak_alloc_kb": round(peak_bytes / 1024, 1),
+    }
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def uncovered_routes(app, covered: List[Endpoint]) -> List[str]:
+    """API routes without a benchmark entry (new endpoints to add)."""
+    from fastapi.routing import APIRoute
+
+    seen = {(e.method, e.route) for e in covered}
+    missing = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for method in sorted(route.methods - {"HEAD"}):
+            if (method, route.path) not in seen:
+                missing.append(f"{method} {route.path}")
+    return missing
+
+
+# --------------------------------------------------
+# Entry point
+# --------------------------------------------------
+def resolve_data_dir(args) -> Path:
+    if args.data_dir is not None:
+        return args.data_dir
+
+    data_dir = DATA_CACHE_DIR / f"pairs-{args.pairs}-weeks-{args.weeks}-seed-{args.seed}"
+    if not (data_dir / "generator.json").exists() or args.regenerate:
+        # Separate process, so generation does not inflate this one's RSS
+        command = [
+            sys.executable, str(BASE_DIR / "benchmarks" / "generate_data.py"),
+            "--pairs", str(args.pairs), "--weeks", str(args.weeks),
+            "--seed", str(args.seed), "--out", str(data_dir),
+        ]
+        if args.snapshots:
+            command.append("--snapshots")
+        subprocess.run(command, check=True)
+    return data_dir
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pairs", type=parse_scale, default=1000,
+                        help="synthetic scale, e.g. 1000, 10k, 100k")
+    parser.add_argument("--weeks", type=int, default=DEFAULT_WEEKS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", type=Path, default=None,
+                        help="benchmark an existing processed-data directory")
+    parser.add_argument("--regenerate", action="store_true")
+    parser.add_argument("--snapshots", action="store_true",
+                        help="build binary snapshots for generated data")
+    parser.add_argument("--requests", type=int, default=50,
+                        help="warm requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--only", nargs="*", default=None,
+                        help="endpoint names to run (default: all)")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    data_dir = resolve_data_dir(args).resolve()
+    os.environ["INVENTORYIQ_DATA_DIR"] = str(data_dir)
+    # The app mounts static files / templates relative to the repo root
+    os.chdir(BASE_DIR)
+
+    start = time.perf_counter()
+    from fastapi.testclient import TestClient
+    from backend.app.main import app
+    from backend.app.core.warmup import get_warmup
+    from backend.app.services.feature_store import get_feature_store
+    import_s = time.perf_counter() - start
+    rss_after_import_mb = max_rss_mb()
+
+    generator_path = data_dir / "generator.json"
+    dataset = (
+        json.loads(generator_path.read_text()) if generator_path.exists()
+        else {"data_dir": str(data_dir)}
+    )
+
+    results = {}
+    with TestClient(app, raise_server_exceptions=False) as client:
+        # Startup returns at once; measure until ready, then let the
+        # optional warm-up tasks finish so they do not overlap requests
+        start = time.perf_counter()
+        while client.get("/ready").status_code != 200 and get_warmup().running:
+            time.sleep(0.05)
+        ready_s = time.perf_counter() - start
+        while get_warmup().running:
+            time.sleep(0.05)
+        warmup_s = time.perf_counter() - start
+        warmup_tasks = {
+            name: task["seconds"] for name, task in get_warmup().status()["tasks"].items()
+        }
+        rss_after_warmup_mb = max_rss_mb()
+
+        # Sample pairs that exist in whatever dataset is being served
+        pairs = get_feature_store().pairs()
+        batch_items = [
+            {"store_id": s, "product_id": p} for s, p in pairs[:args.batch_size]
+        ]
+        specs = endpoints(*pairs[0], batch_items)
+        if args.only:
+            specs = [e for e in specs if e.name in args.only]
+
+        for endpoint in specs:
+            results[endpoint.name] = measure(
+                endpoint, client, args.requests, args.concurrency
+            )
+            latency = results[endpoint.name]["latency_ms"]
+            print(f"{endpoint.name:<22} cold {results[endpoint.name]['cold_ms']:>9.1f} ms"
+                  f"  p50 {latency['p50']:>8.2f} ms  p95 {latency['p95']:>8.2f} ms"
+                  f"  {results[endpoint.name]['throughput_rps']:>8.1f} rps"
+                  f"  status {results[endpoint.name]['status_counts']}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "requests_per_endpoint": args.requests,
+            "concurrency": args.concurrency,
+            "batch_size": len(batch_items),
+        },
+        "dataset": dataset,
+        "startup": {
+            "app_import_s": round(import_s, 3),
+            "max_rss_after_import_mb": rss_after_import_mb,
+            "ready_s": round(ready_s, 3),
+            "warmup_s": round(warmup_s, 3),
+            "warmup_tasks_s": warmup_tasks,
+            "max_rss_after_warmup_mb": rss_after_warmup_mb,
+        },
+        "endpoints": results,
+        "process": {"max_rss_mb": max_rss_mb()},
+        "uncovered_routes": uncovered_routes(app, specs) if not args.only else [],
+    }
+
+    if report["uncovered_routes"]:
+        print("Routes without a benchmark:", ", ".join(report["uncovered_routes"]))
+
+    output = args.output or RESULTS_DIR / (
+        f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-pairs-{dataset.get('pairs', 'custom')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
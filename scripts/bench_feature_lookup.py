@@ -0,0 +1,93 @@
+"""
+Micro-benchmark: latest-row lookup per store-product pair.
+
+Compares the old per-request path (two full-length masks, sort by week,
+take the last row) with the FeatureStore keyed lookup, as the number of
+pairs grows.
+
+Usage:
+    python scripts/bench_feature_lookup.py [--pairs 100 1000 10000] [--weeks 99]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from backend.app.services.feature_store import FeatureStore  # noqa: E402
+
+
+def synthetic_features(n_pairs: int, n_weeks: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_stores = max(1, int(np.sqrt(n_pairs)))
+    pair_ids = np.arange(n_pairs)
+    store_ids = np.array([f"S{i // (n_pairs // n_stores or 1):04d}" for i in pair_ids])
+    product_ids = np.array([f"P{i:06d}" for i in pair_ids])
+    weeks = pd.date_range("2022-01-03", periods=n_weeks, freq="7D")
+
+    units = rng.integers(100, 2000, size=n_pairs * n_weeks)
+    return pd.DataFrame({
+        "store_id": np.repeat(store_ids, n_weeks),
+        "product_id": np.repeat(product_ids, n_weeks),
+        "week": np.tile(weeks, n_pairs),
+        "weekly_units_sold": units,
+        "lag_1_units_sold": units * 0.9,
+        "lag_2_units_sold": units * 1.1,
+        "rolling_4wk_std": units * 0.2,
+    })
+
+
+def masked_latest(df: pd.DataFrame, store_id: str, product_id: str) -> pd.Series:
+    subset = df[
+        (df["store_id"] == store_id) &
+        (df["product_id"] == product_id)
+    ].sort_values("week")
+    return subset.iloc[-1]
+
+
+def time_per_call(fn, keys, repeat: int) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(*keys[i % len(keys)])
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pairs", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--weeks", type=int, default=99)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'pairs':>8} {'rows':>10} {'index build ms':>15} "
+          f"{'mask+sort us':>13} {'keyed us':>9} {'speedup':>8}")
+
+    for n_pairs in args.pairs:
+        df = synthetic_features(n_pairs, args.weeks)
+
+        start = time.perf_counter()
+        store = FeatureStore.from_frame(df)
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        rng = np.random.default_rng(1)
+        keys = [store.pairs()[i] for i in rng.integers(0, n_pairs, size=50)]
+
+        # The masked path is O(rows); keep its repeat count bounded
+        masked_repeat = max(5, min(args.repeat, 2_000_000 // len(df)))
+        masked_us = time_per_call(
+            lambda s, p: masked_latest(store.data, s, p), keys, masked_repeat
+        )
+        keyed_us = time_per_call(store.latest, keys, args.repeat)
+
+        print(f"{n_pairs:>8} {len(df):>10} {build_ms:>15.1f} "
+              f"{masked_us:>13.1f} {keyed_us:>9.1f} {masked_us / keyed_us:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark: row-wise vs column-wise inventory planning.
+
+Builds synthetic recommendations + cleaned data at the requested sizes,
+then times the previous row-wise implementation (apply / iterrows,
+reproduced below as the reference) against the current column-wise
+code in routers/inventory_planning.py, and checks both produce the
+same JSON.
+
+Usage:
+    python scripts/bench_inventory_planning.py [--rows 10000 100000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from backend.app.routers.inventory_planning import (  # noqa: E402
+    CATEGORY_DISPLAY_NAMES,
+    PRODUCT_NAME_MAP,
+    REGION_TO_MARKET,
+    _recommendation_records,
+    enrich_recommendations,
+)
+
+
+def synthetic_inputs(n_rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    store_ids = np.array([f"S{i % 500:04d}" for i in range(n_rows)])
+    product_ids = np.array([f"P{i // 500:04d}" for i in range(n_rows)])
+    forecast = np.round(rng.uniform(0, 1500, n_rows), 2)
+    safety = rng.uniform(0, 1200, n_rows)
+
+    recs = pd.DataFrame({
+        "store_id": store_ids,
+        "product_id": product_ids,
+        "forecast_units": forecast,
+        "safety_stock": safety,
+        "recommended_order_qty": np.round(forecast + safety),
+        "demand_risk": "High",
+    })
+
+    categories = np.array(list(CATEGORY_DISPLAY_NAMES) + ["Misc"])
+    regions = np.array(list(REGION_TO_MARKET) + ["Central"])
+    names = np.where(
+        rng.random(n_rows) < 0.5, None,
+        np.char.add(" Item ", product_ids.astype(str))
+    )
+    cleaned = pd.DataFrame({
+        "store_id": store_ids,
+        "product_id": product_ids,
+        "category": categories[rng.integers(0, len(categories), n_rows)],
+        "region": regions[rng.integers(0, len(regions), n_rows)],
+        "product_name": names,
+    })
+    return recs, cleaned
+
+
+# --------------------------------------------------
+# Previous row-wise implementation (reference)
+# --------------------------------------------------
+def rowwise_enrich(recs_df, cleaned_df):
+    mapping_df = cleaned_df[
+        ["store_id", "product_id", "category", "region", "product_name"]
+    ].drop_duplicates()
+    recs_df = recs_df.merge(mapping_df, on=["store_id", "product_id"], how="left")
+    recs_df["market"] = recs_df["region"].map(REGION_TO_MARKET).fillna("Other")
+    recs_df["category_display"] = recs_df["category"].map(
+        CATEGORY_DISPLAY_NAMES
+    ).fillna(recs_df["category"])
+
+    def _name_for_row(row):
+        if "product_name" in row and pd.notna(row["product_name"]):
+            return str(row["product_name"]).strip()
+        mapped = PRODUCT_NAME_MAP.get(str(row.get("product_id", "")))
+        if mapped:
+            return mapped
+        return f"Product {row.get('product_id', 'Unknown')}"
+    recs_df["product_name_display"] = recs_df.apply(_name_for_row, axis=1)
+
+    recs_df["safety_buffer_ratio"] = (
+        (recs_df["recommended_order_qty"] - recs_df["forecast_units"]) /
+        recs_df["forecast_units"]
+    )
+    p75 = recs_df["safety_buffer_ratio"].quantile(0.75)
+    p25 = recs_df["safety_buffer_ratio"].quantile(0.25)
+
+    def assign_risk_level(ratio):
+        if ratio >= p75:
+            return "High"
+        elif ratio >= p25:
+            return "Medium"
+        return "Low"
+    recs_df["demand_risk"] = recs_df["safety_buffer_ratio"].apply(assign_risk_level)
+    return recs_df
+
+
+def rowwise_records(sorted_df):
+    recommendations = []
+    for _, row in sorted_df.iterrows():
+        safety_pct = ((row["recommended_order_qty"] - row["forecast_units"]) / row["forecast_units"] * 100) if row["forecast_units"] > 0 else 0
+        recommendations.append({
+            "product_id": row["product_id"],
+            "product_name": row.get("product_name_display", f"Product {row.get('product_id', 'Unknown')}"),
+            "category": row.get("category_display", row.get("category", "Unknown")),
+            "market": row.get("market", "Unknown"),
+            "forecast_units": round(row["forecast_units"], 0),
+            "recommended_order_qty": int(row["recommended_order_qty"]),
+            "safety_stock": int(row["safety_stock"]),
+            "safety_buffer_pct": round(safety_pct, 1),
+            "risk_level": row["demand_risk"]
+        })
+    return recommendations
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'enrich row-wise s':>18} {'column-wise s':>14} "
+          f"{'records row-wise s':>19} {'column-wise s':>14} {'identical':>10}")
+
+    for n_rows in args.rows:
+        recs, cleaned = synthetic_inputs(n_rows)
+
+        old_df, old_enrich_s = timed(rowwise_enrich, recs.copy(), cleaned)
+        new_df, new_enrich_s = timed(enrich_recommendations, recs.copy(), cleaned)
+
+        old_records, old_records_s = timed(rowwise_records, old_df)
+        new_records, new_records_s = timed(_recommendation_records, new_df)
+
+        identical = json.dumps(old_records) == json.dumps(new_records)
+        print(f"{n_rows:>8} {old_enrich_s:>18.3f} {new_enrich_s:>14.3f} "
+              f"{old_records_s:>19.3f} {new_records_s:>14.3f} {str(identical):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: CSV parse vs binary snapshot load of the feature dataset.
+
+For each scale a synthetic feature_engineered_data-shaped CSV is
+written to a temporary directory, converted to a snapshot, and loaded
+three ways:
+- pd.read_csv(parse_dates=["week"])       (previous behaviour)
+- load_dataset, memory-mapped             (what services do)
+- load_dataset + touching every column    (fully paged-in)
+
+Usage:
+    python scripts/bench_snapshot_load.py [--pairs 100 1000 10000] [--weeks 99]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from backend.app.core.datasets import convert_csv, load_dataset  # noqa: E402
+from bench_feature_lookup import synthetic_features  # noqa: E402
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def touch_all(df: pd.DataFrame) -> None:
+    for name in df.columns:
+        column = df[name]
+        if column.dtype.kind in "fiub":
+            column.to_numpy().sum()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pairs", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--weeks", type=int, default=99)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pairs':>8} {'rows':>10} {'csv MB':>8} {'read_csv s':>11} "
+          f"{'snapshot s':>11} {'paged-in s':>11} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_pairs in args.pairs:
+            csv_path = Path(tmp) / f"features_{n_pairs}.csv"
+            df = synthetic_features(n_pairs, args.weeks)
+            rng = np.random.default_rng(2)
+            for name in ["avg_price", "avg_discount", "avg_inventory_level",
+                         "rolling_4wk_avg", "rolling_8wk_avg"]:
+                df[name] = rng.random(len(df)) * 100
+            df.to_csv(csv_path, index=False)
+            convert_csv(csv_path)
+
+            csv_s = best_of(
+                lambda: pd.read_csv(csv_path, parse_dates=["week"]),
+                args.repeat,
+            )
+            snap_s = best_of(
+                lambda: load_dataset(csv_path, parse_dates=["week"]),
+                args.repeat,
+            )
+            paged_s = best_of(
+                lambda: touch_all(load_dataset(csv_path, parse_dates=["week"])),
+                args.repeat,
+            )
+
+            print(f"{n_pairs:>8} {len(df):>10} "
+                  f"{csv_path.stat().st_size / 1e6:>8.1f} {csv_s:>11.3f} "
+                  f"{snap_s:>11.3f} {paged_s:>11.3f} {csv_s / snap_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Convert every CSV in data/processed into a binary columnar snapshot.
+
+Services load ``<name>.snapshot/`` instead of parsing ``<name>.csv``
+while the snapshot matches the CSV's mtime and size. Re-run after the
+notebooks regenerate the processed data.
+
+Usage:
+    python scripts/build_snapshots.py [--data-dir data/processed] [files ...]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from backend.app.core.config import DATA_DIR  # noqa: E402
+from backend.app.core.datasets import convert_csv  # noqa: E402
+
+
+def directory_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--data-dir", type=Path, default=DATA_DIR
+    )
+    parser.add_argument(
+        "files", nargs="*", help="CSV names to convert (default: all)"
+    )
+    args = parser.parse_args()
+
+    if args.files:
+        csv_paths = [args.data_dir / name for name in args.files]
+    else:
+        csv_paths = sorted(args.data_dir.glob("*.csv"))
+
+    for csv_path in csv_paths:
+        start = time.perf_counter()
+        try:
+            target = convert_csv(csv_path)
+        except (OSError, ValueError) as exc:
+            print(f"SKIPPED {csv_path.name}: {exc}")
+            continue
+        elapsed = time.perf_counter() - start
+        print(
+            f"{csv_path.name:<36} {csv_path.stat().st_size / 1e6:>8.2f} MB csv "
+            f"-> {directory_size(target) / 1e6:>8.2f} MB snapshot "
+            f"({elapsed:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
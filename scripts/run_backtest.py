@@ -0,0 +1,85 @@
+"""
+Walk-forward backtest of the candidate demand models.
+
+Evaluates every candidate model over rolling-origin folds of the
+processed feature data, fanning the (model, fold) fits out over a
+process pool, and writes ``model_comparison_metrics.csv`` plus the
+per-fold, per-pair and residual tables under ``backtest/``. The
+residuals feed the API's confidence bands; they are tied to the
+current ``best_model.joblib``, so re-run this after replacing the
+model. ``--folds 1`` reproduces the single split of notebook 08.
+
+Usage:
+    python scripts/run_backtest.py [--data data/processed/feature_engineered_data.csv]
+                                   [--models Random_Forest Gradient_Boosting ...]
+                                   [--folds 4] [--test-fraction 0.2]
+                                   [--workers N] [--output-dir models]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from backend.app.core.config import MODELS_DIR  # noqa: E402
+from backend.app.services.backtesting import (  # noqa: E402
+    CANDIDATE_MODELS,
+    DEFAULT_FOLDS,
+    DEFAULT_TEST_FRACTION,
+    FEATURE_DATA_PATH,
+    load_backtest_frame,
+    run_backtest,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--data", type=Path, default=FEATURE_DATA_PATH
+    )
+    parser.add_argument(
+        "--models", nargs="+", choices=list(CANDIDATE_MODELS),
+        help="Models to evaluate (default: all)"
+    )
+    parser.add_argument(
+        "--folds", type=int, default=DEFAULT_FOLDS
+    )
+    parser.add_argument(
+        "--test-fraction", type=float, default=DEFAULT_TEST_FRACTION,
+        help="Share of rows after the first evaluation week"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=MODELS_DIR
+    )
+    args = parser.parse_args()
+
+    result = run_backtest(
+        load_backtest_frame(args.data),
+        models=args.models,
+        folds=args.folds,
+        test_fraction=args.test_fraction,
+        workers=args.workers
+    )
+
+    folds = result.fold_metrics.drop_duplicates("fold")
+    for fold in folds.itertuples():
+        print(
+            f"fold {fold.fold}: train <= {fold.train_end} ({fold.train_rows} rows), "
+            f"test {fold.test_start} .. {fold.test_end} ({fold.test_rows} rows)"
+        )
+    print()
+    print(result.metrics.to_string(index=False))
+    print()
+    for path in result.write(args.output_dir):
+        print(f"wrote {path}")
+    print(f"backtest finished in {result.elapsed_seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()